@@ -0,0 +1,126 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+
+class AssetFetchError(Exception):
+    pass
+
+
+class AssetFetcher:
+    """Downloads URLs concurrently through one pooled session into a local cache
+
+    A cached file is revalidated with If-None-Match/If-Modified-Since, so an
+    unchanged asset costs a 304 without a body on the next run.
+    """
+
+    def __init__(
+        self, cache_dir: str, workers: int = 8, retries: int = 3, timeout: int = 30
+    ):
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            # з'єднань у пулі стільки ж, скільки потоків, інакше вони чекають одне одне
+            pool_connections=workers,
+            pool_maxsize=workers,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET",),
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch(self, url: str) -> str:
+        """Path of the cached copy of `url`, downloaded only if it changed"""
+        path = self._cache_path(url)
+        validators = self._read_validators(path)
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        try:
+            with self.session.get(
+                url, headers=headers, timeout=self.timeout, stream=True
+            ) as response:
+                if response.status_code == 304:
+                    logger.debug("%s not modified", url)
+                    return path
+                response.raise_for_status()
+                self._store(path, response)
+        except requests.exceptions.RequestException as exception:
+            raise AssetFetchError(f"{url}: {exception}") from exception
+        return path
+
+    def fetch_many(self, urls: list[str]) -> dict[str, str]:
+        """{url: cached path}, at most `workers` downloads at a time"""
+        urls = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="asset-fetcher"
+        ) as executor:
+            return dict(zip(urls, executor.map(self.fetch, urls)))
+
+    def fetch_json(self, url: str):
+        return self.read_json(self.fetch(url))
+
+    @staticmethod
+    def read_json(path: str):
+        try:
+            with open(path, "rb") as file:
+                return json.load(file)
+        except ValueError as exception:
+            raise AssetFetchError(f"{path}: {exception}") from exception
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _cache_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode()).hexdigest())
+
+    @staticmethod
+    def _read_validators(path: str) -> dict:
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(f"{path}.json") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _store(self, path: str, response) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # файл кешу з'являється цілим: обірване завантаження його не зіпсує
+        with tempfile.NamedTemporaryFile(
+            dir=self.cache_dir, prefix=".fetch-", delete=False
+        ) as temporary_file:
+            try:
+                for chunk in response.iter_content(64 * 1024):
+                    temporary_file.write(chunk)
+            except BaseException:
+                temporary_file.close()
+                os.remove(temporary_file.name)
+                raise
+        os.replace(temporary_file.name, path)
+        with open(f"{path}.json", "w") as file:
+            json.dump(
+                {
+                    "url": response.url,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                },
+                file,
+            )
@@ -0,0 +1,311 @@
+from collections import defaultdict
+from typing import Callable
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Exists, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed
+
+from additional_service.vote_buffer import get_vote_buffer
+
+
+class AtomicVoteCounter:
+    """Denormalized vote counter kept next to an m2m table of voters.
+
+    The voter row is inserted (insert-or-ignore) or deleted first, and the counter
+    is moved with a single conditional `number = number ± 1 ... RETURNING number`
+    UPDATE only when the row really changed, so the counter never needs a
+    COUNT(*) over the voters table and callers never re-read it.
+
+    With VOTE_WRITE_BEHIND the vote only lands in a buffer of pending voters and
+    deltas (see `vote_buffer`), `flush()` writes it in bulk and readers add
+    `pending_delta()` to what they read from the DB. `on_flush` runs after a
+    flush or a recount that changed something has been committed.
+
+    The engine writes the voters table directly, so m2m_changed fires only for
+    `.add()`/`.remove()`/`.set()`/`.clear()` on the relation (admin, shell); the
+    counters touched that way are recounted.
+    """
+
+    def __init__(
+        self,
+        counter_model,
+        voters_field: str,
+        number_field: str = "number",
+        buffer_name: str | None = None,
+        on_flush: Callable[[], None] | None = None,
+    ):
+        self.counter_model = counter_model
+        self.voters_field = voters_field
+        self.number_field = number_field
+        self.buffer_name = buffer_name or counter_model._meta.label_lower
+        self.on_flush = on_flush
+        m2m_field = counter_model._meta.get_field(voters_field)
+        self.through = m2m_field.remote_field.through
+        self.counter_fk = self.through._meta.get_field(m2m_field.m2m_field_name())
+        self.voter_fk = self.through._meta.get_field(m2m_field.m2m_reverse_field_name())
+        m2m_changed.connect(
+            self._recount_changed,
+            sender=self.through,
+            weak=False,
+            dispatch_uid=f"vote-counter-{self.buffer_name}",
+        )
+
+    @property
+    def buffer(self):
+        if not settings.VOTE_WRITE_BEHIND:
+            return None
+        return get_vote_buffer(self.buffer_name)
+
+    def add_vote(self, counter_pk, voter_pk, number: int) -> int:
+        """Counter value the player should see, `number` is the one read from the DB"""
+        if self.buffer is not None:
+            return self._push(counter_pk, voter_pk, 1, number)
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    self._insert_ignore_sql(), self._params(counter_pk, voter_pk)
+                )
+                inserted = cursor.fetchone() is not None
+            if inserted:
+                return self._move(counter_pk, 1)
+        return number
+
+    def remove_vote(self, counter_pk, voter_pk, number: int) -> int:
+        """Counter value the player should see, `number` is the one read from the DB"""
+        if self.buffer is not None:
+            return self._push(counter_pk, voter_pk, -1, number)
+        with transaction.atomic():
+            deleted, _ = self.through.objects.filter(
+                **{self.counter_fk.attname: counter_pk, self.voter_fk.attname: voter_pk}
+            ).delete()
+            if deleted:
+                return self._move(counter_pk, -1)
+        return number
+
+    def pending_delta(self, counter_pk) -> int:
+        buffer = self.buffer
+        return buffer.delta(str(counter_pk)) if buffer is not None else 0
+
+    def pending_deltas(self, key: str = "pk") -> dict[str, int]:
+        """Pending deltas by str(counter pk) or by str(<key>) of the counter row"""
+        buffer = self.buffer
+        deltas = buffer.deltas() if buffer is not None else {}
+        if not deltas or key == "pk":
+            return deltas
+        rows = self.counter_model.objects.filter(pk__in=deltas).values_list("pk", key)
+        return {str(owner_pk): deltas[str(pk)] for pk, owner_pk in rows}
+
+    def flush(self) -> int:
+        """Writes buffered votes in bulk, returns the number of applied votes
+
+        The buffer drops the votes only after the transaction is committed, a
+        failed flush leaves them for the next one.
+        """
+        buffer = self.buffer
+        ops = buffer.claim() if buffer is not None else {}
+        if not ops:
+            return 0
+        try:
+            with transaction.atomic():
+                applied = self._apply(ops)
+                transaction.on_commit(buffer.ack)
+                if applied and self.on_flush is not None:
+                    transaction.on_commit(self.on_flush)
+        except BaseException:
+            buffer.release()
+            raise
+        return applied
+
+    def _apply(self, ops: dict[tuple[str, str], int]) -> int:
+        counter_attname, voter_attname = self.counter_fk.attname, self.voter_fk.attname
+        counter_pks = {counter_pk for counter_pk, _ in ops}
+        voter_pks = {voter_pk for _, voter_pk in ops}
+        with transaction.atomic():
+            existing = {
+                (str(counter_pk), str(voter_pk)): pk
+                for pk, counter_pk, voter_pk in self.through.objects.filter(
+                    **{f"{counter_attname}__in": counter_pks},
+                    **{f"{voter_attname}__in": voter_pks},
+                ).values_list("pk", counter_attname, voter_attname)
+            }
+            # гравця могли видалити, поки голос чекав у буфері
+            live_voters = {
+                str(pk)
+                for pk in self.voter_fk.related_model.objects.filter(
+                    pk__in=voter_pks
+                ).values_list("pk", flat=True)
+            }
+            to_create, to_delete = [], []
+            deltas = defaultdict(int)
+            for (counter_pk, voter_pk), op in ops.items():
+                if op > 0 and (counter_pk, voter_pk) not in existing:
+                    if voter_pk not in live_voters:
+                        continue
+                    to_create.append(
+                        self.through(
+                            **{counter_attname: counter_pk, voter_attname: voter_pk}
+                        )
+                    )
+                elif op < 0 and (counter_pk, voter_pk) in existing:
+                    to_delete.append(existing[(counter_pk, voter_pk)])
+                else:
+                    continue
+                deltas[counter_pk] += op
+            self.through.objects.bulk_create(to_create, ignore_conflicts=True)
+            self.through.objects.filter(pk__in=to_delete).delete()
+            by_delta = defaultdict(list)
+            for counter_pk, delta in deltas.items():
+                if delta:
+                    by_delta[delta].append(counter_pk)
+            for delta, pks in by_delta.items():
+                self.counter_model.objects.filter(pk__in=pks).update(
+                    **{self.number_field: F(self.number_field) + delta}
+                )
+        return len(to_create) + len(to_delete)
+
+    def reconcile(self, batch_size: int = 1000, counter_pks=None) -> int:
+        """Repairs drifted counters in batches, returns the number of fixed rows
+
+        `counter_pks` limits the check to these counters. The rows are locked
+        before the recount, so a vote that lands meanwhile waits and then moves
+        the repaired number instead of being overwritten.
+        """
+        counters = self.counter_model.objects.all()
+        if counter_pks is not None:
+            counters = counters.filter(pk__in=counter_pks)
+        drifted = list(
+            counters.annotate(real_number=Count(self.voters_field))
+            .exclude(**{self.number_field: F("real_number")})
+            .values_list("pk", flat=True)
+        )
+        real_number = Coalesce(
+            Subquery(
+                self.through.objects.filter(**{self.counter_fk.attname: OuterRef("pk")})
+                .order_by()
+                .values(self.counter_fk.attname)
+                .annotate(total=Count("pk"))
+                .values("total")
+            ),
+            0,
+        )
+        fixed = 0
+        for start in range(0, len(drifted), batch_size):
+            with transaction.atomic():
+                locked = list(
+                    self.counter_model.objects.select_for_update()
+                    .filter(pk__in=drifted[start : start + batch_size])
+                    .order_by("pk")
+                    .values_list("pk", flat=True)
+                )
+                # підрахунок уже під блокуванням бачить усі закомічені голоси
+                fixed += (
+                    self.counter_model.objects.filter(pk__in=locked)
+                    .exclude(**{self.number_field: real_number})
+                    .update(**{self.number_field: real_number})
+                )
+        return fixed
+
+    def _recount_changed(self, instance, action, reverse, pk_set, **kwargs) -> None:
+        if reverse:
+            # зміна з боку гравця: pk_set - лічильники, clear його не передає
+            if action == "pre_clear":
+                instance._vote_counter_pks = list(
+                    self.through.objects.filter(
+                        **{self.voter_fk.attname: instance.pk}
+                    ).values_list(self.counter_fk.attname, flat=True)
+                )
+                return
+            counter_pks = (
+                instance.__dict__.pop("_vote_counter_pks", [])
+                if action == "post_clear"
+                else pk_set
+            )
+        else:
+            counter_pks = [instance.pk]
+        if action not in ("post_add", "post_remove", "post_clear") or not counter_pks:
+            return
+        if self.reconcile(counter_pks=counter_pks) and self.on_flush is not None:
+            transaction.on_commit(self.on_flush)
+
+    def _move(self, counter_pk, delta: int) -> int:
+        quote_name = connection.ops.quote_name
+        number = quote_name(
+            self.counter_model._meta.get_field(self.number_field).column
+        )
+        sql = (
+            f"UPDATE {quote_name(self.counter_model._meta.db_table)} "
+            f"SET {number} = {number} + %s "
+            f"WHERE {quote_name(self.counter_model._meta.pk.column)} = %s"
+        )
+        params = [
+            delta,
+            self.counter_model._meta.pk.get_db_prep_value(counter_pk, connection),
+        ]
+        if delta < 0:
+            sql += f" AND {number} >= %s"
+            params.append(-delta)
+        with connection.cursor() as cursor:
+            cursor.execute(f"{sql} RETURNING {number}", params)
+            row = cursor.fetchone()
+        if row:
+            return row[0]
+        # лічильник уже 0 (розійшовся з таблицею голосів): віддаємо те, що в БД
+        return (
+            self.counter_model.objects.filter(pk=counter_pk)
+            .values_list(self.number_field, flat=True)
+            .first()
+            or 0
+        )
+
+    def _push(self, counter_pk, voter_pk, op: int, number: int) -> int:
+        counter_pk = self.counter_fk.to_python(counter_pk)
+        voter_pk = self.voter_fk.to_python(voter_pk)
+        # один запит: чи існує гравець і чи вже є його голос у БД
+        voted = (
+            self.voter_fk.related_model.objects.filter(pk=voter_pk)
+            .annotate(
+                voted=Exists(
+                    self.through.objects.filter(
+                        **{
+                            self.counter_fk.attname: counter_pk,
+                            self.voter_fk.attname: OuterRef("pk"),
+                        }
+                    )
+                )
+            )
+            .values_list("voted", flat=True)
+            .first()
+        )
+        if voted is None:
+            if op > 0:
+                # так само, як зовнішній ключ у небуферизованому шляху
+                raise IntegrityError(f"{voter_pk} voter does not exist")
+            voted = False
+        buffer = self.buffer
+        buffer.push(str(counter_pk), str(voter_pk), op, voted)
+        buffer.schedule_flush(self.flush)
+        if buffer.flush_due():
+            self.flush()
+            number = (
+                self.counter_model.objects.filter(pk=counter_pk)
+                .values_list(self.number_field, flat=True)
+                .get()
+            )
+        return number + buffer.delta(str(counter_pk))
+
+    def _params(self, counter_pk, voter_pk) -> list:
+        return [
+            self.counter_fk.get_db_prep_value(counter_pk, connection),
+            self.voter_fk.get_db_prep_value(voter_pk, connection),
+        ]
+
+    def _insert_ignore_sql(self) -> str:
+        quote_name = connection.ops.quote_name
+        return (
+            f"INSERT INTO {quote_name(self.through._meta.db_table)} "
+            f"({quote_name(self.counter_fk.column)}, {quote_name(self.voter_fk.column)}) "
+            f"VALUES (%s, %s) ON CONFLICT DO NOTHING "
+            f"RETURNING {quote_name(self.through._meta.pk.column)}"
+        )
@@ -0,0 +1,40 @@
+from functools import lru_cache
+from operator import attrgetter
+from typing import Type
+
+from pydantic import BaseModel
+
+
+class DTOMapper:
+    """Model instance -> DTO mapper with the field-accessor plan built once.
+
+    Nested DTO fields use the Django lookup notation, `like__number` is read as
+    `instance.like.number`.
+    """
+
+    def __init__(self, dto_model: Type[BaseModel]):
+        self.dto_model = dto_model
+        self.accessors = tuple(
+            (field_name, attrgetter(field_name.replace("__", ".")))
+            for field_name in dto_model.model_fields
+        )
+
+    def map(self, instance, **kwargs) -> BaseModel:
+        """Validated DTO, `kwargs` fill the fields the instance has no value for"""
+        return self.dto_model(**self._collect(instance, kwargs))
+
+    def _collect(self, instance, dto_kwarg: dict) -> dict:
+        for field_name, accessor in self.accessors:
+            try:
+                value = accessor(instance)
+            except AttributeError:
+                # немає зв'язаного об'єкта (наприклад, Like) - лишаємо default DTO
+                continue
+            if value is not None:
+                dto_kwarg[field_name] = value
+        return dto_kwarg
+
+
+@lru_cache(maxsize=None)
+def compile_mapper(dto_model: Type[BaseModel]) -> DTOMapper:
+    return DTOMapper(dto_model)
@@ -0,0 +1,21 @@
+from django.core.exceptions import ValidationError
+
+
+class UploadedFileNotFound(ValidationError):
+    def __init__(self):
+        super().__init__("Uploaded file not found in storage")
+
+
+class UploadedFileRejected(ValidationError):
+    def __init__(self, reason: str):
+        super().__init__(f"Uploaded file rejected: {reason}")
+
+
+class DirectUploadUnsupported(ValidationError):
+    def __init__(self):
+        super().__init__("Direct uploads need the s3 storage backend")
+
+
+class InvalidNdjsonLine(ValidationError):
+    def __init__(self, line: int, reason: str):
+        super().__init__(f"Line {line}: {reason}")
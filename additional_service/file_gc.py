@@ -0,0 +1,161 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from additional_service.images import PHOTO_MODELS, variant_urls
+from additional_service.models import PendingDeletion, StoredFile
+from additional_service.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+# Тимчасові файли завантажень і варіантів, що лишилися після падіння процесу
+TEMPORARY_PREFIXES = (".upload-", ".variant-")
+# Системні файли (значки з initial_data_loading) рядків не мають, їх не прибираємо
+SYSTEM_PREFIX = "system/"
+
+
+def queue_deletion(keys: list[str]) -> None:
+    """Queues files for the collector, it runs once the current transaction commits"""
+    keys = list(dict.fromkeys(key for key in keys if key))
+    if not keys:
+        return
+    PendingDeletion.objects.bulk_create(
+        [PendingDeletion(key=key) for key in keys], ignore_conflicts=True
+    )
+    transaction.on_commit(schedule_collection)
+
+
+def cancel_deletion(key: str) -> None:
+    """Takes a key back from the queue before a new reference relies on its file
+
+    While the collector removes the key, its queue row is locked and this waits.
+    """
+    PendingDeletion.objects.filter(pk=key).delete()
+
+
+def collect_garbage(batch_size: int | None = None) -> int:
+    """Removes queued files batch by batch until the queue is empty"""
+    batch_size = batch_size or settings.FILE_GC_BATCH_SIZE
+    storage = get_storage()
+    removed = 0
+    while True:
+        with transaction.atomic():
+            keys = list(
+                PendingDeletion.objects.select_for_update(skip_locked=True)
+                .order_by("queued_at")
+                .values_list("key", flat=True)[:batch_size]
+            )
+            if not keys:
+                return removed
+            # вміст могли завантажити знову, поки ключ чекав у черзі
+            in_use = set(
+                StoredFile.objects.filter(pk__in=keys).values_list("pk", flat=True)
+            )
+            unused = [key for key in keys if key not in in_use]
+            # варіанти лежать поруч з оригіналом і йдуть тим самим запитом
+            storage.delete_many(
+                [
+                    stored_key
+                    for key in unused
+                    for stored_key in (*variant_urls(key), key)
+                ]
+            )
+            PendingDeletion.objects.filter(pk__in=keys).delete()
+        removed += len(unused)
+        logger.info("Removed %s files, %s kept in use", len(unused), len(in_use))
+
+
+def sweep_orphans(
+    grace: int | None = None,
+    prefixes: tuple[str, ...] | None = None,
+    dry_run: bool = False,
+) -> list[str]:
+    """Queues files no GameInfo, GalleryItem or Developer row points to
+
+    Files younger than `grace` seconds are left alone: their rows may not be
+    committed yet. Files under SYSTEM_PREFIX are never queued.
+    """
+    from django.apps import apps
+
+    storage = get_storage()
+    grace = settings.ORPHAN_SWEEP_GRACE if grace is None else grace
+    prefixes = prefixes or (
+        *(f"{group}/" for group in PHOTO_MODELS),
+        *TEMPORARY_PREFIXES,
+    )
+    cutoff = timezone.now() - timedelta(seconds=grace)
+
+    referenced = set()
+    for label in PHOTO_MODELS.values():
+        photos = apps.get_model(label).objects.values_list("photo", flat=True)
+        for photo in photos.iterator():
+            key = storage.key(photo)
+            if key:
+                referenced.update((key, *variant_urls(key)))
+
+    orphans = [
+        key
+        for key, modified in storage.list_files(prefixes)
+        if modified < cutoff
+        and key not in referenced
+        and not key.startswith(SYSTEM_PREFIX)
+    ]
+    if dry_run:
+        return orphans
+
+    for start in range(0, len(orphans), settings.FILE_GC_BATCH_SIZE):
+        batch = orphans[start : start + settings.FILE_GC_BATCH_SIZE]
+        with transaction.atomic():
+            # щойно додане посилання означає, що рядок з цим фото ось-ось з'явиться
+            recent = set(
+                StoredFile.objects.select_for_update()
+                .filter(pk__in=batch, referenced_at__gte=cutoff)
+                .values_list("pk", flat=True)
+            )
+            batch = [key for key in batch if key not in recent]
+            # лічильники файлів, чиї рядки зникли каскадом або відкотилися
+            StoredFile.objects.filter(pk__in=batch).delete()
+            queue_deletion(batch)
+    return orphans
+
+
+def schedule_collection() -> None:
+    """Runs the collector with FILE_GC_EXECUTOR"""
+    executor = settings.FILE_GC_EXECUTOR
+    if executor == "celery":
+        from additional_service.tasks import collect_file_garbage
+
+        collect_file_garbage.delay()
+    elif executor == "inline":
+        collect_garbage()
+    else:
+        _get_thread_pool().submit(_collect_in_thread)
+
+
+def _collect_in_thread() -> None:
+    try:
+        collect_garbage()
+    except Exception:
+        logger.exception("File garbage collection failed")
+    finally:
+        connections.close_all()
+
+
+_thread_pool = None
+_thread_pool_lock = threading.Lock()
+
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    with _thread_pool_lock:
+        if _thread_pool is None:
+            # один потік: прибирання послідовне, запити на нього не чекають
+            _thread_pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="file-gc"
+            )
+    return _thread_pool
@@ -0,0 +1,192 @@
+import hashlib
+import mimetypes
+import os
+import re
+import tempfile
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from additional_service.exceptions import (
+    DirectUploadUnsupported,
+    UploadedFileNotFound,
+    UploadedFileRejected,
+)
+from additional_service.file_gc import SYSTEM_PREFIX, cancel_deletion
+from additional_service.models import StoredFile
+from additional_service.storage import MUTABLE_CACHE_CONTROL, get_storage
+
+# <група>/<перші 2 символи хешу>/<sha256><розширення>
+BLOB_KEY = re.compile(r"^[\w-]+/([0-9a-f]{2})/(\1[0-9a-f]{62})(\.\w+)?$")
+
+
+def blob_key(group_name: str, digest: str, extension: str) -> str:
+    return f"{group_name}/{digest[:2]}/{digest}{extension}"
+
+
+def store_upload(group_name: str, uploaded_file) -> str:
+    """Streams the upload to storage while hashing it, identical content is kept once
+
+    Every call adds a reference to the blob, `release_file` removes one.
+    """
+    storage = get_storage()
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(
+        dir=storage.temporary_directory(), prefix=".upload-", delete=False
+    ) as temporary_file:
+        temporary_path = temporary_file.name
+    try:
+        with open(temporary_path, "wb") as temporary_file:
+            for chunk in uploaded_file.chunks(settings.UPLOAD_CHUNK_SIZE):
+                digest.update(chunk)
+                size += len(chunk)
+                temporary_file.write(chunk)
+        key = blob_key(group_name, digest.hexdigest(), _extension(uploaded_file.name))
+        _add_reference(storage, key, digest.hexdigest(), size, temporary_path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+    return storage.url(key)
+
+
+def store_system_file(key: str, uploaded_file) -> str:
+    """Saves the file under SYSTEM_PREFIX + key, replacing the previous one
+
+    The key stays the same between loads, so the frontend can link to it.
+    No reference is counted and the orphan sweep leaves the file alone.
+    """
+    storage = get_storage()
+    key = SYSTEM_PREFIX + key
+    with tempfile.NamedTemporaryFile(
+        dir=storage.temporary_directory(), prefix=".upload-", delete=False
+    ) as temporary_file:
+        temporary_path = temporary_file.name
+    try:
+        with open(temporary_path, "wb") as temporary_file:
+            for chunk in uploaded_file.chunks(settings.UPLOAD_CHUNK_SIZE):
+                temporary_file.write(chunk)
+        storage.save(
+            key,
+            temporary_path,
+            mimetypes.guess_type(key)[0],
+            cache_control=MUTABLE_CACHE_CONTROL,
+        )
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+    return storage.url(key)
+
+
+def _extension(filename: str) -> str:
+    extension = os.path.splitext(filename)[1].lower()
+    return ".jpg" if extension == ".jpeg" else extension
+
+
+def _add_reference(storage, key, sha256: str, size: int, temporary_path: str) -> None:
+    with transaction.atomic():
+        StoredFile.objects.select_for_update().get_or_create(
+            path=key, defaults={"sha256": sha256, "size": size}
+        )
+        _increment(key)
+        # файл кладемо під блокуванням рядка: паралельний release не видалить його
+        # між перевіркою і записом, а ключ із черги збирача знімаємо до перевірки
+        cancel_deletion(key)
+        if not storage.exists(key):
+            storage.save(key, temporary_path, mimetypes.guess_type(key)[0])
+
+
+def direct_upload(
+    group_name: str, sha256: str, content_type: str, extension: str
+) -> dict:
+    """Where the client PUTs the file itself; upload is None when it is already stored"""
+    storage = get_storage()
+    key = blob_key(group_name, sha256, _extension(f"file{extension}"))
+    upload = None
+    if not storage.exists(key):
+        upload = storage.presigned_upload(key, content_type, sha256)
+        if upload is None:
+            raise DirectUploadUnsupported()
+    return {"photo": storage.url(key), "upload": upload}
+
+
+def attach_file(url: str, allow_external: bool = False) -> str:
+    """Adds a reference to a blob the client uploaded directly to the storage
+
+    The blob is hashed again: a key only counts when the content matches it.
+    Addresses outside the storage are refused unless `allow_external` (admin
+    import of old records); those are returned as they are, without a reference.
+    """
+    storage = get_storage()
+    key = storage.key(url)
+    if key is None:
+        if not allow_external:
+            # інакше будь-хто показав би в галереї картинку з чужого сайту
+            raise UploadedFileNotFound()
+        return url
+    match = BLOB_KEY.match(key)
+    if match is None:
+        raise UploadedFileNotFound()
+    with transaction.atomic():
+        cancel_deletion(key)
+        size = storage.size(key)
+        if size is None:
+            raise UploadedFileNotFound()
+        stored = StoredFile.objects.select_for_update().filter(pk=key).first()
+        if stored is None:
+            _check_direct_upload(storage, key, match[2], size)
+            StoredFile.objects.create(path=key, sha256=match[2], size=size)
+        _increment(key)
+    return url
+
+
+def _increment(key: str) -> None:
+    StoredFile.objects.filter(pk=key).update(
+        refcount=F("refcount") + 1, referenced_at=timezone.now()
+    )
+
+
+def _check_direct_upload(storage, key: str, sha256: str, size: int) -> None:
+    """The same limits a photo_jpeg upload passes: size, content hash, an image
+
+    A rejected blob is removed, so the key is free for another upload.
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    # розмір з HEAD: завеликий файл навіть не завантажуємо
+    if size > settings.UPLOAD_MAX_SIZE:
+        storage.delete(key)
+        raise UploadedFileRejected(
+            f"File is larger than {settings.UPLOAD_MAX_SIZE} bytes"
+        )
+    with storage.open(key) as stored_file:
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: stored_file.read(settings.UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        if digest.hexdigest() != sha256:
+            # під ключем чужий вміст, звільняємо ключ для повторного завантаження
+            storage.delete(key)
+            raise UploadedFileNotFound()
+        stored_file.seek(0)
+        try:
+            with Image.open(stored_file) as image:
+                image.verify()
+        except (UnidentifiedImageError, OSError, SyntaxError, ValueError):
+            storage.delete(key)
+            raise UploadedFileRejected("File is not an image")
+
+
+def release_file(url: str) -> bool | None:
+    """Drops one reference; True when the blob is no longer used, None if untracked"""
+    key = get_storage().key(url)
+    with transaction.atomic():
+        stored = StoredFile.objects.select_for_update().filter(pk=key).first()
+        if stored is None:
+            return None
+        if stored.refcount > 1:
+            StoredFile.objects.filter(pk=key).update(refcount=F("refcount") - 1)
+            return False
+        stored.delete()
+    return True
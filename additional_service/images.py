@@ -0,0 +1,160 @@
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, transaction
+
+from additional_service.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+# Ширина кожного варіанта; вужчі за неї оригінали не збільшуються
+VARIANT_WIDTHS = {"thumbnail": 320, "card": 640, "full": 1280}
+# AVIF у Pillow 10.2 без плагіна недоступний, тож WebP і JPEG для старих браузерів
+VARIANT_FORMATS = {
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+# Група завантаження (початок ключа у сховищі) -> модель з photo/photo_variants
+PHOTO_MODELS = {
+    "game_info": "catalog.GameInfo",
+    "gallery": "gallery.GalleryItem",
+    "developers": "developers.Developer",
+}
+
+
+def variant_url(photo_url: str, variant: str, image_format: str) -> str:
+    root, _ = os.path.splitext(photo_url)
+    return f"{root}.{variant}.{VARIANT_FORMATS[image_format][1]}"
+
+
+def variant_urls(photo_url: str) -> list[str]:
+    """Every variant a photo can have, generated or not"""
+    return [
+        variant_url(photo_url, variant, image_format)
+        for variant in VARIANT_WIDTHS
+        for image_format in VARIANT_FORMATS
+    ]
+
+
+def build_variants(photo_url: str) -> dict[str, dict[str, str]]:
+    """Stores the resized variants next to the original, {variant: {format: url}}"""
+    from PIL import Image, ImageOps
+
+    storage = get_storage()
+    key = storage.key(photo_url)
+    if key is None or not storage.exists(key):
+        raise FileNotFoundError(photo_url)
+    with storage.open(key) as source, Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        variants = {}
+        for variant, width in VARIANT_WIDTHS.items():
+            resized = image
+            if image.width > width:
+                height = max(1, round(image.height * width / image.width))
+                resized = image.resize((width, height), Image.LANCZOS)
+            variants[variant] = {
+                image_format: _save(
+                    storage, resized, variant_url(photo_url, variant, image_format)
+                )
+                for image_format in VARIANT_FORMATS
+            }
+    return variants
+
+
+def _save(storage, image, url: str) -> str:
+    from PIL import Image
+
+    image_format = "jpeg" if url.endswith(".jpg") else "webp"
+    pillow_format, _, options = VARIANT_FORMATS[image_format]
+    if pillow_format == "JPEG" and image.mode == "RGBA":
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    # повністю записаний тимчасовий файл потрапляє у сховище одним кроком, тож
+    # nginx чи бакет не віддадуть наполовину записаний варіант
+    with tempfile.NamedTemporaryFile(
+        dir=storage.temporary_directory(), prefix=".variant-", delete=False
+    ) as temporary_file:
+        image.save(temporary_file, pillow_format, **options)
+    try:
+        storage.save(storage.key(url), temporary_file.name, f"image/{image_format}")
+    finally:
+        if os.path.exists(temporary_file.name):
+            os.remove(temporary_file.name)
+    return url
+
+
+def process_photo(photo_url: str) -> dict[str, dict[str, str]]:
+    """Builds the variants and stores their map on the rows that use the photo"""
+    try:
+        variants = build_variants(photo_url)
+    except FileNotFoundError:
+        # фото видалили раніше, ніж до нього дійшла черга
+        return {}
+    except OSError:
+        logger.warning("Photo %s is not an image Pillow can read", photo_url)
+        return {}
+    model = _photo_model(photo_url)
+    if model is not None:
+        for instance in model.objects.filter(photo=photo_url):
+            instance.photo_variants = variants
+            # save, а не update: сигнали моделей (кеш каталогу) мають спрацювати
+            instance.save(update_fields=["photo_variants"])
+    return variants
+
+
+def _photo_model(photo_url: str):
+    key = get_storage().key(photo_url) or ""
+    label = PHOTO_MODELS.get(key.split("/")[0])
+    return apps.get_model(label) if label else None
+
+
+def schedule_photo_variants(photo_url: str | None) -> None:
+    """Hands the photo to IMAGE_VARIANTS_EXECUTOR once the current transaction commits"""
+    if not photo_url or not settings.IMAGE_VARIANTS:
+        return
+    transaction.on_commit(lambda: _submit(photo_url))
+
+
+def _submit(photo_url: str) -> None:
+    executor = settings.IMAGE_VARIANTS_EXECUTOR
+    if executor == "celery":
+        from additional_service.tasks import generate_photo_variants
+
+        generate_photo_variants.delay(photo_url)
+    elif executor == "inline":
+        process_photo(photo_url)
+    else:
+        _get_thread_pool().submit(_process_in_thread, photo_url)
+
+
+def _process_in_thread(photo_url: str) -> None:
+    try:
+        process_photo(photo_url)
+    except Exception:
+        logger.exception("Variants of %s were not generated", photo_url)
+    finally:
+        # з'єднання з БД належать потоку пулу, тримати їх між задачами ні до чого
+        connections.close_all()
+
+
+_thread_pool = None
+_thread_pool_lock = threading.Lock()
+
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    with _thread_pool_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_VARIANTS_WORKERS,
+                thread_name_prefix="image-variants",
+            )
+    return _thread_pool
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from additional_service.file_gc import collect_garbage, sweep_orphans
+
+
+class Command(BaseCommand):
+    help = "Remove stored files that no GameInfo, GalleryItem or Developer row uses"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace", type=int, default=None, help="Skip files younger than this (s)"
+        )
+        parser.add_argument("--prefix", action="append", dest="prefixes")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        orphans = sweep_orphans(
+            grace=options["grace"],
+            prefixes=tuple(options["prefixes"] or ()),
+            dry_run=options["dry_run"],
+        )
+        for key in orphans:
+            self.stdout.write(key)
+        if options["dry_run"]:
+            self.stdout.write(f"Файлів-сиріт: {len(orphans)}")
+            return
+        removed = collect_garbage()
+        self.stdout.write(f"Видалено файлів: {removed}")
@@ -0,0 +1,29 @@
+from django.db import models
+from django.utils import timezone
+
+
+class StoredFile(models.Model):
+    """Content-addressed file under cloud_img and how many rows point to it"""
+
+    path = models.CharField(max_length=255, primary_key=True, verbose_name="Шлях")
+    sha256 = models.CharField(max_length=64, db_index=True, verbose_name="SHA-256")
+    size = models.BigIntegerField(verbose_name="Розмір")
+    refcount = models.PositiveIntegerField(default=0, verbose_name="Посилань")
+    create_at = models.DateTimeField(auto_now_add=True, verbose_name="created")
+    # коли посилання додали востаннє: свіжі файли прибиральник сиріт не чіпає
+    referenced_at = models.DateTimeField(
+        default=timezone.now, verbose_name="referenced"
+    )
+
+    def __str__(self):
+        return f"{self.path} ({self.refcount})"
+
+
+class PendingDeletion(models.Model):
+    """Storage key whose file the garbage collector still has to remove"""
+
+    key = models.CharField(max_length=255, primary_key=True, verbose_name="Ключ")
+    queued_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.key
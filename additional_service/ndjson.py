@@ -0,0 +1,41 @@
+import json
+from typing import Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from pydantic import BaseModel
+from pydantic import ValidationError as PydanticValidationError
+
+from additional_service.exceptions import InvalidNdjsonLine
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+
+def read_ndjson(lines: Iterable[bytes | str], dto_class: type[BaseModel]) -> list:
+    """Validates every line into `dto_class`, the first bad line fails them all"""
+    items = []
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as exception:
+            raise InvalidNdjsonLine(number, str(exception))
+        try:
+            items.append(dto_class.model_validate(data))
+        except PydanticValidationError as exception:
+            raise InvalidNdjsonLine(
+                number,
+                "; ".join(
+                    f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                    for error in exception.errors()
+                ),
+            )
+    return items
+
+
+def write_ndjson(rows: Iterable[dict]) -> Iterator[bytes]:
+    """One JSON object per line, for StreamingHttpResponse or a file"""
+    for row in rows:
+        yield json.dumps(
+            row, cls=DjangoJSONEncoder, ensure_ascii=False
+        ).encode() + b"\n"
@@ -0,0 +1,46 @@
+import base64
+import json
+from operator import attrgetter
+from typing import Sequence
+
+from django.db.models import Q
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Opaque url-safe cursor from the keyset values of the last row"""
+    raw = json.dumps(list(values), default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Keyset values back from the cursor, ValueError for a broken one
+
+    Only scalars are accepted: a list, an object or null from a forged cursor
+    would otherwise reach the lookups and fail there.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    if not all(isinstance(value, (str, int, float)) for value in values):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def keyset_values(instance, ordering: Sequence[str]) -> list:
+    """Values of the ordering fields, `vote__number` is read as `instance.vote.number`"""
+    return [
+        attrgetter(field.lstrip("-").replace("__", "."))(instance) for field in ordering
+    ]
+
+
+def keyset_q(ordering: Sequence[str], values: Sequence) -> Q:
+    """Rows strictly after `values` for `order_by(*ordering)`"""
+    condition = Q()
+    equal = {}
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= Q(**equal, **{f"{name}__{lookup}": value})
+        equal[name] = value
+    return condition
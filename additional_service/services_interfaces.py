@@ -6,6 +6,28 @@ class AdditionalServiceInterface(metaclass=ABCMeta):
     def upload_file_to_s3(self, group_name: str, object_name: str, bytesio_file) -> str:
         pass
 
+    @abstractmethod
+    def upload_system_file(self, key: str, bytesio_file) -> str:
+        pass
+
     @abstractmethod
     def delete_file_from_s3(self, photo_url: str) -> None:
         pass
+
+    @abstractmethod
+    def delete_files_from_s3(self, photo_urls: list[str]) -> None:
+        pass
+
+    @abstractmethod
+    def create_direct_upload(
+        self, group_name: str, sha256: str, content_type: str, extension: str
+    ) -> dict:
+        pass
+
+    @abstractmethod
+    def attach_uploaded_file(self, photo_url: str, allow_external: bool = False) -> str:
+        pass
+
+    @abstractmethod
+    def process_image(self, photo_url: str) -> None:
+        pass
@@ -0,0 +1,12 @@
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def is_shared_cache(alias: str) -> bool:
+    """True when every worker reads and writes the same entries under `alias`
+
+    LocMem lives in one process: a version bump or an invalidation there never
+    reaches the other gunicorn workers.
+    """
+    return not isinstance(caches[alias], (LocMemCache, DummyCache))
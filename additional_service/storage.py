@@ -0,0 +1,293 @@
+import base64
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Вміст за ключем не змінюється (ім'я - хеш), тож кешувати можна назавжди
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Файли з незмінним ключем (системні значки) при перезавантаженні перезаписуються
+MUTABLE_CACHE_CONTROL = "public, max-age=86400"
+
+
+class LocalStorage:
+    """Files under ./cloud_img on the web container, served by nginx"""
+
+    def __init__(self, root: str = "./cloud_img", base_url: str = "/cloud_img"):
+        self.root = root
+        self.base_url = base_url
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+    def key(self, url: str) -> str | None:
+        prefix = f"{self.base_url}/"
+        return url[len(prefix) :] if url and url.startswith(prefix) else None
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self._path(key))
+
+    def size(self, key: str) -> int | None:
+        try:
+            return os.path.getsize(self._path(key))
+        except OSError:
+            return None
+
+    def save(
+        self,
+        key: str,
+        source_path: str,
+        content_type: str | None = None,
+        cache_control: str = IMMUTABLE_CACHE_CONTROL,
+    ) -> None:
+        """Moves the finished temporary file under the key"""
+        path = self._path(key)
+        for attempt in range(3):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                os.replace(source_path, path)
+                return
+            except FileNotFoundError:
+                # збирач сміття міг прибрати порожню папку між makedirs і replace
+                if attempt == 2 or not os.path.exists(source_path):
+                    raise
+
+    def open(self, key: str):
+        return open(self._path(key), "rb")
+
+    def delete(self, key: str) -> None:
+        self.delete_many([key])
+
+    def delete_many(self, keys: list[str]) -> None:
+        """Removes the files, then the directories the removal left empty"""
+        folders = set()
+        for key in keys:
+            path = self._path(key)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            logger.debug("Removed %s", path)
+            folders.add(os.path.dirname(path))
+        # глибші папки першими, щоб батьківська вже могла бути порожньою
+        for folder in sorted(folders, key=len, reverse=True):
+            self._prune(folder)
+
+    def list_files(self, prefixes: tuple[str, ...]):
+        """(key, modified) of every file whose key starts with one of the prefixes"""
+        root = os.path.abspath(self.root)
+        for folder, _, files in os.walk(root):
+            for name in files:
+                path = os.path.join(folder, name)
+                key = os.path.relpath(path, root).replace(os.sep, "/")
+                if not key.startswith(prefixes):
+                    continue
+                try:
+                    modified = os.stat(path).st_mtime
+                except FileNotFoundError:
+                    continue
+                yield key, datetime.fromtimestamp(modified, tz=timezone.utc)
+
+    def presigned_upload(self, key: str, content_type: str, sha256: str) -> None:
+        # без бакета клієнту нікуди завантажувати напряму
+        return None
+
+    def temporary_directory(self) -> str:
+        # тимчасовий файл на тому ж диску, щоб save був атомарним os.replace
+        os.makedirs(self.root, exist_ok=True)
+        return self.root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def _prune(self, folder: str) -> None:
+        # піднімаємося лише до кореня сховища, сам корінь лишається
+        root = os.path.abspath(self.root)
+        folder = os.path.abspath(folder)
+        while folder.startswith(root + os.sep):
+            try:
+                os.rmdir(folder)
+            except OSError:
+                # папка не порожня (або її вже прибрали)
+                break
+            logger.debug("Removed empty folder %s", folder)
+            folder = os.path.dirname(folder)
+
+
+class S3Storage:
+    """S3-protocol bucket (AWS S3, MinIO, ...), files never touch the web disk for long
+
+    The boto3 client keeps a connection pool and is shared by the threads of the
+    process; big files go up in multipart chunks, clients can also PUT straight
+    into the bucket with a presigned URL.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        public_url: str,
+        endpoint_url: str | None = None,
+        region: str | None = None,
+        access_key: str | None = None,
+        secret_key: str | None = None,
+        max_pool_connections: int = 10,
+        multipart_threshold: int = 8 * 1024 * 1024,
+        multipart_chunksize: int = 8 * 1024 * 1024,
+        presign_expires: int = 15 * 60,
+    ):
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.config import Config
+
+        self.bucket = bucket
+        self.public_url = public_url.rstrip("/")
+        self.presign_expires = presign_expires
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key or None,
+            aws_secret_access_key=secret_key or None,
+            config=Config(
+                max_pool_connections=max_pool_connections,
+                signature_version="s3v4",
+                s3={"addressing_style": "path"},
+            ),
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunksize,
+        )
+
+    def url(self, key: str) -> str:
+        return f"{self.public_url}/{key}"
+
+    def key(self, url: str) -> str | None:
+        prefix = f"{self.public_url}/"
+        return url[len(prefix) :] if url and url.startswith(prefix) else None
+
+    def exists(self, key: str) -> bool:
+        return self.size(key) is not None
+
+    def size(self, key: str) -> int | None:
+        from botocore.exceptions import ClientError
+
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as error:
+            if error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return None
+            raise
+        return head["ContentLength"]
+
+    def save(
+        self,
+        key: str,
+        source_path: str,
+        content_type: str | None = None,
+        cache_control: str = IMMUTABLE_CACHE_CONTROL,
+    ) -> None:
+        extra_args = {"CacheControl": cache_control}
+        if content_type:
+            extra_args["ContentType"] = content_type
+        self.client.upload_file(
+            source_path,
+            self.bucket,
+            key,
+            ExtraArgs=extra_args,
+            Config=self.transfer_config,
+        )
+        os.remove(source_path)
+
+    def open(self, key: str):
+        # великі файли не тримаємо в пам'яті повністю
+        file = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        self.client.download_fileobj(
+            self.bucket, key, file, Config=self.transfer_config
+        )
+        file.seek(0)
+        return file
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def delete_many(self, keys: list[str]) -> None:
+        # DeleteObjects приймає до 1000 ключів за запит
+        for start in range(0, len(keys), 1000):
+            response = self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={
+                    "Objects": [{"Key": key} for key in keys[start : start + 1000]],
+                    "Quiet": True,
+                },
+            )
+            for error in response.get("Errors", []):
+                logger.warning("Object %s was not removed: %s", error["Key"], error)
+
+    def list_files(self, prefixes: tuple[str, ...]):
+        paginator = self.client.get_paginator("list_objects_v2")
+        for prefix in prefixes:
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+                for stored in page.get("Contents", []):
+                    yield stored["Key"], stored["LastModified"]
+
+    def presigned_upload(self, key: str, content_type: str, sha256: str) -> dict:
+        """PUT the client makes itself; the bucket rejects content with another hash"""
+        checksum = base64.b64encode(bytes.fromhex(sha256)).decode()
+        url = self.client.generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ContentType": content_type,
+                "CacheControl": IMMUTABLE_CACHE_CONTROL,
+                "ChecksumSHA256": checksum,
+            },
+            ExpiresIn=self.presign_expires,
+        )
+        return {
+            "method": "PUT",
+            "url": url,
+            "headers": {
+                "Content-Type": content_type,
+                "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+                "x-amz-checksum-sha256": checksum,
+            },
+        }
+
+    def temporary_directory(self) -> str | None:
+        return None
+
+
+_storages = {}
+_storages_lock = threading.Lock()
+
+
+def get_storage():
+    """Driver for STORAGE_BACKEND, one per process so the S3 client pool is shared"""
+    backend = settings.STORAGE_BACKEND
+    with _storages_lock:
+        storage = _storages.get(backend)
+        if storage is None:
+            if backend == "s3":
+                storage = S3Storage(
+                    bucket=settings.STORAGE_S3_BUCKET,
+                    public_url=settings.STORAGE_S3_PUBLIC_URL,
+                    endpoint_url=settings.STORAGE_S3_ENDPOINT_URL,
+                    region=settings.STORAGE_S3_REGION,
+                    access_key=settings.STORAGE_S3_ACCESS_KEY,
+                    secret_key=settings.STORAGE_S3_SECRET_KEY,
+                    max_pool_connections=settings.STORAGE_S3_MAX_POOL_CONNECTIONS,
+                    multipart_threshold=settings.STORAGE_S3_MULTIPART_THRESHOLD,
+                    multipart_chunksize=settings.STORAGE_S3_MULTIPART_CHUNKSIZE,
+                    presign_expires=settings.STORAGE_S3_PRESIGN_EXPIRES,
+                )
+            else:
+                storage = LocalStorage()
+            _storages[backend] = storage
+    return storage
@@ -0,0 +1,23 @@
+from celery import shared_task
+
+from additional_service.file_gc import collect_garbage, sweep_orphans
+from additional_service.images import process_photo
+
+
+@shared_task
+def generate_photo_variants(photo_url: str) -> dict:
+    """Resized WebP/JPEG variants of an uploaded photo"""
+    return process_photo(photo_url)
+
+
+@shared_task
+def collect_file_garbage() -> int:
+    """Removes the files queued for deletion"""
+    return collect_garbage()
+
+
+@shared_task
+def sweep_orphan_files() -> int:
+    """Queues files no row references and removes them"""
+    orphans = sweep_orphans()
+    return len(orphans)
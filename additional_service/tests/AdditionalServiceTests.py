@@ -0,0 +1,477 @@
+import contextlib
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from datetime import timedelta
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from additional_service import storage
+from additional_service.asset_fetcher import AssetFetcher
+from additional_service.exceptions import (
+    DirectUploadUnsupported,
+    UploadedFileNotFound,
+    UploadedFileRejected,
+)
+from additional_service.file_gc import SYSTEM_PREFIX, collect_garbage, sweep_orphans
+from additional_service.models import PendingDeletion, StoredFile
+from additional_service.vote_buffer import LocalVoteBuffer
+from catalog.models import GameInfo
+from developers.models import Developer
+from additional_service.upload_delete_file import AdditionalService
+
+
+class AssetRequestHandler(SimpleHTTPRequestHandler):
+    """Static files with a log of (path, status), /flaky/ fails once with 503"""
+
+    requests_log = []
+    failed = set()
+
+    def do_GET(self):
+        if self.path.startswith("/flaky/") and self.path not in self.failed:
+            self.failed.add(self.path)
+            self.send_error(503)
+            return
+        super().do_GET()
+
+    def send_response(self, code, message=None):
+        self.requests_log.append((self.path, code))
+        super().send_response(code, message)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AdditionalServiceTests(TestCase):
+    def setUp(self):
+        with open(
+            os.path.join(os.path.dirname(__file__), "sample_photo.jpg"), "rb"
+        ) as photo_file:
+            self.photo_content = photo_file.read()
+        self.additional_service = AdditionalService()
+
+    def _upload(self, name: str, object_name: str = "Test") -> str:
+        return self.additional_service.upload_file_to_s3(
+            group_name="test_uploads",
+            object_name=object_name,
+            bytesio_file=SimpleUploadedFile(
+                name, self.photo_content, content_type="image/jpeg"
+            ),
+        )
+
+    def _delete(self, photo_url: str) -> None:
+        self.additional_service.delete_file_from_s3(photo_url=photo_url)
+        collect_garbage()
+
+    @override_settings(UPLOAD_CHUNK_SIZE=7)
+    def test_upload_is_content_addressed(self):
+        photo_url = self._upload("sample_photo.jpg")
+        self.addCleanup(self._delete, photo_url)
+        digest = hashlib.sha256(self.photo_content).hexdigest()
+        self.assertEqual(
+            photo_url, f"/cloud_img/test_uploads/{digest[:2]}/{digest}.jpg"
+        )
+        with open(f".{photo_url}", "rb") as stored:
+            self.assertEqual(stored.read(), self.photo_content)
+        self.assertEqual(os.listdir("./cloud_img/test_uploads"), [digest[:2]])
+
+    def test_identical_uploads_are_stored_once(self):
+        first = self._upload("sample_photo.jpg", object_name="First")
+        second = self._upload("other_name.JPEG", object_name="Second")
+        self.assertEqual(first, second)
+        key = first.removeprefix("/cloud_img/")
+        stored = StoredFile.objects.get(pk=key)
+        self.assertEqual(stored.refcount, 2)
+        self.assertEqual(stored.size, len(self.photo_content))
+
+        self._delete(first)
+        self.assertTrue(os.path.isfile(f".{first}"))
+        self.assertEqual(StoredFile.objects.get(pk=key).refcount, 1)
+
+        self._delete(second)
+        self.assertFalse(os.path.exists(f".{first}"))
+        self.assertFalse(StoredFile.objects.filter(pk=key).exists())
+
+    def test_untracked_file_is_deleted(self):
+        os.makedirs("./cloud_img/test_uploads/legacy", exist_ok=True)
+        with open("./cloud_img/test_uploads/legacy/photo.jpg", "wb") as legacy:
+            legacy.write(self.photo_content)
+        self._delete("/cloud_img/test_uploads/legacy/photo.jpg")
+        self.assertFalse(os.path.exists("./cloud_img/test_uploads/legacy"))
+        # порожні папки прибираються лише до кореня сховища
+        self.assertTrue(os.path.isdir("./cloud_img"))
+
+    @override_settings(FILE_GC_EXECUTOR="inline")
+    def test_delete_is_collected_after_commit(self):
+        photo_url = self._upload("sample_photo.jpg")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.additional_service.delete_file_from_s3(photo_url=photo_url)
+            self.assertTrue(os.path.isfile(f".{photo_url}"))
+            self.assertTrue(PendingDeletion.objects.exists())
+        self.assertFalse(os.path.exists(f".{photo_url}"))
+        self.assertFalse(PendingDeletion.objects.exists())
+
+    def test_upload_takes_file_back_from_queue(self):
+        photo_url = self._upload("sample_photo.jpg")
+        self.additional_service.delete_file_from_s3(photo_url=photo_url)
+        self.assertEqual(self._upload("sample_photo.jpg"), photo_url)
+        self.addCleanup(self._delete, photo_url)
+        self.assertFalse(PendingDeletion.objects.exists())
+        collect_garbage()
+        self.assertTrue(os.path.isfile(f".{photo_url}"))
+
+    def test_sweep_removes_only_old_unreferenced_files(self):
+        photo_url = self._upload("sample_photo.jpg")
+        Developer.objects.create(
+            name_ua="тест", name_en="test", role_ua="Тест", photo=photo_url
+        )
+        self.addCleanup(self._delete, photo_url)
+        os.makedirs("./cloud_img/test_uploads/orphans", exist_ok=True)
+        old = "./cloud_img/test_uploads/orphans/old.jpg"
+        fresh = "./cloud_img/test_uploads/orphans/fresh.jpg"
+        for path in (old, fresh):
+            with open(path, "wb") as orphan:
+                orphan.write(self.photo_content)
+        self.addCleanup(self._delete, "/cloud_img/test_uploads/orphans/fresh.jpg")
+        day_ago = time.time() - 24 * 60 * 60
+        for path in (old, f".{photo_url}"):
+            os.utime(path, (day_ago, day_ago))
+        # рядок посилання на файл старший за поріг, але рядок гри ще тримає фото
+        StoredFile.objects.update(referenced_at=timezone.now() - timedelta(days=1))
+
+        orphans = sweep_orphans(grace=60 * 60, prefixes=("test_uploads/",))
+        self.assertEqual(orphans, ["test_uploads/orphans/old.jpg"])
+        collect_garbage()
+        self.assertFalse(os.path.exists(old))
+        self.assertTrue(os.path.isfile(fresh))
+        self.assertTrue(os.path.isfile(f".{photo_url}"))
+
+    def test_sweep_keeps_system_files(self):
+        key = f"{SYSTEM_PREFIX}test_uploads/icon.jpg"
+        os.makedirs(os.path.dirname(f"./cloud_img/{key}"), exist_ok=True)
+        with open(f"./cloud_img/{key}", "wb") as icon:
+            icon.write(self.photo_content)
+        self.addCleanup(storage.get_storage().delete, key)
+        day_ago = time.time() - 24 * 60 * 60
+        os.utime(f"./cloud_img/{key}", (day_ago, day_ago))
+
+        self.assertEqual(sweep_orphans(grace=60 * 60, prefixes=(SYSTEM_PREFIX,)), [])
+        collect_garbage()
+        self.assertTrue(os.path.isfile(f"./cloud_img/{key}"))
+
+    def test_attach_uploaded_file_adds_reference(self):
+        photo_url = self._upload("sample_photo.jpg")
+        self.addCleanup(self._delete, photo_url)
+        self.assertEqual(
+            self.additional_service.attach_uploaded_file(photo_url=photo_url),
+            photo_url,
+        )
+        self.assertEqual(
+            StoredFile.objects.get(pk=photo_url.removeprefix("/cloud_img/")).refcount,
+            2,
+        )
+        self._delete(photo_url)
+        self.assertTrue(os.path.isfile(f".{photo_url}"))
+
+    def test_attach_missing_file_fails(self):
+        digest = hashlib.sha256(b"never uploaded").hexdigest()
+        with self.assertRaises(UploadedFileNotFound):
+            self.additional_service.attach_uploaded_file(
+                photo_url=f"/cloud_img/test_uploads/{digest[:2]}/{digest}.jpg"
+            )
+        with self.assertRaises(UploadedFileNotFound):
+            self.additional_service.attach_uploaded_file(
+                photo_url="https://example.com/photo.jpg"
+            )
+        # адміністративний імпорт лишає старі адреси поза сховищем як є
+        self.assertEqual(
+            self.additional_service.attach_uploaded_file(
+                photo_url="Фото", allow_external=True
+            ),
+            "Фото",
+        )
+
+    def _put_blob(self, content: bytes) -> str:
+        digest = hashlib.sha256(content).hexdigest()
+        key = f"test_uploads/{digest[:2]}/{digest}.jpg"
+        os.makedirs(f"./cloud_img/test_uploads/{digest[:2]}", exist_ok=True)
+        with open(f"./cloud_img/{key}", "wb") as blob:
+            blob.write(content)
+        return f"/cloud_img/{key}"
+
+    def test_attach_rejects_file_that_is_not_image(self):
+        photo_url = self._put_blob(b"<html>not a photo</html>")
+        with self.assertRaises(UploadedFileRejected):
+            self.additional_service.attach_uploaded_file(photo_url=photo_url)
+        self.assertFalse(os.path.exists(f".{photo_url}"))
+        self.assertFalse(StoredFile.objects.exists())
+
+    @override_settings(UPLOAD_MAX_SIZE=100)
+    def test_attach_rejects_too_large_file(self):
+        photo_url = self._put_blob(self.photo_content)
+        with self.assertRaises(UploadedFileRejected):
+            self.additional_service.attach_uploaded_file(photo_url=photo_url)
+        self.assertFalse(os.path.exists(f".{photo_url}"))
+        self.assertFalse(StoredFile.objects.exists())
+
+    def test_direct_upload_needs_object_storage(self):
+        with self.assertRaises(DirectUploadUnsupported):
+            self.additional_service.create_direct_upload(
+                group_name="test_uploads",
+                sha256=hashlib.sha256(b"new photo").hexdigest(),
+                content_type="image/jpeg",
+                extension=".jpg",
+            )
+        response = self.client.post(
+            "/api/v1/uploads/",
+            data={
+                "group_name": "gallery",
+                "sha256": hashlib.sha256(b"new photo").hexdigest(),
+                "content_type": "image/jpeg",
+                "extension": ".jpg",
+            },
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(
+            "Direct uploads need the s3 storage backend", response.data["message"]
+        )
+        self.assertIn("PLAYER_UUID", response.cookies)
+
+    @override_settings(VOTE_FLUSH_INTERVAL=0.01)
+    def test_local_vote_buffer_flushes_on_timer(self):
+        buffer = LocalVoteBuffer()
+        self.assertTrue(buffer.push("counter", "voter", 1, voted=False))
+        flushed = threading.Event()
+
+        def flush():
+            self.assertEqual(buffer.claim(), {("counter", "voter"): 1})
+            # голоси лишаються видимими, доки скидання не підтверджене
+            self.assertEqual(buffer.deltas(), {"counter": 1})
+            buffer.ack()
+            flushed.set()
+
+        buffer.schedule_flush(flush)
+        self.assertTrue(flushed.wait(5))
+        self.assertEqual(buffer.deltas(), {})
+
+    def test_local_vote_buffer_keeps_votes_of_failed_flush(self):
+        buffer = LocalVoteBuffer()
+        buffer.push("counter", "voter", 1, voted=False)
+        self.assertEqual(buffer.claim(), {("counter", "voter"): 1})
+        # друге скидання не бере те саме, поки перше триває
+        self.assertEqual(buffer.claim(), {})
+        buffer.release()
+        # скасування поверх забраного голосу
+        self.assertTrue(buffer.push("counter", "voter", -1, voted=False))
+        self.assertEqual(buffer.delta("counter"), 0)
+        self.assertEqual(buffer.claim(), {("counter", "voter"): -1})
+
+    # -------------------------------------INITIAL DATA---------------------------------
+
+    def _serve_assets(self) -> str:
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        for name in ("a.jpg", "b.jpg"):
+            shutil.copy(
+                os.path.join(os.path.dirname(__file__), "sample_photo.jpg"),
+                os.path.join(directory, name),
+            )
+        os.makedirs(os.path.join(directory, "flaky"))
+        shutil.copy(os.path.join(directory, "a.jpg"), os.path.join(directory, "flaky"))
+        with open(os.path.join(directory, "developers.json"), "w") as file:
+            json.dump(
+                [
+                    {
+                        "name_ua": "Д1",
+                        "name_en": "D1",
+                        "role_ua": "Р",
+                        "photo": "a.jpg",
+                    },
+                    {
+                        "name_ua": "Д2",
+                        "name_en": "D2",
+                        "role_ua": "Р",
+                        "photo": "flaky/a.jpg",
+                    },
+                ],
+                file,
+            )
+        with open(os.path.join(directory, "catalog.json"), "w") as file:
+            json.dump(
+                [
+                    {
+                        "name_ua": "Г1",
+                        "name_en": "G1",
+                        "description_ua": "О",
+                        "description_en": "D",
+                        "members": 2,
+                        "photo": "b.jpg",
+                    },
+                    {
+                        "name_ua": "Значок",
+                        "name_en": "Icon",
+                        "description_ua": ".",
+                        "description_en": "D",
+                        "members": 0,
+                        "photo": "a.jpg",
+                    },
+                ],
+                file,
+            )
+        AssetRequestHandler.requests_log = []
+        AssetRequestHandler.failed = set()
+        server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), partial(AssetRequestHandler, directory=directory)
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_port}/"
+
+    def test_initial_data_loading_fetches_in_parallel_with_cache(self):
+        base_url = self._serve_assets()
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        Developer.objects.all().delete()
+        environment = {
+            "DATA_DEVELOPERS_JSON": base_url + "developers.json",
+            "DATA_CATALOG_JSON": base_url + "catalog.json",
+            "URL_INITIAL_DATA": base_url,
+        }
+        output = io.StringIO()
+        with mock.patch.dict(os.environ, environment), override_settings(
+            INITIAL_DATA_CACHE_DIR=cache_dir, IMAGE_VARIANTS=False
+        ), contextlib.redirect_stdout(output):
+            call_command("initial_data_loading")
+        icon_key = f"{SYSTEM_PREFIX}game_info/Icon/a.jpg"
+        self.addCleanup(storage.get_storage().delete, icon_key)
+
+        self.assertEqual(
+            set(Developer.objects.values_list("name_en", flat=True)), {"D1", "D2"}
+        )
+        self.assertEqual(
+            list(GameInfo.objects.values_list("name_en", flat=True)), ["G1"]
+        )
+        # значок лежить під незмінним ключем, а його адресу виведено
+        self.assertTrue(os.path.isfile(f"./cloud_img/{icon_key}"))
+        self.assertIn(f"/cloud_img/{icon_key}", output.getvalue())
+        # 503 повторено, кожен файл скачано один раз
+        self.assertIn(("/flaky/a.jpg", 503), AssetRequestHandler.requests_log)
+        self.assertEqual(
+            sorted(
+                path for path, code in AssetRequestHandler.requests_log if code == 200
+            ),
+            ["/a.jpg", "/b.jpg", "/catalog.json", "/developers.json", "/flaky/a.jpg"],
+        )
+
+        # повторний запуск лише перевіряє, що файли не змінилися
+        AssetRequestHandler.requests_log = []
+        fetcher = AssetFetcher(cache_dir=cache_dir, workers=4)
+        self.addCleanup(fetcher.close)
+        paths = fetcher.fetch_many([base_url + "a.jpg", base_url + "b.jpg"])
+        self.assertEqual({code for _, code in AssetRequestHandler.requests_log}, {304})
+        with open(paths[base_url + "b.jpg"], "rb") as cached, open(
+            os.path.join(os.path.dirname(__file__), "sample_photo.jpg"), "rb"
+        ) as original:
+            self.assertEqual(cached.read(), original.read())
+
+
+S3_TEST_ENDPOINT_URL = os.getenv("STORAGE_S3_TEST_ENDPOINT_URL")
+
+
+@unittest.skipUnless(S3_TEST_ENDPOINT_URL, "STORAGE_S3_TEST_ENDPOINT_URL is not set")
+@override_settings(
+    STORAGE_BACKEND="s3",
+    STORAGE_S3_BUCKET="junfolio-tests",
+    STORAGE_S3_ENDPOINT_URL=S3_TEST_ENDPOINT_URL,
+    STORAGE_S3_PUBLIC_URL=f"{S3_TEST_ENDPOINT_URL}/junfolio-tests",
+    STORAGE_S3_REGION="us-east-1",
+    STORAGE_S3_ACCESS_KEY=os.getenv("STORAGE_S3_TEST_ACCESS_KEY", "minioadmin"),
+    STORAGE_S3_SECRET_KEY=os.getenv("STORAGE_S3_TEST_SECRET_KEY", "minioadmin"),
+)
+class S3StorageTests(TestCase):
+    """Runs against a disposable bucket, e.g. MinIO from docker-compose_dev.yml"""
+
+    def setUp(self):
+        with open(
+            os.path.join(os.path.dirname(__file__), "sample_photo.jpg"), "rb"
+        ) as photo_file:
+            self.photo_content = photo_file.read()
+        self.additional_service = AdditionalService()
+        storage._storages.clear()
+        self.addCleanup(storage._storages.clear)
+        self.client_s3 = storage.get_storage().client
+        try:
+            self.client_s3.create_bucket(Bucket="junfolio-tests")
+        except self.client_s3.exceptions.BucketAlreadyOwnedByYou:
+            pass
+
+    def test_upload_goes_to_bucket(self):
+        photo_url = self.additional_service.upload_file_to_s3(
+            group_name="test_uploads",
+            object_name="Test",
+            bytesio_file=SimpleUploadedFile(
+                "sample_photo.jpg", self.photo_content, content_type="image/jpeg"
+            ),
+        )
+        key = storage.get_storage().key(photo_url)
+        stored = self.client_s3.get_object(Bucket="junfolio-tests", Key=key)
+        self.assertEqual(stored["Body"].read(), self.photo_content)
+        self.assertEqual(stored["ContentType"], "image/jpeg")
+
+        self.additional_service.delete_file_from_s3(photo_url=photo_url)
+        collect_garbage()
+        self.assertFalse(storage.get_storage().exists(key))
+
+    def test_direct_upload_is_checked_by_hash(self):
+        digest = hashlib.sha256(self.photo_content).hexdigest()
+        direct_upload = self.additional_service.create_direct_upload(
+            group_name="test_uploads",
+            sha256=digest,
+            content_type="image/jpeg",
+            extension=".jpg",
+        )
+        upload = direct_upload["upload"]
+        # S3 і MinIO відхиляють вміст з іншим хешем, решту відсіює attach
+        requests.put(upload["url"], data=b"other content", headers=upload["headers"])
+        with self.assertRaises(UploadedFileNotFound):
+            self.additional_service.attach_uploaded_file(
+                photo_url=direct_upload["photo"]
+            )
+
+        accepted = requests.put(
+            upload["url"], data=self.photo_content, headers=upload["headers"]
+        )
+        self.assertEqual(accepted.status_code, 200)
+        photo_url = self.additional_service.attach_uploaded_file(
+            photo_url=direct_upload["photo"]
+        )
+        self.assertEqual(StoredFile.objects.get(sha256=digest).refcount, 1)
+        self.assertIsNone(
+            self.additional_service.create_direct_upload(
+                group_name="test_uploads",
+                sha256=digest,
+                content_type="image/jpeg",
+                extension=".jpg",
+            )["upload"]
+        )
+
+        self.additional_service.delete_file_from_s3(photo_url=photo_url)
+        collect_garbage()
+        self.assertFalse(
+            storage.get_storage().exists(storage.get_storage().key(photo_url))
+        )
@@ -0,0 +1,4 @@
+from .AdditionalServiceTests import AdditionalServiceTests, S3StorageTests
+
+AdditionalServiceTests()
+S3StorageTests()
@@ -1,54 +1,54 @@
-import os
-import time
+from django.db import transaction
 
+from additional_service.file_store import (
+    attach_file,
+    direct_upload,
+    release_file,
+    store_system_file,
+    store_upload,
+)
+from additional_service.file_gc import queue_deletion
+from additional_service.images import schedule_photo_variants
 from additional_service.services_interfaces import AdditionalServiceInterface
+from additional_service.storage import get_storage
 
 
 class AdditionalService(AdditionalServiceInterface):
     def upload_file_to_s3(self, group_name: str, object_name: str, bytesio_file) -> str:
-        # Генеруємо ім'я файлу для зображення
-        filename = f"{object_name}_{bytesio_file.name}"
-        # Створення директорії для збереження зображень (якщо вона ще не існує)
-        image_directory = f"./cloud_img/{group_name}"
-        if not os.path.exists(image_directory):
-            os.makedirs(image_directory)
-        image_directory += f"/{object_name}"
-        if not os.path.exists(image_directory):
-            os.makedirs(image_directory)
-        else:
-            # якщо папка вже існує, то напевне там є малюнки
-            if filename[-4:] == "jpeg":
-                filename = f"{filename[:-5]}_{int(time.time())}{filename[-5:]}"
-            else:
-                filename = f"{filename[:-4]}_{int(time.time())}{filename[-4:]}"
-
-        # Завантажуємо зображення
-        raw_file = bytesio_file.file
-        # Генеруємо ім'я файлу для зображення
-        image_filename = f"{filename}"
-        # Шлях до зображення
-        image_path = os.path.join(image_directory, image_filename)
-        # Зберігаємо зображення
-        with open(image_path, "wb") as image_file:
-            image_file.write(raw_file.read())
-        print(f"Зображення збережено: {image_path}")
-        return image_path[1:]
+        # Ім'я файлу - SHA-256 вмісту, тож однакові зображення зберігаються один раз,
+        # object_name на нього більше не впливає
+        return store_upload(group_name, bytesio_file)
+
+    def upload_system_file(self, key: str, bytesio_file) -> str:
+        # Системні значки лежать під незмінним ключем, фронтенд посилається на шлях
+        return store_system_file(key, bytesio_file)
+
+    def create_direct_upload(
+        self, group_name: str, sha256: str, content_type: str, extension: str
+    ) -> dict:
+        return direct_upload(group_name, sha256, content_type, extension)
+
+    def attach_uploaded_file(self, photo_url: str, allow_external: bool = False) -> str:
+        return attach_file(photo_url, allow_external=allow_external)
+
+    def process_image(self, photo_url: str) -> None:
+        schedule_photo_variants(photo_url)
 
     def delete_file_from_s3(self, photo_url: str) -> None:
-        photo_url = f".{photo_url}"
-        try:
-            if os.path.isfile(photo_url):
-                os.remove(photo_url)
-                print(f"Файл {photo_url} видалено!")
-                folder_path = os.path.dirname(photo_url)
-                while folder_path != "" and folder_path != "'./cloud_img'":
-                    if not os.listdir(folder_path):
-                        os.rmdir(folder_path)
-                        print(f"Папка {folder_path} видалена!")
-                        folder_path = os.path.dirname(folder_path)
-                    else:
-                        break
-            else:
-                print("Файл або папку для видалення не знайдено!")
-        except FileNotFoundError:
-            print("Файл або папку для видалення не знайдено!")
+        _delete_files([photo_url])
+
+    def delete_files_from_s3(self, photo_urls: list[str]) -> None:
+        _delete_files(photo_urls)
+
+
+def _delete_files(photo_urls: list[str]) -> None:
+    # Запит лише знімає посилання і ставить файли в чергу, самі файли прибирає
+    # збирач сміття після коміту (additional_service.file_gc)
+    storage = get_storage()
+    with transaction.atomic():
+        unused = [
+            storage.key(photo_url)
+            for photo_url in photo_urls
+            if photo_url and release_file(photo_url) is not False
+        ]
+        queue_deletion(unused)
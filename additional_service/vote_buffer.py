@@ -0,0 +1,295 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Скільки секунд забрані голоси належать одному скиданню; якщо воно не відписалося
+# (впав процес, відкотилася зовнішня транзакція), наступне забере їх знову
+CLAIM_TIMEOUT = 60
+
+# Скрипт виконується атомарно в Redis: перевірка стану голосу і запис дельти.
+# Голос, забраний скиданням, але ще не записаний у БД, теж рахується станом
+PUSH_SCRIPT = """
+local pending = redis.call('HGET', KEYS[1], ARGV[1])
+local voted = ARGV[4] == '1'
+if pending then
+    voted = pending == '1'
+else
+    local claimed = redis.call('HGET', KEYS[3], ARGV[1])
+    if claimed then
+        voted = claimed == '1'
+    end
+end
+local op = tonumber(ARGV[2])
+if (op == 1) == voted then
+    return 0
+end
+if pending then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+else
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+end
+if redis.call('HINCRBY', KEYS[2], ARGV[3], op) == 0 then
+    redis.call('HDEL', KEYS[2], ARGV[3])
+end
+return 1
+"""
+
+# Нові голоси лягають поверх забраних раніше: кожен запис - стан, якого голос має
+# досягти в БД, тож повторне застосування нічого не подвоює
+CLAIM_SCRIPT = """
+if not redis.call('SET', KEYS[5], ARGV[1], 'NX', 'EX', ARGV[2]) then
+    return {}
+end
+local ops = redis.call('HGETALL', KEYS[1])
+for i = 1, #ops, 2 do
+    redis.call('HSET', KEYS[3], ops[i], ops[i + 1])
+end
+local deltas = redis.call('HGETALL', KEYS[2])
+for i = 1, #deltas, 2 do
+    redis.call('HINCRBY', KEYS[4], deltas[i], deltas[i + 1])
+end
+redis.call('DEL', KEYS[1], KEYS[2])
+local claimed = redis.call('HGETALL', KEYS[3])
+if #claimed == 0 then
+    redis.call('DEL', KEYS[5])
+end
+return claimed
+"""
+
+ACK_SCRIPT = """
+if redis.call('GET', KEYS[3]) == ARGV[1] then
+    redis.call('DEL', KEYS[1], KEYS[2], KEYS[3])
+end
+"""
+
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+end
+"""
+
+
+class LocalVoteBuffer:
+    """In-process stand-in for the Redis buffer (tests, runserver)
+
+    A Celery worker can't see this memory, so it is flushed on the request path
+    once per VOTE_FLUSH_INTERVAL and by a timer thread after the last vote.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ops = {}
+        self._deltas = defaultdict(int)
+        self._claimed = {}
+        self._claimed_deltas = defaultdict(int)
+        self._claimed_until = 0.0
+        self._flushed_at = time.monotonic()
+        self._timer = None
+
+    def push(self, counter_pk: str, voter_pk: str, op: int, voted: bool) -> bool:
+        key = (counter_pk, voter_pk)
+        with self._lock:
+            pending = self._ops.get(key)
+            if pending is not None:
+                voted = pending == 1
+            elif key in self._claimed:
+                voted = self._claimed[key] == 1
+            if (op == 1) == voted:
+                return False
+            if pending is None:
+                self._ops[key] = op
+            else:
+                del self._ops[key]
+            self._deltas[counter_pk] += op
+            if not self._deltas[counter_pk]:
+                del self._deltas[counter_pk]
+        return True
+
+    def delta(self, counter_pk: str) -> int:
+        with self._lock:
+            return self._deltas.get(counter_pk, 0) + self._claimed_deltas.get(
+                counter_pk, 0
+            )
+
+    def deltas(self) -> dict[str, int]:
+        with self._lock:
+            deltas = defaultdict(int, self._claimed_deltas)
+            for counter_pk, delta in self._deltas.items():
+                deltas[counter_pk] += delta
+        return {counter_pk: delta for counter_pk, delta in deltas.items() if delta}
+
+    def claim(self) -> dict[tuple[str, str], int]:
+        """Votes to write; they stay in the buffer until `ack`"""
+        with self._lock:
+            now = time.monotonic()
+            if self._claimed_until > now:
+                return {}
+            self._claimed.update(self._ops)
+            for counter_pk, delta in self._deltas.items():
+                self._claimed_deltas[counter_pk] += delta
+            self._ops.clear()
+            self._deltas.clear()
+            self._flushed_at = now
+            if self._claimed:
+                self._claimed_until = now + CLAIM_TIMEOUT
+            return dict(self._claimed)
+
+    def ack(self) -> None:
+        with self._lock:
+            self._claimed.clear()
+            self._claimed_deltas.clear()
+            self._claimed_until = 0.0
+
+    def release(self) -> None:
+        """Gives claimed votes back for the next flush to retry"""
+        with self._lock:
+            self._claimed_until = 0.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ops.clear()
+            self._deltas.clear()
+        self.ack()
+
+    def flush_due(self) -> bool:
+        return time.monotonic() - self._flushed_at >= settings.VOTE_FLUSH_INTERVAL
+
+    def schedule_flush(self, flush) -> None:
+        """Runs `flush` in VOTE_FLUSH_INTERVAL even if no other vote comes"""
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(
+                settings.VOTE_FLUSH_INTERVAL, self._timed_flush, args=(flush,)
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _timed_flush(self, flush) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            flush()
+        except Exception:
+            logger.exception("Vote buffer flush failed")
+        finally:
+            connections.close_all()
+        with self._lock:
+            left = bool(self._ops or self._claimed)
+        if left:
+            self.schedule_flush(flush)
+
+
+class RedisVoteBuffer:
+    """Pending voters and counter deltas shared by all web processes"""
+
+    def __init__(self, name: str, url: str):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ops_key = f"votes:{name}:ops"
+        self.deltas_key = f"votes:{name}:deltas"
+        # забране скиданням лежить тут, доки транзакція з ним не закомічена
+        self.claimed_ops_key = f"votes:{name}:claimed_ops"
+        self.claimed_deltas_key = f"votes:{name}:claimed_deltas"
+        self.claim_key = f"votes:{name}:claim"
+        # ack/release знімають лише своє забирання, навіть якщо потоків кілька
+        self._claims = threading.local()
+        self._push = self.client.register_script(PUSH_SCRIPT)
+        self._claim = self.client.register_script(CLAIM_SCRIPT)
+        self._ack = self.client.register_script(ACK_SCRIPT)
+        self._release = self.client.register_script(RELEASE_SCRIPT)
+
+    def push(self, counter_pk: str, voter_pk: str, op: int, voted: bool) -> bool:
+        return bool(
+            self._push(
+                keys=[self.ops_key, self.deltas_key, self.claimed_ops_key],
+                args=[f"{counter_pk}:{voter_pk}", op, counter_pk, int(voted)],
+            )
+        )
+
+    def delta(self, counter_pk: str) -> int:
+        with self.client.pipeline(transaction=False) as pipeline:
+            pipeline.hget(self.deltas_key, counter_pk)
+            pipeline.hget(self.claimed_deltas_key, counter_pk)
+            return sum(int(delta or 0) for delta in pipeline.execute())
+
+    def deltas(self) -> dict[str, int]:
+        with self.client.pipeline(transaction=False) as pipeline:
+            pipeline.hgetall(self.deltas_key)
+            pipeline.hgetall(self.claimed_deltas_key)
+            pending, claimed = pipeline.execute()
+        deltas = defaultdict(int)
+        for raw in (pending, claimed):
+            for counter_pk, delta in raw.items():
+                deltas[counter_pk.decode()] += int(delta)
+        return {counter_pk: delta for counter_pk, delta in deltas.items() if delta}
+
+    def claim(self) -> dict[tuple[str, str], int]:
+        """Votes to write; they stay in Redis until `ack`"""
+        self._claims.token = uuid4().hex
+        raw = self._claim(
+            keys=[
+                self.ops_key,
+                self.deltas_key,
+                self.claimed_ops_key,
+                self.claimed_deltas_key,
+                self.claim_key,
+            ],
+            args=[self._claims.token, CLAIM_TIMEOUT],
+        )
+        return {
+            tuple(field.decode().split(":", 1)): int(op)
+            for field, op in zip(raw[::2], raw[1::2])
+        }
+
+    def ack(self) -> None:
+        self._ack(
+            keys=[self.claimed_ops_key, self.claimed_deltas_key, self.claim_key],
+            args=[self._claims.token],
+        )
+
+    def release(self) -> None:
+        """Gives claimed votes back for the next flush to retry"""
+        self._release(keys=[self.claim_key], args=[self._claims.token])
+
+    def clear(self) -> None:
+        self.client.delete(
+            self.ops_key,
+            self.deltas_key,
+            self.claimed_ops_key,
+            self.claimed_deltas_key,
+            self.claim_key,
+        )
+
+    def flush_due(self) -> bool:
+        # Redis-буфер скидає Celery beat
+        return False
+
+    def schedule_flush(self, flush) -> None:
+        pass
+
+
+_buffers = {}
+_buffers_lock = threading.Lock()
+
+
+def get_vote_buffer(name: str):
+    """Buffer for VOTE_BUFFER_BACKEND, one per name and process"""
+    backend = settings.VOTE_BUFFER_BACKEND
+    with _buffers_lock:
+        buffer = _buffers.get((backend, name))
+        if buffer is None:
+            if backend == "redis":
+                buffer = RedisVoteBuffer(name, settings.VOTE_BUFFER_REDIS_URL)
+            else:
+                buffer = LocalVoteBuffer()
+            _buffers[(backend, name)] = buffer
+    return buffer
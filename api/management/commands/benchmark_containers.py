@@ -0,0 +1,65 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.containers import (
+    AdditionalServiceContainer,
+    ProjectContainer,
+    use_factories,
+    use_singletons,
+)
+
+# Що резолвлять в'юхи за один запит
+VIEW_PROVIDERS = {
+    "player": ProjectContainer.player_interactor,
+    "developer": ProjectContainer.developer_interactor,
+    "game_info": ProjectContainer.game_info_interactor,
+    "gallery": ProjectContainer.gallery_interactor,
+    "game_session": ProjectContainer.game_session_interactor,
+    "additional_service": AdditionalServiceContainer.additional_service,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures what resolving the interactors costs a request with factory "
+        "and with singleton container providers"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=100_000)
+
+    def handle(self, *args, **options):
+        try:
+            for mode, wire in (
+                ("factory", use_factories),
+                ("singleton", use_singletons),
+            ):
+                wire()
+                for name, provider in VIEW_PROVIDERS.items():
+                    timings = self._run(provider, options["requests"])
+                    self.stdout.write(
+                        f"{mode:<10} {name:<19} "
+                        f"avg={statistics.mean(timings) * 1_000_000:.2f}us "
+                        f"p95={self._p95(timings) * 1_000_000:.2f}us"
+                    )
+        finally:
+            # режим процесу - як у налаштуваннях
+            use_factories()
+            if settings.CONTAINER_PROVIDERS == "singleton":
+                use_singletons()
+
+    @staticmethod
+    def _run(provider, requests: int) -> list[float]:
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            provider()
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    @staticmethod
+    def _p95(timings: list[float]) -> float:
+        return sorted(timings)[int(len(timings) * 0.95) - 1]
@@ -1,17 +1,44 @@
+from functools import partial, wraps
+from uuid import UUID, uuid4
+
 from core.containers import ProjectContainer
+from players.identity import PLAYER_COOKIE, issue_player_token, read_player_cookie
+
+
+def uuid_required(func=None, *, materialize: bool = False):
+    """Gives the request a player identity in COOKIES["PLAYER_UUID"]
 
+    A browser without the cookie gets a signed token and no Player row; views
+    that write something referencing the player (rename, like, vote, session)
+    use `materialize=True` and the row is inserted there, once. A bare uuid
+    from an old cookie is materialized too: its row may have been purged.
+    `request.player_deferred` tells the view the row may not exist yet.
+    """
+    if func is None:
+        return partial(uuid_required, materialize=materialize)
 
-def uuid_required(func):
+    @wraps(func)
     def wrapper(*args, **kwargs):
         request = args[1]
-        player_uuid = request.COOKIES.get("PLAYER_UUID", None)
-        interactor = ProjectContainer.player_interactor()
-        if not player_uuid:
-            player = interactor.create_player()
-            player_uuid = player.player_uuid
-        request.COOKIES["PLAYER_UUID"] = player_uuid
+        identity = read_player_cookie(request.COOKIES.get(PLAYER_COOKIE))
+        player_uuid, signed = identity or (str(uuid4()), True)
+        if materialize and (signed or _is_uuid(player_uuid)):
+            ProjectContainer.player_interactor().materialize_players([player_uuid])
+        request.player_deferred = signed
+        request.COOKIES[PLAYER_COOKIE] = player_uuid
         response = func(*args, **kwargs)
-        response.set_cookie("PLAYER_UUID", player_uuid)
+        response.set_cookie(
+            PLAYER_COOKIE, issue_player_token(player_uuid) if signed else player_uuid
+        )
         return response
 
     return wrapper
+
+
+def _is_uuid(value: str) -> bool:
+    # хибне значення старої cookie не вставляємо, представлення відповість WrongUUID
+    try:
+        UUID(value)
+    except ValueError:
+        return False
+    return True
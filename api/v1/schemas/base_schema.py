@@ -26,6 +26,19 @@ successful_response_without_data = openapi.Schema(
 )
 
 
+photo_variants_schema = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    description=(
+        "Resized photo variants (thumbnail, card, full) with webp and jpeg URLs, "
+        "empty until they are generated"
+    ),
+    additional_properties=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        additional_properties=openapi.Schema(type=openapi.TYPE_STRING),
+    ),
+)
+
+
 developer_properties = (
     openapi.Schema(
         type=openapi.TYPE_OBJECT,
@@ -51,6 +64,7 @@ developer_properties = (
                 type=openapi.TYPE_STRING,
                 description="Developer's photo",
             ),
+            "photo_variants": photo_variants_schema,
         },
     ),
 )
@@ -67,6 +81,7 @@ gallery_item_properties = (
                 type=openapi.TYPE_STRING,
                 description="Gallery item photo",
             ),
+            "photo_variants": photo_variants_schema,
             "team_name": openapi.Schema(
                 type=openapi.TYPE_STRING,
                 description="Gallery item team name",
@@ -105,6 +120,7 @@ game_info_properties = (
                 type=openapi.TYPE_STRING,
                 description="game_info photo",
             ),
+            "photo_variants": photo_variants_schema,
             "number": openapi.Schema(
                 type=openapi.TYPE_INTEGER,
                 description="Game popularity",
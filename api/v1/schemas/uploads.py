@@ -0,0 +1,35 @@
+from drf_yasg import openapi
+
+direct_upload_response_schema = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "status": openapi.Schema(type=openapi.TYPE_STRING, description="Status"),
+        "message": openapi.Schema(
+            type=openapi.TYPE_STRING, description="Success message"
+        ),
+        "data": openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "photo": openapi.Schema(
+                    type=openapi.TYPE_STRING,
+                    description="URL to send as `photo` when creating the record",
+                ),
+                "upload": openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    nullable=True,
+                    description="Request that uploads the file, null if it is stored",
+                    properties={
+                        "method": openapi.Schema(type=openapi.TYPE_STRING),
+                        "url": openapi.Schema(type=openapi.TYPE_STRING),
+                        "headers": openapi.Schema(
+                            type=openapi.TYPE_OBJECT,
+                            additional_properties=openapi.Schema(
+                                type=openapi.TYPE_STRING
+                            ),
+                        ),
+                    },
+                ),
+            },
+        ),
+    },
+)
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from catalog.dto import GameInfoDTOResponse
+
 
 class CreateGameInfoDTOSerializer(serializers.Serializer):
     name_ua = serializers.CharField(max_length=50)
@@ -8,7 +10,8 @@ class CreateGameInfoDTOSerializer(serializers.Serializer):
     description_ua = serializers.CharField(max_length=255)
     description_en = serializers.CharField(max_length=255)
     members = serializers.IntegerField()
-    photo_jpeg = serializers.ImageField()
+    photo_jpeg = serializers.ImageField(required=False)
+    photo = serializers.CharField(max_length=255, required=False)
     is_team = serializers.BooleanField(required=False, allow_null=True, default=False)
     is_active = serializers.BooleanField(required=False, allow_null=True, default=False)
 
@@ -22,6 +25,14 @@ class CreateGameInfoDTOSerializer(serializers.Serializer):
 
         return value
 
+    def validate(self, attrs):
+        # фото приходить файлом або адресою, яку повернув uploads/ після завантаження
+        if not attrs.get("photo_jpeg") and not attrs.get("photo"):
+            raise ValidationError(
+                {"photo_jpeg": "Потрібен файл photo_jpeg або адреса photo."}
+            )
+        return attrs
+
 
 class FilterGameInfoDTOSerializer(CreateGameInfoDTOSerializer):
     name_ua = serializers.CharField(max_length=50, required=False, allow_null=True)
@@ -38,6 +49,9 @@ class FilterGameInfoDTOSerializer(CreateGameInfoDTOSerializer):
     is_team = serializers.BooleanField(required=False, allow_null=True, default=None)
     is_active = serializers.BooleanField(required=False, allow_null=True, default=None)
 
+    def validate(self, attrs):
+        return attrs
+
 
 class UpdateGameInfoDTOSerializer(FilterGameInfoDTOSerializer):
     photo_jpeg = serializers.ImageField(required=False, allow_null=True)
@@ -63,3 +77,17 @@ class FilterAndSortGameInfoDTOSerializer(FilterGameInfoDTOSerializer):
                 return "-members"
             case _:
                 raise ValidationError(f"Невідомий тип сортування: {value}")
+
+
+class CatalogPageSerializer(serializers.Serializer):
+    page = serializers.IntegerField(min_value=1, required=False)
+    page_size = serializers.IntegerField(min_value=1, max_value=100, required=False)
+    cursor = serializers.CharField(required=False)
+    fields = serializers.CharField(required=False)
+
+    def validate_fields(self, value):
+        fields = [field.strip() for field in value.split(",") if field.strip()]
+        unknown_fields = set(fields) - set(GameInfoDTOResponse.model_fields)
+        if unknown_fields:
+            raise ValidationError(f"Невідомі поля: {', '.join(sorted(unknown_fields))}")
+        return fields
@@ -6,7 +6,8 @@ class CreateDeveloperDTOSerializer(serializers.Serializer):
     name_ua = serializers.CharField(max_length=50)
     name_en = serializers.CharField(max_length=50)
     role_ua = serializers.CharField(max_length=50)
-    photo_jpeg = serializers.ImageField()
+    photo_jpeg = serializers.ImageField(required=False)
+    photo = serializers.CharField(max_length=255, required=False)
     is_active = serializers.BooleanField()
 
     def validate_photo_jpeg(self, value):
@@ -19,6 +20,14 @@ class CreateDeveloperDTOSerializer(serializers.Serializer):
 
         return value
 
+    def validate(self, attrs):
+        # фото приходить файлом або адресою, яку повернув uploads/ після завантаження
+        if not attrs.get("photo_jpeg") and not attrs.get("photo"):
+            raise ValidationError(
+                {"photo_jpeg": "Потрібен файл photo_jpeg або адреса photo."}
+            )
+        return attrs
+
     def create(self, validated_data):
         raise NotImplementedError("Method not implemented")
 
@@ -33,3 +42,6 @@ class UpdateDeveloperDTOSerializer(CreateDeveloperDTOSerializer):
     photo = serializers.CharField(required=False, allow_null=True)
     photo_jpeg = serializers.ImageField(required=False, allow_null=True)
     is_active = serializers.BooleanField(required=False, allow_null=True, default=None)
+
+    def validate(self, attrs):
+        return attrs
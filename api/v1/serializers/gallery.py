@@ -5,7 +5,8 @@ from rest_framework.exceptions import ValidationError
 class CreateGalleryItemDTOSerializer(serializers.Serializer):
     topic = serializers.CharField(max_length=255)
     text = serializers.CharField()
-    photo_jpeg = serializers.ImageField()
+    photo_jpeg = serializers.ImageField(required=False)
+    photo = serializers.CharField(max_length=255, required=False)
     team_name = serializers.CharField(max_length=255)
 
     def validate_photo_jpeg(self, value):
@@ -16,3 +17,11 @@ class CreateGalleryItemDTOSerializer(serializers.Serializer):
                 f"Розмір файлу перевищує максимально допустимий розмір {max_size} байт."
             )
         return value
+
+    def validate(self, attrs):
+        # фото приходить файлом або адресою, яку повернув uploads/ після завантаження
+        if not attrs.get("photo_jpeg") and not attrs.get("photo"):
+            raise ValidationError(
+                {"photo_jpeg": "Потрібен файл photo_jpeg або адреса photo."}
+            )
+        return attrs
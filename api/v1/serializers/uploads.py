@@ -0,0 +1,12 @@
+from rest_framework import serializers
+
+from additional_service.images import PHOTO_MODELS
+
+
+class DirectUploadSerializer(serializers.Serializer):
+    group_name = serializers.ChoiceField(choices=list(PHOTO_MODELS))
+    sha256 = serializers.RegexField(r"^[0-9a-f]{64}$")
+    content_type = serializers.ChoiceField(
+        choices=["image/jpeg", "image/png", "image/webp"]
+    )
+    extension = serializers.ChoiceField(choices=[".jpg", ".jpeg", ".png", ".webp"])
@@ -1,6 +1,8 @@
 from django.urls import include, path
 
+from api.v1.views.db_pool import ApiDbPoolStatsView
 from api.v1.views.hello import hello_world
+from api.v1.views.uploads import ApiDirectUploadView
 
 app_name = "api"
 
@@ -11,4 +13,6 @@ urlpatterns = [
     path("game_info/", include("catalog.urls", namespace="catalog")),
     path("gallery/", include("gallery.urls", namespace="galleries")),
     path("game_session/", include("game_session.urls", namespace="game_sessions")),
+    path("uploads/", ApiDirectUploadView.as_view(), name="api-uploads"),
+    path("db_pool_stats/", ApiDbPoolStatsView.as_view(), name="api-db-pool-stats"),
 ]
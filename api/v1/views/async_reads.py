@@ -0,0 +1,196 @@
+"""Async GET handlers for the read-heavy endpoints (ASYNC_READ_VIEWS=True).
+
+Under uvicorn workers a slow client or a lobby poll waits on the event loop instead
+of holding one of the few sync worker slots. Responses keep the shape of the DRF
+views they stand in for, every other method still goes to the DRF view.
+"""
+
+from uuid import UUID, uuid4
+
+from django.conf import settings
+from django.http import HttpRequest, JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+
+from api.v1.pagination.ten_items_pagination import TenItemsPagination
+from api.v1.serializers.catalog import CatalogPageSerializer
+from catalog.dto import CatalogPageRequestDTO
+from catalog.exceptions import (
+    GameInfoDoesNotExist,
+    InvalidCatalogCursor,
+    InvalidCatalogPage,
+)
+from core.containers import ProjectContainer
+from core.db.threads import db_sync_to_async
+from gallery.exceptions import (
+    GalleryItemDoesNotExist,
+    InvalidGalleryCursor,
+    InvalidGalleryPage,
+)
+from game_session.exceptions import GameSessionDoesNotExist
+from players.exceptions import PlayerDoesNotExist, WrongUUID
+from players.identity import (
+    PLAYER_COOKIE,
+    deferred_player,
+    issue_player_token,
+    read_player_cookie,
+)
+
+
+def read_view(sync_view, async_get):
+    """DRF view as is, or an async view that serves GET with `async_get`"""
+    if not settings.ASYNC_READ_VIEWS:
+        return sync_view.as_view()
+    sync_handler = db_sync_to_async(sync_view.as_view())
+
+    async def view(request: HttpRequest, *args, **kwargs):
+        if request.method == "GET":
+            return await async_get(request, *args, **kwargs)
+        return await sync_handler(request, *args, **kwargs)
+
+    # csrf_exempt у Django 4.1 загортає в синхронну функцію, тому атрибут напряму
+    view.csrf_exempt = True
+    # drf_yasg будує схему з класу DRF-представлення
+    view.cls = sync_view
+    view.initkwargs = {}
+    return view
+
+
+async def game_info(request: HttpRequest, uuid: UUID) -> JsonResponse:
+    game_info_interactor = ProjectContainer.game_info_interactor()
+    try:
+        game_info_dto = await game_info_interactor.aget_game_info_by_uuid(uuid)
+    except GameInfoDoesNotExist as exception:
+        return _not_found(exception)
+    return _success("Successful get game_info information", game_info_dto.model_dump())
+
+
+async def all_game_info(request: HttpRequest) -> JsonResponse:
+    page_serializer = CatalogPageSerializer(data=request.GET)
+    if not page_serializer.is_valid():
+        return _invalid_serializer(page_serializer)
+    page_request = CatalogPageRequestDTO(**page_serializer.validated_data)
+
+    game_info_interactor = ProjectContainer.game_info_interactor()
+    try:
+        page = await game_info_interactor.aget_all_game_info_page(page_request)
+    except (InvalidCatalogPage, InvalidCatalogCursor) as exception:
+        return _detail_not_found(exception.message)
+    return JsonResponse(
+        {
+            "status": "Success",
+            "message": "Successful get list of all game_info",
+            "count": page.count,
+            "next_cursor": page.next_cursor,
+            "data": page.items,
+        },
+        status=status.HTTP_200_OK,
+    )
+
+
+async def gallery(request: HttpRequest, game_uuid: UUID) -> JsonResponse:
+    pagination = TenItemsPagination()
+    try:
+        page, page_size = pagination.get_page_params(Request(request))
+    except NotFound as exception:
+        return _detail_not_found(exception.detail)
+
+    gallery_interactor = ProjectContainer.gallery_interactor()
+    try:
+        gallery_page = await gallery_interactor.aget_gallery(
+            game_uuid=game_uuid,
+            page=page,
+            page_size=page_size,
+            cursor=request.GET.get("cursor"),
+        )
+    except GameInfoDoesNotExist as exception:
+        return _not_found(exception)
+    except InvalidGalleryPage:
+        return _detail_not_found(pagination.invalid_page_message)
+    except InvalidGalleryCursor as exception:
+        return _detail_not_found(exception.message)
+    return JsonResponse(
+        {
+            "status": "success",
+            "message": "Successful get gallery items",
+            "count": gallery_page.count,
+            "next_cursor": gallery_page.next_cursor,
+            "data": [gallery_item.model_dump() for gallery_item in gallery_page.items],
+        },
+        status=status.HTTP_200_OK,
+    )
+
+
+async def gallery_item(request: HttpRequest, gallery_uuid: UUID) -> JsonResponse:
+    gallery_interactor = ProjectContainer.gallery_interactor()
+    try:
+        gallery_dto = await gallery_interactor.aget_gallery_by_uuid(
+            gallery_uuid=gallery_uuid
+        )
+    except GalleryItemDoesNotExist as exception:
+        return _not_found(exception)
+    return _success("Successful get gallery item", gallery_dto.model_dump())
+
+
+async def player(request: HttpRequest) -> JsonResponse:
+    player_interactor = ProjectContainer.player_interactor()
+    # те саме, що uuid_required: без cookie гравець отримує токен, а не рядок у БД
+    identity = read_player_cookie(request.COOKIES.get(PLAYER_COOKIE))
+    player_uuid, signed = identity or (str(uuid4()), True)
+    try:
+        player_dto = await player_interactor.aget_player_by_uuid(
+            player_uuid=player_uuid
+        )
+    except PlayerDoesNotExist as exception:
+        if signed:
+            response = _success(
+                "Successful player retrieve", deferred_player(player_uuid).model_dump()
+            )
+        else:
+            response = _not_found(exception)
+    except WrongUUID as exception:
+        response = _failed(str(exception), status.HTTP_400_BAD_REQUEST)
+    else:
+        response = _success("Successful player retrieve", player_dto.model_dump())
+    response.set_cookie(
+        PLAYER_COOKIE, issue_player_token(player_uuid) if signed else player_uuid
+    )
+    return response
+
+
+async def game_session_lobby(
+    request: HttpRequest, session_identificator: str
+) -> JsonResponse:
+    game_session_interactor = ProjectContainer.game_session_interactor()
+    try:
+        game_session = await game_session_interactor.aget_lobby(
+            session_identificator=session_identificator
+        )
+    except GameSessionDoesNotExist as exception:
+        return _not_found(exception)
+    return _success("Successful get game session lobby", game_session.model_dump())
+
+
+def _success(message: str, data) -> JsonResponse:
+    return JsonResponse(
+        {"status": "success", "message": message, "data": data},
+        status=status.HTTP_200_OK,
+    )
+
+
+def _failed(message: str, status_code: int) -> JsonResponse:
+    return JsonResponse({"status": "failed", "message": message}, status=status_code)
+
+
+def _not_found(exception) -> JsonResponse:
+    return _failed(str(exception.message), status.HTTP_404_NOT_FOUND)
+
+
+def _detail_not_found(detail) -> JsonResponse:
+    # як NotFound у DRF-представленнях
+    return JsonResponse({"detail": str(detail)}, status=status.HTTP_404_NOT_FOUND)
+
+
+def _invalid_serializer(serializer) -> JsonResponse:
+    return _failed(str(dict(serializer.errors)), status.HTTP_400_BAD_REQUEST)
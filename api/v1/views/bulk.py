@@ -0,0 +1,52 @@
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from pydantic import BaseModel
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from additional_service.ndjson import NDJSON_CONTENT_TYPE, read_ndjson, write_ndjson
+from api.v1.views.base import ApiBaseView
+
+
+class ApiNdjsonBulkView(APIView, ApiBaseView):
+    """Admin-only import (POST) and streaming export (GET), one JSON object per line
+
+    Under ASGI the export is built in full before the response: Django 4.1 would
+    iterate a streamed body on the event loop.
+
+    Subclasses set `dto_class` and `name` and implement `import_items`/`export_rows`.
+    """
+
+    permission_classes = [IsAdminUser]
+    dto_class: type[BaseModel]
+    name: str
+
+    def import_items(self, items: list) -> int:
+        raise NotImplementedError
+
+    def export_rows(self):
+        raise NotImplementedError
+
+    def get(self, request: Request):
+        lines = write_ndjson(self.export_rows())
+        if isinstance(request._request, ASGIRequest):
+            # ASGIHandler Django 4.1 перебирає потік у event loop, де ORM заборонений:
+            # тіло збираємо тут, у потоці представлення
+            response = HttpResponse(b"".join(lines), content_type=NDJSON_CONTENT_TYPE)
+        else:
+            response = StreamingHttpResponse(lines, content_type=NDJSON_CONTENT_TYPE)
+        response["Content-Disposition"] = f'attachment; filename="{self.name}.ndjson"'
+        return response
+
+    def post(self, request: Request):
+        # тіло читаємо рядками, request.data з його парсерами тут не потрібен
+        try:
+            items = read_ndjson(request.stream or [], self.dto_class)
+            created = self.import_items(items)
+        except ValidationError as exception:
+            return self._create_response_for_exception(exception)
+        return self._create_response_for_successful_create_request(
+            f"{self.name} import", {"created": created}
+        )
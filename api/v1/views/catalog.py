@@ -3,10 +3,12 @@ from uuid import UUID
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import parsers, status
+from rest_framework.exceptions import NotFound
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from additional_service.exceptions import UploadedFileNotFound, UploadedFileRejected
 from api.v1.decorators.uuid_required import uuid_required
 from api.v1.schemas.base_schema import error_response, successful_response_without_data
 from api.v1.schemas.catalog import (
@@ -15,19 +17,44 @@ from api.v1.schemas.catalog import (
     statistics_on_the_site_response_schema,
 )
 from api.v1.serializers.catalog import (
+    CatalogPageSerializer,
     CreateGameInfoDTOSerializer,
     FilterAndSortGameInfoDTOSerializer,
     UpdateGameInfoDTOSerializer,
 )
 from api.v1.views.base import ApiBaseView
+from api.v1.views.bulk import ApiNdjsonBulkView
 from catalog.dto import (
+    CatalogPageRequestDTO,
     CreateGameInfoDTO,
     FilterSortGameInfoDTORequest,
     UpdateGameInfoDTORequest,
 )
-from catalog.exceptions import GameInfoDoesNotExist, NameGameAlreadyExists
+from catalog.exceptions import (
+    GameInfoDoesNotExist,
+    InvalidCatalogCursor,
+    InvalidCatalogPage,
+    NameGameAlreadyExists,
+)
 from core.containers import ProjectContainer as GameInfoContainer
 
+CATALOG_PAGE_PARAMETERS = [
+    openapi.Parameter("page", in_=openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+    openapi.Parameter("page_size", in_=openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+    openapi.Parameter(
+        "cursor",
+        in_=openapi.IN_QUERY,
+        type=openapi.TYPE_STRING,
+        description="next_cursor of the previous page, replaces page",
+    ),
+    openapi.Parameter(
+        "fields",
+        in_=openapi.IN_QUERY,
+        type=openapi.TYPE_STRING,
+        description="Comma separated fields, e.g. uuid,name_ua,photo,like__number",
+    ),
+]
+
 
 class APICreateGameInfoView(APIView, ApiBaseView):
     parser_classes = (
@@ -100,7 +127,11 @@ class APICreateGameInfoView(APIView, ApiBaseView):
                 game_info_dto, bytesio_file
             )
             created_game_info_serializer_data = created_game_info.model_dump()
-        except NameGameAlreadyExists as exception:
+        except (
+            NameGameAlreadyExists,
+            UploadedFileNotFound,
+            UploadedFileRejected,
+        ) as exception:
             return self._create_response_for_exception(exception)
 
         return self._create_response_for_successful_game_info_creation(
@@ -260,6 +291,8 @@ class ApiGameInfoView(APIView, ApiBaseView):
             )
         except GameInfoDoesNotExist as exception:
             return self._create_response_not_found(exception)
+        except (UploadedFileNotFound, UploadedFileRejected) as exception:
+            return self._create_response_for_exception(exception)
         updated_game_info_serializer_data = updated_game_info.model_dump()
 
         return self._update_response(updated_game_info_serializer_data)
@@ -411,22 +444,30 @@ class APIAllGameInfoView(APIView, ApiBaseView):
           ]
         }
         """,
+        manual_parameters=CATALOG_PAGE_PARAMETERS,
         responses={
             200: openapi.Response(
                 "List of all game_info", list_of_game_info_response_schema
             ),
+            400: error_response,
+            404: error_response,
         },
         tags=["GameInfo"],
     )
     def get(self, request: Request):
         """Get all GameInfo"""
+        page_serializer = CatalogPageSerializer(data=request.query_params)
+        if not page_serializer.is_valid():
+            return self._create_response_for_invalid_serializers(page_serializer)
+        page_request = CatalogPageRequestDTO(**page_serializer.validated_data)
+
         game_info_interactor = GameInfoContainer.game_info_interactor()
-        list_of_game_info = game_info_interactor.get_all_game_info()
-        serialized_game_info = [
-            game_info.model_dump() for game_info in list_of_game_info
-        ]
+        try:
+            game_info_page = game_info_interactor.get_all_game_info_page(page_request)
+        except (InvalidCatalogPage, InvalidCatalogCursor) as exception:
+            raise NotFound(exception.message)
         return self._response_for_successful_list_of_game_info(
-            message="Successful get list of all game_info", data=serialized_game_info
+            message="Successful get list of all game_info", page=game_info_page
         )
 
     @swagger_auto_schema(
@@ -503,6 +544,7 @@ class APIAllGameInfoView(APIView, ApiBaseView):
         }
         """,
         request_body=FilterAndSortGameInfoDTOSerializer,
+        manual_parameters=CATALOG_PAGE_PARAMETERS,
         responses={
             200: openapi.Response(
                 "List of game info, or with additional filtering and sorting.",
@@ -522,10 +564,12 @@ class APIAllGameInfoView(APIView, ApiBaseView):
             catalog_filter_sort_serializer.is_valid()
         )
 
-        if not catalog_filter_sort_serializer_is_valid:
+        page_serializer = CatalogPageSerializer(data=request.query_params)
+        if not (catalog_filter_sort_serializer_is_valid and page_serializer.is_valid()):
             return self._create_response_for_invalid_serializers(
-                catalog_filter_sort_serializer
+                catalog_filter_sort_serializer, page_serializer
             )
+        page_request = CatalogPageRequestDTO(**page_serializer.validated_data)
 
         group_or_individual = catalog_filter_sort_serializer.validated_data.pop(
             "group_or_individual", None
@@ -551,30 +595,31 @@ class APIAllGameInfoView(APIView, ApiBaseView):
         )
         try:
             catalog_filter_sort_interactor = GameInfoContainer.game_info_interactor()
-            catalog_filter_sort_dto_result = (
-                catalog_filter_sort_interactor.catalog_filter_sort(
-                    catalog_filter_sort_dto
+            catalog_result_page = (
+                catalog_filter_sort_interactor.catalog_filter_sort_page(
+                    catalog_filter_sort_dto, page_request
                 )
             )
+        except (InvalidCatalogPage, InvalidCatalogCursor) as exception:
+            raise NotFound(exception.message)
         except BaseException as exception:
             return self._create_response_for_exception(exception)
 
-        catalog_result_serialized_data = [
-            game_info.model_dump() for game_info in catalog_filter_sort_dto_result
-        ]
         return self._response_for_successful_list_of_game_info(
             message="Successfully received an all game info, \
                 or with additional filtering and sorted",
-            data=catalog_result_serialized_data,
+            page=catalog_result_page,
         )
 
     @staticmethod
-    def _response_for_successful_list_of_game_info(message, data):
+    def _response_for_successful_list_of_game_info(message, page):
         return Response(
             {
                 "status": "Success",
                 "message": message,
-                "data": data,
+                "count": page.count,
+                "next_cursor": page.next_cursor,
+                "data": page.items,
             },
             status=status.HTTP_200_OK,
         )
@@ -636,7 +681,7 @@ class APIGameInfoLikeView(APIView, ApiBaseView):
         },
         tags=["GameInfo"],
     )
-    @uuid_required
+    @uuid_required(materialize=True)
     def get(self, request: Request, uuid: UUID):
         game_info_interactor = GameInfoContainer.game_info_interactor()
         player_uuid = request.COOKIES.get("PLAYER_UUID")
@@ -813,3 +858,36 @@ class APIStatisticInfoView(APIView, ApiBaseView):
             },
             status=status.HTTP_200_OK,
         )
+
+
+class APIGameInfoBulkView(ApiNdjsonBulkView):
+    dto_class = CreateGameInfoDTO
+    name = "game_info"
+
+    def import_items(self, items: list[CreateGameInfoDTO]) -> int:
+        return GameInfoContainer.game_info_interactor().bulk_create_game_info(items)
+
+    def export_rows(self):
+        return GameInfoContainer.game_info_interactor().export_game_info()
+
+    @swagger_auto_schema(
+        operation_description="Export every game_info as NDJSON, admin only",
+        responses={200: "application/x-ndjson, one game_info per line"},
+        tags=["GameInfo"],
+    )
+    def get(self, request: Request):
+        return super().get(request)
+
+    @swagger_auto_schema(
+        operation_description="""
+        Import game_info from an application/x-ndjson body, admin only
+
+        One game_info per line with the fields of the create endpoint and `photo`
+        as a URL. Every line is validated first, then all games are inserted in
+        one transaction: a bad line or a taken name imports nothing.
+        """,
+        responses={201: successful_response_without_data, 400: error_response},
+        tags=["GameInfo"],
+    )
+    def post(self, request: Request):
+        return super().post(request)
@@ -0,0 +1,28 @@
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.db.postgresql_pool.pool import pool_metrics
+
+
+class ApiDbPoolStatsView(APIView):
+    """DB pool counters of the worker that serves the request, empty without a pool"""
+
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description="Get DB connection pool counters by DB alias",
+        tags=["Stats"],
+    )
+    def get(self, request: Request):
+        return Response(
+            {
+                "status": "success",
+                "message": "Successful DB pool statistics retrieve",
+                "data": pool_metrics(),
+            },
+            status=status.HTTP_200_OK,
+        )
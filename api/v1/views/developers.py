@@ -6,6 +6,7 @@ from rest_framework import status, parsers
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from additional_service.exceptions import UploadedFileNotFound, UploadedFileRejected
 from api.v1.schemas.base_schema import error_response, successful_response_without_data
 from api.v1.schemas.developers import (
     created_developer_response_schema,
@@ -16,6 +17,7 @@ from api.v1.serializers.developers import (
     UpdateDeveloperDTOSerializer,
 )
 from api.v1.views.base import ApiBaseView
+from api.v1.views.bulk import ApiNdjsonBulkView
 from rest_framework.views import APIView
 
 from developers.dto import CreateDeveloperDTO, UpdateDeveloperDTO
@@ -96,6 +98,8 @@ class ApiDeveloperView(APIView, ApiBaseView):
             )
         except DeveloperDoesNotExist as exception:
             return self._create_response_not_found(exception)
+        except (UploadedFileNotFound, UploadedFileRejected) as exception:
+            return self._create_response_for_exception(exception)
         updated_developer_serializer_data = updated_developer.model_dump()
 
         return self._update_response(updated_developer_serializer_data)
@@ -207,9 +211,12 @@ class APICreateAllDevelopersView(APIView, ApiBaseView):
 
         developer_interactor = DeveloperContainer.developer_interactor()
 
-        created_developer = developer_interactor.create_developer(
-            developer_dto, bytesio_file
-        )
+        try:
+            created_developer = developer_interactor.create_developer(
+                developer_dto, bytesio_file
+            )
+        except (UploadedFileNotFound, UploadedFileRejected) as exception:
+            return self._create_response_for_exception(exception)
         created_developer_serializer_data = created_developer.model_dump()
 
         return self._create_response_for_successful_developer_creation(
@@ -239,3 +246,36 @@ class APICreateAllDevelopersView(APIView, ApiBaseView):
             },
             status=status.HTTP_201_CREATED,
         )
+
+
+class APIDeveloperBulkView(ApiNdjsonBulkView):
+    dto_class = CreateDeveloperDTO
+    name = "developers"
+
+    def import_items(self, items: list[CreateDeveloperDTO]) -> int:
+        return DeveloperContainer.developer_interactor().bulk_create_developers(items)
+
+    def export_rows(self):
+        return DeveloperContainer.developer_interactor().export_developers()
+
+    @swagger_auto_schema(
+        operation_description="Export every developer as NDJSON, admin only",
+        responses={200: "application/x-ndjson, one developer per line"},
+        tags=["Developers"],
+    )
+    def get(self, request: Request):
+        return super().get(request)
+
+    @swagger_auto_schema(
+        operation_description="""
+        Import developers from an application/x-ndjson body, admin only
+
+        One developer per line with the fields of the create endpoint and `photo`
+        as a URL. Every line is validated first, then all developers are inserted
+        in one transaction: a bad line or a taken name imports nothing.
+        """,
+        responses={201: successful_response_without_data, 400: error_response},
+        tags=["Developers"],
+    )
+    def post(self, request: Request):
+        return super().post(request)
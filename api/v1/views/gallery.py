@@ -3,10 +3,12 @@ from uuid import UUID
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import parsers, status
+from rest_framework.exceptions import NotFound
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from additional_service.exceptions import UploadedFileNotFound, UploadedFileRejected
 from api.v1.decorators.uuid_required import uuid_required
 from api.v1.pagination.ten_items_pagination import TenItemsPagination
 from api.v1.schemas.base_schema import error_response
@@ -19,7 +21,11 @@ from api.v1.views.base import ApiBaseView
 from catalog.exceptions import GameInfoDoesNotExist
 from core.containers import ProjectContainer as GalleryContainer
 from gallery.dto import CreateGalleryDTO
-from gallery.exceptions import GalleryItemDoesNotExist
+from gallery.exceptions import (
+    GalleryItemDoesNotExist,
+    InvalidGalleryCursor,
+    InvalidGalleryPage,
+)
 from players.exceptions import PlayerDoesNotExist, WrongUUID
 
 
@@ -57,6 +63,8 @@ class ApiGetCreateGalleryView(APIView, ApiBaseView, TenItemsPagination):
             )
         except GameInfoDoesNotExist as exception:
             return self._create_response_not_found(exception)
+        except (UploadedFileNotFound, UploadedFileRejected) as exception:
+            return self._create_response_for_exception(exception)
         return self._create_response_for_succesful_gallery_item_creation(
             created_gallery_serialized_data=created_gallery_item.model_dump()
         )
@@ -87,6 +95,12 @@ class ApiGetCreateGalleryView(APIView, ApiBaseView, TenItemsPagination):
                 in_=openapi.IN_QUERY,
                 type=openapi.TYPE_INTEGER,
             ),
+            openapi.Parameter(
+                "cursor",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="next_cursor of the previous page, replaces page",
+            ),
         ],
         responses={
             200: openapi.Response("Get gallery", gallery_list_response_schema),
@@ -95,29 +109,41 @@ class ApiGetCreateGalleryView(APIView, ApiBaseView, TenItemsPagination):
         tags=["Gallery"],
     )
     def get(self, request: Request, game_uuid: UUID) -> Response:
+        page, page_size = self.get_page_params(request)
         gallery_interactor = GalleryContainer.gallery_interactor()
         try:
-            gallery = gallery_interactor.get_gallery(game_uuid=game_uuid)
+            gallery_page = gallery_interactor.get_gallery(
+                game_uuid=game_uuid,
+                page=page,
+                page_size=page_size,
+                cursor=request.query_params.get("cursor"),
+            )
         except GameInfoDoesNotExist as exception:
             return self._create_response_not_found(exception)
-
-        gallery = self.paginate_queryset(gallery, request, self)
+        except InvalidGalleryPage:
+            raise NotFound(self.invalid_page_message)
+        except InvalidGalleryCursor as exception:
+            raise NotFound(exception.message)
 
         gallery_serialized_data = [
-            gallery_item.model_dump() for gallery_item in gallery
+            gallery_item.model_dump() for gallery_item in gallery_page.items
         ]
         return self._create_response_for_successful_get_gallery(
-            gallery_serialized_data=gallery_serialized_data
+            gallery_serialized_data=gallery_serialized_data,
+            count=gallery_page.count,
+            next_cursor=gallery_page.next_cursor,
         )
 
     @staticmethod
     def _create_response_for_successful_get_gallery(
-        gallery_serialized_data,
+        gallery_serialized_data, count: int, next_cursor: str | None
     ) -> Response:
         return Response(
             {
                 "status": "success",
                 "message": "Successful get gallery items",
+                "count": count,
+                "next_cursor": next_cursor,
                 "data": gallery_serialized_data,
             },
             status=status.HTTP_200_OK,
@@ -197,7 +223,7 @@ class ApiLikeGalleryView(APIView, ApiBaseView):
         },
         tags=["Gallery"],
     )
-    @uuid_required
+    @uuid_required(materialize=True)
     def get(self, request: Request, gallery_uuid: UUID) -> Response:
         gallery_interactor = GalleryContainer.gallery_interactor()
         player_uuid = request.COOKIES.get("PLAYER_UUID")
@@ -13,7 +13,9 @@ from game_session.exceptions import (
     GameSessionDoesNotExist,
     GameSessionFull,
     GameSessionNotEnough,
+    GameSessionTeamsImpossible,
 )
+from players.exceptions import PlayerDoesNotExist, WrongUUID
 
 
 class ApiCreateGameSessionView(APIView, ApiBaseView):
@@ -57,7 +59,7 @@ class ApiCreateGameSessionView(APIView, ApiBaseView):
         request_body=CreateGameSessionDTOSerializer,
         tags=["Game session"],
     )
-    @uuid_required
+    @uuid_required(materialize=True)
     def post(self, request: Request) -> Response:
         creator_uuid = request.COOKIES.get("PLAYER_UUID")
         game_session_serializer = CreateGameSessionDTOSerializer(data=request.data)
@@ -117,7 +119,7 @@ class ApiFillDeleteGameSessionView(APIView, ApiBaseView):
         """,
         tags=["Game session"],
     )
-    @uuid_required
+    @uuid_required(materialize=True)
     def put(self, request: Request, session_identificator: str) -> Response:
         player_uuid = request.COOKIES.get("PLAYER_UUID")
         game_session_interactor = GameSessionContainer.game_session_interactor()
@@ -125,9 +127,9 @@ class ApiFillDeleteGameSessionView(APIView, ApiBaseView):
             game_session_interactor.add_player_in_game_session_by_uuid(
                 player_uuid=player_uuid, session_identificator=session_identificator
             )
-        except GameSessionDoesNotExist as exception:
+        except (GameSessionDoesNotExist, PlayerDoesNotExist) as exception:
             return self._create_response_not_found(exception)
-        except GameSessionFull as exception:
+        except (GameSessionFull, WrongUUID) as exception:
             return self._create_response_for_exception(exception)
         return Response(
             {
@@ -137,6 +139,44 @@ class ApiFillDeleteGameSessionView(APIView, ApiBaseView):
             status=status.HTTP_200_OK,
         )
 
+    @swagger_auto_schema(
+        operation_description="""
+        The operation with the removing player from the game session lobby
+
+        Parameters:
+        - `session_identificator` (str): identificator of the game session
+
+        Returns:
+           - 200: Returns success.
+           - 404: GameSession doesn't exist.
+
+        Example of successful processing:
+
+        {
+            "status": "success",
+            "message": "Player successfully removed from game session"
+        }
+        """,
+        tags=["Game session"],
+    )
+    @uuid_required
+    def delete(self, request: Request, session_identificator: str) -> Response:
+        player_uuid = request.COOKIES.get("PLAYER_UUID")
+        game_session_interactor = GameSessionContainer.game_session_interactor()
+        try:
+            game_session_interactor.remove_player_from_game_session_by_uuid(
+                player_uuid=player_uuid, session_identificator=session_identificator
+            )
+        except GameSessionDoesNotExist as exception:
+            return self._create_response_not_found(exception)
+        return Response(
+            {
+                "status": "success",
+                "message": "Player successfully removed from game session",
+            },
+            status=status.HTTP_200_OK,
+        )
+
     @swagger_auto_schema(
         operation_description="""
         The operation with the retrieving lobby of the game session
@@ -189,7 +229,7 @@ class ApiFillDeleteGameSessionView(APIView, ApiBaseView):
             )
         except GameSessionDoesNotExist as exception:
             return self._create_response_not_found(exception)
-        except GameSessionNotEnough as exception:
+        except (GameSessionNotEnough, GameSessionTeamsImpossible) as exception:
             return self._create_response_for_exception(exception)
         return self._create_response_for_successful_get_game_session(
             game_session.model_dump()
@@ -205,3 +245,58 @@ class ApiFillDeleteGameSessionView(APIView, ApiBaseView):
             },
             status=status.HTTP_200_OK,
         )
+
+
+class ApiGameSessionLobbyView(APIView, ApiBaseView):
+    @swagger_auto_schema(
+        operation_description="""
+        The operation with the reading lobby of the game session while it fills up,
+        the session stays active (unlike GET on the session itself)
+
+        Parameters:
+        - `session_identificator` (str): identificator of the game session
+
+        Returns:
+           - 200: Returns game session data with the flat lobby.
+           - 404: GameSession doesn't exist.
+
+        Example of successful processing:
+
+        {
+            "status": "success",
+            "message": "Successful get game session lobby",
+            "data": {
+                "session_identificator": "NR3RSI",
+                "team_min": 1,
+                "team_max": 2,
+                "team_players_min": 1,
+                "team_players_max": 2,
+                "lobby": [
+                    {
+                      "3df11585-9ca2-4b5d-a1c5-5c5bf4f062fd": "567676"
+                    },
+                    {
+                      "b4991810-3ed4-4730-924d-5dbe77a1243f": "Player"
+                    }
+                ]
+            }
+        }
+        """,
+        tags=["Game session"],
+    )
+    def get(self, request: Request, session_identificator: str):
+        game_session_interactor = GameSessionContainer.game_session_interactor()
+        try:
+            game_session = game_session_interactor.get_lobby(
+                session_identificator=session_identificator
+            )
+        except GameSessionDoesNotExist as exception:
+            return self._create_response_not_found(exception)
+        return Response(
+            {
+                "status": "success",
+                "message": "Successful get game session lobby",
+                "data": game_session.model_dump(),
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -0,0 +1,192 @@
+"""Lobby subscriptions, SSE and WebSocket on /api/v1/game_session/<id>/events.
+
+Django 4.1 can't stream a response from async code, so the path is served by this
+ASGI app in front of Django (see core/asgi.py), every other request goes to Django.
+The endpoint exists only under ASGI (ASYNC_READ_VIEWS=True, see gunicorn.py): with
+the WSGI workers the path is a plain 404. Several workers need
+LOBBY_EVENTS_BACKEND="redis", otherwise a subscriber only hears the joins that
+happened to hit its own worker.
+The first event is the current lobby, then join/leave events follow as they happen,
+and the stream ends after the final teams are sent.
+"""
+
+import asyncio
+import json
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import request_finished
+
+from core.containers import ProjectContainer
+from game_session.events import TEAMS_FORMED, get_lobby_broker, get_lobby_fanout
+from game_session.exceptions import GameSessionDoesNotExist
+
+EVENTS_PATH = re.compile(r"^/api/v1/game_session/(?P<identificator>[^/]+)/events/?$")
+SNAPSHOT = "lobby"
+SSE_HEADERS = [
+    (b"content-type", b"text/event-stream"),
+    (b"cache-control", b"no-cache"),
+    # nginx не повинен буферизувати потік
+    (b"x-accel-buffering", b"no"),
+]
+WEBSOCKET_NOT_FOUND = 4404
+
+
+class LobbySubscription:
+    """Subscribes before the lobby snapshot is read, so no join falls in between"""
+
+    def __init__(self, identificator: str):
+        self.identificator = identificator
+        self.broker = get_lobby_broker()
+        self.queue = None
+        self.snapshot = None
+
+    async def __aenter__(self):
+        fanout = get_lobby_fanout()
+        if fanout is not None:
+            fanout.ensure_listening()
+        self.queue = self.broker.subscribe(self.identificator)
+        try:
+            self.snapshot = await self._load_snapshot()
+        except BaseException:
+            self.broker.unsubscribe(self.identificator, self.queue)
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.broker.unsubscribe(self.identificator, self.queue)
+
+    async def events(self):
+        """Snapshot, then events; None every LOBBY_EVENTS_KEEPALIVE seconds of silence"""
+        yield self.snapshot
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    self.queue.get(), settings.LOBBY_EVENTS_KEEPALIVE
+                )
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            yield event
+            if event["event"] == TEAMS_FORMED:
+                return
+
+    async def _load_snapshot(self) -> dict:
+        game_session_interactor = ProjectContainer.game_session_interactor()
+        try:
+            game_session = await game_session_interactor.aget_lobby(
+                session_identificator=self.identificator
+            )
+        finally:
+            # потік живе довго, тож з'єднання з БД повертаємо одразу, як наприкінці
+            # звичайного запиту
+            await sync_to_async(request_finished.send)(sender=self.__class__)
+        return {"event": SNAPSHOT, **game_session.model_dump()}
+
+
+class LobbyEventsRouter:
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        match = None
+        if scope["type"] in ("http", "websocket"):
+            match = EVENTS_PATH.match(scope["path"])
+        if match is None:
+            return await self.application(scope, receive, send)
+        identificator = match["identificator"]
+        if scope["type"] == "websocket":
+            return await self._websocket(identificator, receive, send)
+        if scope["method"] != "GET":
+            return await self._json_response(
+                send, 405, {"status": "failed", "message": "Method not allowed"}
+            )
+        return await self._sse(identificator, receive, send)
+
+    async def _sse(self, identificator: str, receive, send):
+        try:
+            async with LobbySubscription(identificator) as subscription:
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": 200,
+                        "headers": SSE_HEADERS,
+                    }
+                )
+                await _until_disconnect(
+                    receive,
+                    self._stream_sse(subscription, send),
+                    disconnect_type="http.disconnect",
+                )
+        except GameSessionDoesNotExist as exception:
+            await self._json_response(
+                send, 404, {"status": "failed", "message": str(exception.message)}
+            )
+
+    @staticmethod
+    async def _stream_sse(subscription: LobbySubscription, send):
+        async for event in subscription.events():
+            if event is None:
+                body = b": ping\n\n"
+            else:
+                body = f"event: {event['event']}\ndata: {_dumps(event)}\n\n".encode()
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def _websocket(self, identificator: str, receive, send):
+        if (await receive())["type"] != "websocket.connect":
+            return
+        try:
+            async with LobbySubscription(identificator) as subscription:
+                await send({"type": "websocket.accept"})
+                await _until_disconnect(
+                    receive,
+                    self._stream_websocket(subscription, send),
+                    disconnect_type="websocket.disconnect",
+                )
+        except GameSessionDoesNotExist:
+            await send({"type": "websocket.close", "code": WEBSOCKET_NOT_FOUND})
+
+    @staticmethod
+    async def _stream_websocket(subscription: LobbySubscription, send):
+        async for event in subscription.events():
+            # для WebSocket пінги шле сервер (uvicorn ws_ping_interval)
+            if event is not None:
+                await send({"type": "websocket.send", "text": _dumps(event)})
+        await send({"type": "websocket.close", "code": 1000})
+
+    @staticmethod
+    async def _json_response(send, status: int, data: dict):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": _dumps(data).encode()})
+
+
+async def _until_disconnect(receive, stream, disconnect_type: str):
+    """Runs the stream until it ends or the client goes away"""
+
+    async def wait_for_disconnect():
+        while (await receive())["type"] != disconnect_type:
+            pass
+
+    stream_task = asyncio.ensure_future(stream)
+    disconnect_task = asyncio.ensure_future(wait_for_disconnect())
+    done, pending = await asyncio.wait(
+        {stream_task, disconnect_task}, return_when=asyncio.FIRST_COMPLETED
+    )
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    for task in done:
+        task.result()
+
+
+def _dumps(data: dict) -> str:
+    return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
@@ -2,6 +2,7 @@ from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from pydantic import ValidationError as PydanticValidationError
 from rest_framework import parsers, status
+from rest_framework.permissions import IsAdminUser
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -12,8 +13,10 @@ from api.v1.schemas.players import player_response_schema
 from api.v1.serializers.players import UpdatePlayerDTOSerializer
 from api.v1.views.base import ApiBaseView
 from core.containers import ProjectContainer as PlayerContainer
+from players.cache import player_cache
 from players.dto import PlayerDTO
 from players.exceptions import PlayerDoesNotExist, WrongUUID
+from players.identity import deferred_player
 
 
 class ApiPlayerView(APIView, ApiBaseView):
@@ -39,7 +42,9 @@ class ApiPlayerView(APIView, ApiBaseView):
         try:
             player = player_interactor.get_player_by_uuid(player_uuid=player_uuid)
         except PlayerDoesNotExist as exception:
-            return self._create_response_not_found(exception)
+            if not request.player_deferred:
+                return self._create_response_not_found(exception)
+            player = deferred_player(player_uuid)
         except WrongUUID as exception:
             return self._create_response_for_exception(exception)
         response = Response(
@@ -62,7 +67,7 @@ class ApiPlayerView(APIView, ApiBaseView):
         },
         tags=["Players"],
     )
-    @uuid_required
+    @uuid_required(materialize=True)
     def put(self, request: Request):
         player_uuid = request.COOKIES.get("PLAYER_UUID")
         player_serializer = UpdatePlayerDTOSerializer(data=request.data)
@@ -91,3 +96,23 @@ class ApiPlayerView(APIView, ApiBaseView):
             status=status.HTTP_200_OK,
         )
         return response
+
+
+class ApiPlayerCacheStatsView(APIView):
+    """Player cache counters of the worker that serves the request"""
+
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description="Get player cache hit/miss counters",
+        tags=["Players"],
+    )
+    def get(self, request: Request):
+        return Response(
+            {
+                "status": "success",
+                "message": "Successful player cache statistics retrieve",
+                "data": player_cache.stats(),
+            },
+            status=status.HTTP_200_OK,
+        )
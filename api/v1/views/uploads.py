@@ -0,0 +1,57 @@
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from additional_service.exceptions import DirectUploadUnsupported
+from api.v1.decorators.uuid_required import uuid_required
+from api.v1.schemas.base_schema import error_response
+from api.v1.schemas.uploads import direct_upload_response_schema
+from api.v1.serializers.uploads import DirectUploadSerializer
+from api.v1.views.base import ApiBaseView
+from core.containers import AdditionalServiceContainer
+
+
+class ApiDirectUploadView(APIView, ApiBaseView):
+    @swagger_auto_schema(
+        operation_description="""
+        Request a direct upload of a photo to the object storage
+
+        The client hashes the file, sends the request from `upload` with the file
+        as the body, then creates the record with `photo` instead of `photo_jpeg`.
+        `upload` is null when a file with this hash is already stored.
+        The file is accepted on create only if it is an image of at most
+        UPLOAD_MAX_SIZE bytes (10 MB by default).
+        """,
+        request_body=DirectUploadSerializer,
+        responses={
+            201: openapi.Response("Direct upload", direct_upload_response_schema),
+            400: error_response,
+        },
+        tags=["Uploads"],
+    )
+    # як і форма галереї, куди потрапляє це фото: запит з ідентичністю гравця
+    @uuid_required
+    def post(self, request: Request):
+        upload_serializer = DirectUploadSerializer(data=request.data)
+        if not upload_serializer.is_valid():
+            return self._create_response_for_invalid_serializers(upload_serializer)
+
+        additional_service = AdditionalServiceContainer.additional_service()
+        try:
+            direct_upload = additional_service.create_direct_upload(
+                **upload_serializer.validated_data
+            )
+        except DirectUploadUnsupported as exception:
+            return self._create_response_for_exception(exception)
+
+        return Response(
+            {
+                "status": "success",
+                "message": "Successful create direct upload",
+                "data": direct_upload,
+            },
+            status=status.HTTP_201_CREATED,
+        )
@@ -0,0 +1,70 @@
+import hashlib
+import json
+import time
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from additional_service.shared_cache import is_shared_cache
+
+CATALOG_VERSION_KEY = "catalog:version"
+
+
+def catalog_cache_enabled() -> bool:
+    """Catalog lists are cached only in a cache all workers share"""
+    return is_shared_cache(settings.CATALOG_CACHE_ALIAS)
+
+
+class CatalogCache:
+    """Versioned read-through storage for serialized catalog lists"""
+
+    def __init__(self, alias: str | None = None, timeout: int | None = None):
+        self.alias = alias or settings.CATALOG_CACHE_ALIAS
+        self.timeout = (
+            timeout if timeout is not None else settings.CATALOG_CACHE_TIMEOUT
+        )
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def get_version(self) -> int:
+        version = self.backend.get(CATALOG_VERSION_KEY)
+        if version is None:
+            # Починаємо з мітки часу, щоб не натрапити на записи старого лічильника
+            version = int(time.time() * 1000)
+            if not self.backend.add(CATALOG_VERSION_KEY, version, timeout=None):
+                version = self.backend.get(CATALOG_VERSION_KEY, version)
+        return version
+
+    def bump_version(self) -> None:
+        """New version once the current transaction commits, at once without one
+
+        A bump before the commit would let a concurrent reader fill the new
+        version with the old rows until CATALOG_CACHE_TIMEOUT.
+        """
+        transaction.on_commit(self._bump_version)
+
+    def _bump_version(self) -> None:
+        try:
+            self.backend.incr(CATALOG_VERSION_KEY)
+        except ValueError:
+            # Лічильник ще не створений або витіснений - нова версія з мітки часу
+            self.get_version()
+
+    def get_or_set(self, name: str, producer: Callable[[], list], **params) -> list:
+        key = self._make_key(name, params)
+        value = self.backend.get(key)
+        if value is None:
+            value = producer()
+            self.backend.set(key, value, self.timeout)
+        return value
+
+    def _make_key(self, name: str, params: dict) -> str:
+        key = f"catalog:{self.get_version()}:{name}"
+        if params:
+            raw_params = json.dumps(params, sort_keys=True, default=str)
+            key += ":" + hashlib.md5(raw_params.encode()).hexdigest()
+        return key
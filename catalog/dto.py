@@ -8,6 +8,7 @@ class CreateGameInfoDTO(BaseModel):
     name_ua: str
     name_en: str
     photo: str = ""
+    photo_variants: dict[str, dict[str, str]] = {}
     description_ua: str
     description_en: str
     is_team: bool = False
@@ -29,6 +30,7 @@ class UpdateGameInfoDTORequest(GameInfoDTOResponse):
     members: Optional[int] = None
     like__number: Optional[int] = None
     photo: Optional[str] = None
+    photo_variants: Optional[dict[str, dict[str, str]]] = None
     is_active: Optional[bool] = None
     is_team: Optional[bool] = None
 
@@ -39,6 +41,27 @@ class FilterSortGameInfoDTORequest(UpdateGameInfoDTORequest):
     uuid: Optional[UUID] = None
 
 
+class CatalogPageRequestDTO(BaseModel):
+    """No page, page_size or cursor - the whole list, as before"""
+
+    page: Optional[int] = None
+    page_size: Optional[int] = None
+    cursor: Optional[str] = None
+    fields: Optional[list[str]] = None
+
+    @property
+    def is_paginated(self) -> bool:
+        return any(
+            value is not None for value in (self.page, self.page_size, self.cursor)
+        )
+
+
+class CatalogPageDTO(BaseModel):
+    items: list[dict]
+    count: int
+    next_cursor: Optional[str] = None
+
+
 class StatisticsOnTheSiteDTOResponse(BaseModel):
     number_of_games: int
     played: int | None = None
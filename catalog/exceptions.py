@@ -9,3 +9,13 @@ class GameInfoDoesNotExist(ValidationError):
 class NameGameAlreadyExists(ValidationError):
     def __init__(self):
         super().__init__("A game with the same name already exists")
+
+
+class InvalidCatalogPage(ValidationError):
+    def __init__(self):
+        super().__init__("Invalid page.")
+
+
+class InvalidCatalogCursor(ValidationError):
+    def __init__(self):
+        super().__init__("Invalid cursor")
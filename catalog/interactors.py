@@ -1,8 +1,13 @@
-from typing import List
+from typing import Iterator, List
 from uuid import UUID
 
+from django.conf import settings
+from django.db import transaction
+
 from additional_service.services_interfaces import AdditionalServiceInterface
 from catalog.dto import (
+    CatalogPageDTO,
+    CatalogPageRequestDTO,
     CreateGameInfoDTO,
     FilterSortGameInfoDTORequest,
     GameInfoDTOResponse,
@@ -27,50 +32,137 @@ class GameInfoInteractor:
         self, game_info_dto: CreateGameInfoDTO, bytesio_file
     ) -> GameInfoDTOResponse:
         """Create new game_info"""
-        if bytesio_file:
-            image_path = self.additional_service.upload_file_to_s3(
-                group_name="game_info",
-                object_name=game_info_dto.name_en,
-                bytesio_file=bytesio_file,
+        # посилання на файл відкочується разом із записом, а сам файл без
+        # посилань прибере sweep_orphans
+        with transaction.atomic():
+            if bytesio_file:
+                image_path = self.additional_service.upload_file_to_s3(
+                    group_name="game_info",
+                    object_name=game_info_dto.name_en,
+                    bytesio_file=bytesio_file,
+                )
+                game_info_dto.photo = image_path
+            elif game_info_dto.photo:
+                # файл клієнт уже завантажив у сховище напряму
+                game_info_dto.photo = self.additional_service.attach_uploaded_file(
+                    photo_url=game_info_dto.photo
+                )
+
+            game_info = self.game_info_service.create_game_info(game_info_dto)
+        if game_info.photo:
+            self.additional_service.process_image(photo_url=game_info.photo)
+        return game_info
+
+    def bulk_create_game_info(
+        self, games: list[CreateGameInfoDTO], attach_photos: bool = True
+    ) -> int:
+        """Imports the games batch by batch in one transaction, all or nothing
+
+        `attach_photos=False` is for photos the caller has just uploaded itself.
+        """
+        batch_size = settings.BULK_IMPORT_BATCH_SIZE
+        with transaction.atomic():
+            if attach_photos:
+                for game in games:
+                    if game.photo:
+                        game.photo = self.additional_service.attach_uploaded_file(
+                            # адмін переносить і старі записи з посиланнями поза сховищем
+                            photo_url=game.photo,
+                            allow_external=True,
+                        )
+            created = sum(
+                self.game_info_service.bulk_create_game_info(
+                    games[start : start + batch_size]
+                )
+                for start in range(0, len(games), batch_size)
             )
-            game_info_dto.photo = image_path
+        for photo in {game.photo for game in games if not game.photo_variants}:
+            self.additional_service.process_image(photo_url=photo)
+        return created
 
-        return self.game_info_service.create_game_info(game_info_dto)
+    def export_game_info(self) -> Iterator[dict]:
+        return self.game_info_service.export_game_info()
 
     def get_game_info_by_uuid(self, uuid: UUID) -> GameInfoDTOResponse:
         return self.game_info_service.get_game_info_by_uuid(uuid)
 
+    async def aget_game_info_by_uuid(self, uuid: UUID) -> GameInfoDTOResponse:
+        return await self.game_info_service.aget_game_info_by_uuid(uuid)
+
     def update_game_info_by_uuid(
         self, game_info_to_update: UpdateGameInfoDTORequest, bytesio_file
     ) -> GameInfoDTOResponse:
-        if bytesio_file:
-            image_path = self.additional_service.upload_file_to_s3(
-                group_name="game_info",
-                object_name=game_info_to_update.name_en
-                or game_info_to_update.uuid.__str__(),
-                bytesio_file=bytesio_file,
+        old_photo = None
+        if bytesio_file or game_info_to_update.photo:
+            old_photo = self.game_info_service.get_game_info_by_uuid(
+                game_info_to_update.uuid
+            ).photo
+        photo_replaced = bool(bytesio_file) or game_info_to_update.photo not in (
+            None,
+            old_photo,
+        )
+        with transaction.atomic():
+            if bytesio_file:
+                image_path = self.additional_service.upload_file_to_s3(
+                    group_name="game_info",
+                    object_name=game_info_to_update.name_en
+                    or game_info_to_update.uuid.__str__(),
+                    bytesio_file=bytesio_file,
+                )
+                game_info_to_update.photo = image_path
+            elif photo_replaced:
+                game_info_to_update.photo = (
+                    self.additional_service.attach_uploaded_file(
+                        photo_url=game_info_to_update.photo
+                    )
+                )
+            game_info = self.game_info_service.update_game_info_by_uuid(
+                game_info_to_update
             )
-            game_info_to_update.photo = image_path
-        return self.game_info_service.update_game_info_by_uuid(game_info_to_update)
+            if photo_replaced and old_photo:
+                # старе фото більше не потрібне цьому запису
+                self.additional_service.delete_file_from_s3(photo_url=old_photo)
+        if photo_replaced:
+            self.additional_service.process_image(photo_url=game_info.photo)
+        return game_info
 
     def delete_game_info_by_uuid(self, uuid: UUID) -> dict:
         result_of_delete_operation = self.game_info_service.delete_game_info_by_uuid(
             uuid
         )
-        list_photo_url = result_of_delete_operation.get("photo_list", None)
-        for photo_url in list_photo_url:
-            self.additional_service.delete_file_from_s3(photo_url=photo_url)
+        self.additional_service.delete_files_from_s3(
+            photo_urls=result_of_delete_operation.get("photo_list", [])
+        )
 
         return result_of_delete_operation
 
     def get_all_game_info(self) -> List[GameInfoDTOResponse]:
         return self.game_info_service.get_all_game_info()
 
+    def get_all_game_info_page(
+        self, page_request: CatalogPageRequestDTO
+    ) -> CatalogPageDTO:
+        return self.game_info_service.get_all_game_info_page(page_request)
+
+    async def aget_all_game_info_page(
+        self, page_request: CatalogPageRequestDTO
+    ) -> CatalogPageDTO:
+        return await self.game_info_service.aget_all_game_info_page(page_request)
+
     def catalog_filter_sort(
         self, game_info_filter_sort_dto: FilterSortGameInfoDTORequest
     ) -> list[GameInfoDTOResponse]:
         return self.game_info_service.catalog_filter_sort(game_info_filter_sort_dto)
 
+    def catalog_filter_sort_page(
+        self,
+        game_info_filter_sort_dto: FilterSortGameInfoDTORequest,
+        page_request: CatalogPageRequestDTO,
+    ) -> CatalogPageDTO:
+        return self.game_info_service.catalog_filter_sort_page(
+            game_info_filter_sort_dto, page_request
+        )
+
     def set_like_game_info_by_uuid(
         self, game_info_uuid: UUID, player_uuid: UUID
     ) -> GameInfoDTOResponse:
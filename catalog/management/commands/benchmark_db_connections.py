@@ -0,0 +1,80 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+from django.test import Client
+
+from catalog.cache import CatalogCache
+from catalog.models import GameInfo
+from core.db.postgresql_pool.base import DatabaseWrapper as PooledDatabaseWrapper
+from core.db.postgresql_pool.pool import pool_metrics
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares per-request connect, persistent connections and the pool "
+        "on the catalog endpoints"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        modes = {
+            "connect": {"CONN_MAX_AGE": 0, "POOL_SIZE": 0},
+            "persistent": {"CONN_MAX_AGE": None, "POOL_SIZE": 0},
+        }
+        if isinstance(connection, PooledDatabaseWrapper):
+            modes["pooled"] = {
+                "CONN_MAX_AGE": 0,
+                "POOL_SIZE": connection.settings_dict["POOL_SIZE"] or 1,
+            }
+        else:
+            self.stdout.write(
+                "ENGINE без пулу (DB_POOL_SIZE=0), режим pooled пропущено"
+            )
+
+        paths = ["/api/v1/game_info/all/", "/api/v1/game_info/all/?page_size=10"]
+        game_info = GameInfo.objects.first()
+        if game_info:
+            paths.append(f"/api/v1/game_info/{game_info.uuid}/")
+
+        original_settings = dict(connection.settings_dict)
+        try:
+            for mode, overrides in modes.items():
+                connection.close()
+                connection.settings_dict.update(overrides)
+                timings = self._run(paths, options["requests"])
+                self.stdout.write(
+                    f"{mode:<10} requests={len(timings)} "
+                    f"avg={statistics.mean(timings) * 1000:.2f}ms "
+                    f"p95={self._p95(timings) * 1000:.2f}ms"
+                )
+        finally:
+            connection.close()
+            connection.settings_dict.update(original_settings)
+        for alias, metrics in pool_metrics().items():
+            self.stdout.write(f"pool {alias}: {metrics}")
+
+    @staticmethod
+    def _run(paths: list[str], requests: int) -> list[float]:
+        client = Client()
+        catalog_cache = CatalogCache()
+        timings = []
+        for _ in range(requests):
+            for path in paths:
+                # без кешу каталогу кожен запит іде в БД
+                catalog_cache.bump_version()
+                started = time.perf_counter()
+                client.get(path)
+                # межа запиту, як у gunicorn: закриває або повертає з'єднання
+                close_old_connections()
+                timings.append(time.perf_counter() - started)
+        return timings
+
+    @staticmethod
+    def _p95(timings: list[float]) -> float:
+        return sorted(timings)[int(len(timings) * 0.95) - 1]
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from additional_service.ndjson import write_ndjson
+from core.containers import ProjectContainer
+
+KINDS = {
+    "game_info": lambda: ProjectContainer.game_info_interactor().export_game_info(),
+    "developers": lambda: ProjectContainer.developer_interactor().export_developers(),
+}
+
+
+class Command(BaseCommand):
+    help = "Export games or developers as NDJSON, the format import_catalog reads"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", choices=KINDS, default="game_info")
+        parser.add_argument("--output", default="-", help="file, - for stdout")
+
+    def handle(self, *args, **options):
+        rows = write_ndjson(KINDS[options["kind"]]())
+        if options["output"] == "-":
+            for row in rows:
+                self.stdout.write(row.decode(), ending="")
+        else:
+            with open(options["output"], "wb") as file:
+                file.writelines(rows)
@@ -0,0 +1,48 @@
+import sys
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from additional_service.ndjson import read_ndjson
+from catalog.dto import CreateGameInfoDTO
+from core.containers import ProjectContainer
+from developers.dto import CreateDeveloperDTO
+
+KINDS = {
+    "game_info": (
+        CreateGameInfoDTO,
+        lambda items: ProjectContainer.game_info_interactor().bulk_create_game_info(
+            items
+        ),
+    ),
+    "developers": (
+        CreateDeveloperDTO,
+        lambda items: ProjectContainer.developer_interactor().bulk_create_developers(
+            items
+        ),
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Import games or developers from an NDJSON file (one object per line) "
+        "in one transaction"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON file, - for stdin")
+        parser.add_argument("--kind", choices=KINDS, default="game_info")
+
+    def handle(self, *args, **options):
+        dto_class, bulk_create = KINDS[options["kind"]]
+        try:
+            if options["path"] == "-":
+                items = read_ndjson(sys.stdin.buffer, dto_class)
+            else:
+                with open(options["path"], "rb") as file:
+                    items = read_ndjson(file, dto_class)
+            created = bulk_create(items)
+        except ValidationError as exception:
+            raise CommandError(exception.message)
+        self.stdout.write(f"Імпортовано ({options['kind']}): {created}")
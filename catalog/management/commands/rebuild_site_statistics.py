@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from catalog.site_statistics import site_statistics
+
+
+class Command(BaseCommand):
+    help = "Recount the site statistics row from the games and sessions tables"
+
+    def handle(self, *args, **options):
+        totals = site_statistics.rebuild()
+        self.stdout.write(
+            "Статистику перераховано: "
+            + ", ".join(f"{field}={value}" for field, value in totals.items())
+        )
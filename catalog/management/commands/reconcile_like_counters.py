@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from catalog.cache import CatalogCache
+from catalog.repositories import like_counter
+
+
+class Command(BaseCommand):
+    help = "Recount Like.number from the voters table and repair drifted counters"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        fixed = like_counter.reconcile(batch_size=options["batch_size"])
+        if fixed:
+            CatalogCache().bump_version()
+        self.stdout.write(f"Виправлено лічильників лайків: {fixed}")
@@ -1,9 +1,11 @@
 from uuid import uuid4
 
 from django.db import models
-from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from catalog.cache import CatalogCache
+from catalog.site_statistics import site_statistics
 from players.models import Player
 
 
@@ -25,6 +27,9 @@ class GameInfo(CoreModel):
     name_ua = models.TextField("Назва ua", max_length=50, unique=True)
     name_en = models.TextField("Назва en", max_length=50, unique=True)
     photo = models.CharField(max_length=255, verbose_name="Зображння")
+    photo_variants = models.JSONField(
+        default=dict, blank=True, verbose_name="Варіанти зображення"
+    )
     description_ua = models.TextField("Опис ua")
     description_en = models.TextField("Опис en")
     is_team = models.BooleanField("Командна", default=False)
@@ -53,14 +58,36 @@ class Like(CoreModel):
     def __str__(self):
         return f"id: {self.uuid} likes: {self.number}"
 
-    def update_number(self):
-        self.number = self.list_vote_user_id.count()
-        self.save()
+
+@receiver(post_save, sender=GameInfo)
+@receiver(post_delete, sender=GameInfo)
+@receiver(post_save, sender=Like)
+def invalidate_catalog_cache(sender, **kwargs):
+    # Зміни через адмінку чи репозиторій теж мають скидати кеш каталогу
+    CatalogCache().bump_version()
+
+
+class SiteStatistics(models.Model):
+    """Single row of site totals, see catalog.site_statistics"""
+
+    number_of_games = models.BigIntegerField(default=0, verbose_name="Кількість ігор")
+    played = models.BigIntegerField(default=0, verbose_name="Зіграно сесій")
+    number_of_teams = models.BigIntegerField(default=0, verbose_name="Кількість команд")
+
+    class Meta:
+        verbose_name = "Статистика сайту"
+        verbose_name_plural = "Статистика сайту"
+
+
+@receiver(post_save, sender=GameInfo)
+def count_created_game(sender, instance, created, **kwargs):
+    if created:
+        site_statistics.add(number_of_games=1)
 
 
-@receiver(m2m_changed, sender=Like.list_vote_user_id.through)
-def update_like_number(sender, instance, **kwargs):
-    instance.update_number()
+@receiver(post_delete, sender=GameInfo)
+def count_deleted_game(sender, **kwargs):
+    site_statistics.add(number_of_games=-1)
 
 
 class Picture(CoreModel):
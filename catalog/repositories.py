@@ -1,18 +1,45 @@
+from operator import itemgetter
+from typing import Iterator
 from uuid import UUID
 
 from annoying.functions import get_object_or_None
-from django.db import transaction
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from django.db.models import Q
 
+from additional_service.counters import AtomicVoteCounter
+from additional_service.dto_mapper import compile_mapper
+from additional_service.pagination import decode_cursor, encode_cursor, keyset_q
+from catalog.cache import CatalogCache
 from catalog.dto import (
+    CatalogPageDTO,
+    CatalogPageRequestDTO,
     CreateGameInfoDTO,
     FilterSortGameInfoDTORequest,
     GameInfoDTOResponse,
+    StatisticsOnTheSiteDTOResponse,
     UpdateGameInfoDTORequest,
 )
-from catalog.exceptions import GameInfoDoesNotExist, NameGameAlreadyExists
+from catalog.exceptions import (
+    GameInfoDoesNotExist,
+    InvalidCatalogCursor,
+    InvalidCatalogPage,
+    NameGameAlreadyExists,
+)
+from catalog.site_statistics import site_statistics
 from catalog.models import GameInfo, Like
 from catalog.repository_interfaces import AbstractGameInfoRepositoryInterface
+from core.db.threads import db_sync_to_async
+
+like_counter = AtomicVoteCounter(
+    Like,
+    "list_vote_user_id",
+    buffer_name="catalog.like",
+    # bulk-запис не викликає post_save у Like
+    on_flush=lambda: CatalogCache().bump_version(),
+)
+CATALOG_PAGE_SIZE = 10
 
 
 class GameInfoRepository(AbstractGameInfoRepositoryInterface):
@@ -34,10 +61,56 @@ class GameInfoRepository(AbstractGameInfoRepositoryInterface):
             dto_model=GameInfoDTOResponse, instance_model=game_info
         )
 
+    def bulk_create_game_info(self, games: list[CreateGameInfoDTO]) -> int:
+        """Checks the names of the whole batch, then one INSERT for games and one for likes"""
+        names_ua = {game.name_ua for game in games}
+        names_en = {game.name_en for game in games}
+        if len(names_ua) < len(games) or len(names_en) < len(games):
+            raise NameGameAlreadyExists()
+        if GameInfo.objects.filter(
+            Q(name_ua__in=names_ua) | Q(name_en__in=names_en)
+        ).exists():
+            raise NameGameAlreadyExists()
+
+        game_infos = [GameInfo(**game.model_dump()) for game in games]
+        try:
+            with transaction.atomic():
+                GameInfo.objects.bulk_create(game_infos)
+                Like.objects.bulk_create(
+                    [Like(gameinfo=game_info) for game_info in game_infos]
+                )
+                # bulk_create не надсилає post_save, лічильник сайту рухаємо самі
+                site_statistics.add(number_of_games=len(game_infos))
+        except IntegrityError:
+            # паралельний імпорт встиг вставити гру з тією ж назвою
+            raise NameGameAlreadyExists()
+        return len(game_infos)
+
+    def export_game_info(self) -> Iterator[dict]:
+        return (
+            GameInfo.objects.order_by("create_at", "uuid")
+            .values("uuid", *CreateGameInfoDTO.model_fields)
+            .iterator(chunk_size=settings.BULK_IMPORT_BATCH_SIZE)
+        )
+
     def get_game_info_by_uuid(self, uuid: UUID) -> GameInfoDTOResponse:
-        game_info = get_object_or_None(GameInfo, uuid=uuid)
+        game_info = get_object_or_None(
+            GameInfo.objects.select_related("like"), uuid=uuid
+        )
         if not game_info:
             raise GameInfoDoesNotExist()
+        return self._instance_model_to_dto_model(
+            dto_model=GameInfoDTOResponse,
+            instance_model=self._with_pending_likes(game_info),
+        )
+
+    async def aget_game_info_by_uuid(self, uuid: UUID) -> GameInfoDTOResponse:
+        game_info = (
+            await GameInfo.objects.select_related("like").filter(uuid=uuid).afirst()
+        )
+        if not game_info:
+            raise GameInfoDoesNotExist()
+        game_info = await db_sync_to_async(self._with_pending_likes)(game_info)
         return self._instance_model_to_dto_model(
             dto_model=GameInfoDTOResponse, instance_model=game_info
         )
@@ -51,63 +124,85 @@ class GameInfoRepository(AbstractGameInfoRepositoryInterface):
         filtered_param_without_none = {
             k: v for k, v in game_info_to_update.model_dump().items() if v is not None
         }
+        if "photo" in filtered_param_without_none:
+            # варіанти нового фото ще не побудовані
+            filtered_param_without_none["photo_variants"] = {}
         game_info.update(**filtered_param_without_none)
-        game_info = game_info.get()
+        game_info = game_info.select_related("like").get()
         return self._instance_model_to_dto_model(
-            dto_model=GameInfoDTOResponse, instance_model=game_info
+            dto_model=GameInfoDTOResponse,
+            instance_model=self._with_pending_likes(game_info),
         )
 
     def delete_game_info_by_uuid(self, uuid: UUID) -> dict:
         game_info_objs = GameInfo.objects.filter(uuid=uuid)
         if not game_info_objs:
             raise GameInfoDoesNotExist()
-        photo_list = list(game_info_objs.values_list("photo", flat=True).distinct())
-        # # Отримати значення поля param_2 зі зв'язаної моделі MyModel2
-        # parametr_2_values = MyModel.objects.filter(parametr_1=1).\
-        # values_list("parametr_2__param_2", flat=True)
+        # кожен рядок тримає своє посилання на файл, тож без distinct; фото галереї
+        # видаляються каскадом разом із грою
+        photo_list = list(game_info_objs.values_list("photo", flat=True))
+        photo_list += game_info_objs.filter(gallery__isnull=False).values_list(
+            "gallery__photo", flat=True
+        )
 
         _, result_of_delete_operation = game_info_objs.delete()
         result_of_delete_operation["photo_list"] = photo_list
         return result_of_delete_operation
 
     def get_all_game_info(self) -> list[GameInfoDTOResponse]:
-        game_info = GameInfo.objects.all().order_by("-like__number")
-        return [
-            self._instance_model_to_dto_model(
-                dto_model=GameInfoDTOResponse, instance_model=game_info_obj
-            )
-            for game_info_obj in game_info
-        ]
+        return self._page_to_dto_list(
+            self.get_all_game_info_page(CatalogPageRequestDTO())
+        )
+
+    def get_all_game_info_page(
+        self, page_request: CatalogPageRequestDTO
+    ) -> CatalogPageDTO:
+        return self._game_info_page(
+            GameInfo.objects.all(), "-like__number", page_request
+        )
+
+    async def aget_all_game_info_page(
+        self, page_request: CatalogPageRequestDTO
+    ) -> CatalogPageDTO:
+        # count, сторінка і злиття буфера лайків - один перехід у потік БД
+        return await db_sync_to_async(self.get_all_game_info_page)(page_request)
 
     def catalog_filter_sort(
         self, game_info_filter_sort_dto: FilterSortGameInfoDTORequest
     ) -> list[GameInfoDTOResponse]:
+        return self._page_to_dto_list(
+            self.catalog_filter_sort_page(
+                game_info_filter_sort_dto, CatalogPageRequestDTO()
+            )
+        )
+
+    def catalog_filter_sort_page(
+        self,
+        game_info_filter_sort_dto: FilterSortGameInfoDTORequest,
+        page_request: CatalogPageRequestDTO,
+    ) -> CatalogPageDTO:
         filtered_param_without_none = {
             k: v
             for k, v in game_info_filter_sort_dto.model_dump().items()
             if (v is not None) and (k != "sort_selection")
         }
-        GameInfo.objects.filter(members__gt=10)
-        game_info_list_filter = GameInfo.objects.filter(**filtered_param_without_none)
-        if game_info_filter_sort_dto.sort_selection:
-            game_info_list_filter = game_info_list_filter.order_by(
-                game_info_filter_sort_dto.sort_selection
-            )
-
-        return [
-            self._instance_model_to_dto_model(
-                dto_model=GameInfoDTOResponse, instance_model=game_info_obj
-            )
-            for game_info_obj in game_info_list_filter
-        ]
+        return self._game_info_page(
+            GameInfo.objects.filter(**filtered_param_without_none),
+            game_info_filter_sort_dto.sort_selection,
+            page_request,
+        )
 
     def set_like_game_info_by_uuid(
         self, game_info_uuid: UUID, player_uuid: UUID
     ) -> GameInfoDTOResponse:
-        game_info = get_object_or_None(GameInfo, uuid=game_info_uuid)
+        game_info = get_object_or_None(
+            GameInfo.objects.select_related("like"), uuid=game_info_uuid
+        )
         if not game_info:
             raise GameInfoDoesNotExist()
-        game_info.like.list_vote_user_id.add(player_uuid)
+        game_info.like.number = like_counter.add_vote(
+            game_info.like.pk, player_uuid, game_info.like.number
+        )
         return self._instance_model_to_dto_model(
             dto_model=GameInfoDTOResponse, instance_model=game_info
         )
@@ -115,32 +210,108 @@ class GameInfoRepository(AbstractGameInfoRepositoryInterface):
     def unset_like_game_info_by_uuid(
         self, game_info_uuid: UUID, player_uuid: UUID
     ) -> GameInfoDTOResponse:
-        game_info = get_object_or_None(GameInfo, uuid=game_info_uuid)
+        game_info = get_object_or_None(
+            GameInfo.objects.select_related("like"), uuid=game_info_uuid
+        )
         if not game_info:
             raise GameInfoDoesNotExist()
-        game_info.like.list_vote_user_id.remove(player_uuid)
+        game_info.like.number = like_counter.remove_vote(
+            game_info.like.pk, player_uuid, game_info.like.number
+        )
         return self._instance_model_to_dto_model(
             dto_model=GameInfoDTOResponse, instance_model=game_info
         )
 
-    def get_statistics_on_the_site(self) -> int:
-        return GameInfo.objects.all().count()
+    def get_statistics_on_the_site(self) -> StatisticsOnTheSiteDTOResponse:
+        return StatisticsOnTheSiteDTOResponse(**site_statistics.get())
+
+    @staticmethod
+    def _with_pending_likes(game_info: GameInfo) -> GameInfo:
+        like = getattr(game_info, "like", None)
+        if like is not None:
+            like.number += like_counter.pending_delta(like.pk)
+        return game_info
+
+    @classmethod
+    def _game_info_page(
+        cls, game_info, ordering: str | None, page_request: CatalogPageRequestDTO
+    ) -> CatalogPageDTO:
+        """One values() query with only the requested fields, LIMIT/OFFSET or keyset"""
+        # порядок створення розводить рівні значення, uuid робить його однозначним
+        sort_field = ordering.lstrip("-") if ordering else None
+        ordering = tuple(
+            field
+            for field in (ordering, "create_at", "uuid")
+            if field and field != sort_field
+        )
+        keyset_fields = [field.lstrip("-") for field in ordering]
+        fields = page_request.fields or list(GameInfoDTOResponse.model_fields)
+        rows = game_info.order_by(*ordering).values(
+            *dict.fromkeys([*fields, *keyset_fields])
+        )
+        if page_request.is_paginated:
+            page = cls._slice_page(game_info, rows, ordering, page_request)
+        else:
+            items = list(rows)
+            page = CatalogPageDTO(items=items, count=len(items))
+
+        if "like__number" in fields:
+            cls._merge_pending_likes(
+                page.items, ordering[0], resort=not page_request.is_paginated
+            )
+        extra_fields = set(keyset_fields) - set(fields)
+        if extra_fields:
+            page.items = [
+                {key: value for key, value in row.items() if key not in extra_fields}
+                for row in page.items
+            ]
+        return page
+
+    @staticmethod
+    def _slice_page(
+        game_info, rows, ordering: tuple, page_request: CatalogPageRequestDTO
+    ) -> CatalogPageDTO:
+        page_size = page_request.page_size or CATALOG_PAGE_SIZE
+        count = game_info.count()
+        if page_request.cursor:
+            try:
+                values = decode_cursor(page_request.cursor, size=len(ordering))
+                rows = rows.filter(keyset_q(ordering, values))
+            except (ValueError, TypeError, ValidationError):
+                raise InvalidCatalogCursor()
+        else:
+            offset = ((page_request.page or 1) - 1) * page_size
+            if offset and offset >= count:
+                raise InvalidCatalogPage()
+            rows = rows[offset:]
+        # зайвий рядок показує, чи є наступна сторінка
+        items = list(rows[: page_size + 1])
+        next_cursor = None
+        if len(items) > page_size:
+            items = items[:page_size]
+            keyset_fields = [field.lstrip("-") for field in ordering]
+            next_cursor = encode_cursor([items[-1][field] for field in keyset_fields])
+        return CatalogPageDTO(items=items, count=count, next_cursor=next_cursor)
+
+    @staticmethod
+    def _merge_pending_likes(rows: list[dict], ordering: str, resort: bool) -> None:
+        pending = like_counter.pending_deltas(key="gameinfo")
+        if not pending:
+            return
+        for row in rows:
+            row["like__number"] += pending.get(str(row["uuid"]), 0)
+        if resort and ordering.endswith("like__number"):
+            # БД сортувала без лайків з буфера
+            rows.sort(key=itemgetter("like__number"), reverse=ordering.startswith("-"))
+
+    @staticmethod
+    def _page_to_dto_list(page: CatalogPageDTO) -> list[GameInfoDTOResponse]:
+        construct = GameInfoDTOResponse.model_construct
+        return [
+            construct(**{key: value for key, value in row.items() if value is not None})
+            for row in page.items
+        ]
 
     @staticmethod
     def _instance_model_to_dto_model(dto_model, instance_model, *args, **kwargs):
-        dto_kwarg = {**kwargs}
-        for key in dto_model.schema().get("properties").keys():
-            parts = key.split("__")
-            value = None
-            if len(parts) == 1:
-                value = getattr(instance_model, key, None)
-            elif len(parts) == 2:
-                nested_attr = getattr(instance_model, parts[0], None)
-                value = getattr(nested_attr, parts[1], None)
-            elif len(parts) == 3:
-                nested_attr = getattr(instance_model, parts[0], None)
-                nested_attr = getattr(nested_attr, parts[1], None)
-                value = getattr(nested_attr, parts[2], None)
-            if value is not None:
-                dto_kwarg.update({key: value})
-        return dto_model(**dto_kwarg)
+        return compile_mapper(dto_model).map(instance_model, **kwargs)
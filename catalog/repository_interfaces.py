@@ -1,10 +1,14 @@
 from abc import ABCMeta, abstractmethod
+from typing import Iterator
 from uuid import UUID
 
 from catalog.dto import (
+    CatalogPageDTO,
+    CatalogPageRequestDTO,
     CreateGameInfoDTO,
     FilterSortGameInfoDTORequest,
     GameInfoDTOResponse,
+    StatisticsOnTheSiteDTOResponse,
     UpdateGameInfoDTORequest,
 )
 
@@ -14,10 +18,22 @@ class AbstractGameInfoRepositoryInterface(metaclass=ABCMeta):
     def create_game_info(self, game_info_dto: CreateGameInfoDTO) -> GameInfoDTOResponse:
         pass
 
+    @abstractmethod
+    def bulk_create_game_info(self, games: list[CreateGameInfoDTO]) -> int:
+        pass
+
+    @abstractmethod
+    def export_game_info(self) -> Iterator[dict]:
+        pass
+
     @abstractmethod
     def get_game_info_by_uuid(self, game_info_uuid: UUID) -> GameInfoDTOResponse:
         pass
 
+    @abstractmethod
+    async def aget_game_info_by_uuid(self, game_info_uuid: UUID) -> GameInfoDTOResponse:
+        pass
+
     @abstractmethod
     def update_game_info_by_uuid(
         self, game_info_to_update: UpdateGameInfoDTORequest
@@ -38,6 +54,26 @@ class AbstractGameInfoRepositoryInterface(metaclass=ABCMeta):
     ) -> list[GameInfoDTOResponse]:
         pass
 
+    @abstractmethod
+    def get_all_game_info_page(
+        self, page_request: CatalogPageRequestDTO
+    ) -> CatalogPageDTO:
+        pass
+
+    @abstractmethod
+    async def aget_all_game_info_page(
+        self, page_request: CatalogPageRequestDTO
+    ) -> CatalogPageDTO:
+        pass
+
+    @abstractmethod
+    def catalog_filter_sort_page(
+        self,
+        game_info_filter_sort_dto: FilterSortGameInfoDTORequest,
+        page_request: CatalogPageRequestDTO,
+    ) -> CatalogPageDTO:
+        pass
+
     @abstractmethod
     def set_like_game_info_by_uuid(
         self, game_info_uuid: UUID, player_uuid: UUID
@@ -51,5 +87,5 @@ class AbstractGameInfoRepositoryInterface(metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def get_statistics_on_the_site(self) -> int:
+    def get_statistics_on_the_site(self) -> StatisticsOnTheSiteDTOResponse:
         pass
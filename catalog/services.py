@@ -1,6 +1,10 @@
+from typing import Iterator
 from uuid import UUID
 
+from catalog.cache import CatalogCache
 from catalog.dto import (
+    CatalogPageDTO,
+    CatalogPageRequestDTO,
     CreateGameInfoDTO,
     FilterSortGameInfoDTORequest,
     GameInfoDTOResponse,
@@ -9,24 +13,31 @@ from catalog.dto import (
 )
 from catalog.repository_interfaces import AbstractGameInfoRepositoryInterface
 from catalog.services_interfaces import GameInfoServiceInterface
-from game_session.repository_interfaces import AbstractGameSessionRepositoryInterface
+from core.db.threads import db_sync_to_async
 
 
 class GameInfoService(GameInfoServiceInterface):
     def __init__(
         self,
         game_info_repository: AbstractGameInfoRepositoryInterface,
-        game_session_repository: AbstractGameSessionRepositoryInterface,
     ):
         self.game_info_repository = game_info_repository
-        self.game_session_repository = game_session_repository
 
     def create_game_info(self, game_info_dto: CreateGameInfoDTO) -> GameInfoDTOResponse:
         return self.game_info_repository.create_game_info(game_info_dto)
 
+    def bulk_create_game_info(self, games: list[CreateGameInfoDTO]) -> int:
+        return self.game_info_repository.bulk_create_game_info(games)
+
+    def export_game_info(self) -> Iterator[dict]:
+        return self.game_info_repository.export_game_info()
+
     def get_game_info_by_uuid(self, game_info_uuid: UUID) -> GameInfoDTOResponse:
         return self.game_info_repository.get_game_info_by_uuid(game_info_uuid)
 
+    async def aget_game_info_by_uuid(self, game_info_uuid: UUID) -> GameInfoDTOResponse:
+        return await self.game_info_repository.aget_game_info_by_uuid(game_info_uuid)
+
     def update_game_info_by_uuid(
         self, game_info_to_update: UpdateGameInfoDTORequest
     ) -> GameInfoDTOResponse:
@@ -38,11 +49,30 @@ class GameInfoService(GameInfoServiceInterface):
     def get_all_game_info(self) -> list[GameInfoDTOResponse]:
         return self.game_info_repository.get_all_game_info()
 
+    def get_all_game_info_page(
+        self, page_request: CatalogPageRequestDTO
+    ) -> CatalogPageDTO:
+        return self.game_info_repository.get_all_game_info_page(page_request)
+
+    async def aget_all_game_info_page(
+        self, page_request: CatalogPageRequestDTO
+    ) -> CatalogPageDTO:
+        return await self.game_info_repository.aget_all_game_info_page(page_request)
+
     def catalog_filter_sort(
         self, game_info_filter_sort_dto: FilterSortGameInfoDTORequest
     ) -> list[GameInfoDTOResponse]:
         return self.game_info_repository.catalog_filter_sort(game_info_filter_sort_dto)
 
+    def catalog_filter_sort_page(
+        self,
+        game_info_filter_sort_dto: FilterSortGameInfoDTORequest,
+        page_request: CatalogPageRequestDTO,
+    ) -> CatalogPageDTO:
+        return self.game_info_repository.catalog_filter_sort_page(
+            game_info_filter_sort_dto, page_request
+        )
+
     def set_like_game_info_by_uuid(
         self, game_info_uuid: UUID, player_uuid: UUID
     ) -> GameInfoDTOResponse:
@@ -58,6 +88,118 @@ class GameInfoService(GameInfoServiceInterface):
         )
 
     def get_statistics_on_the_site(self) -> StatisticsOnTheSiteDTOResponse:
-        result = self.game_session_repository.get_statistics_session()
-        result.number_of_games = self.game_info_repository.get_statistics_on_the_site()
+        return self.game_info_repository.get_statistics_on_the_site()
+
+
+class CachedGameInfoService(GameInfoServiceInterface):
+    """Read-through cache for catalog lists, invalidated by the catalog version"""
+
+    def __init__(
+        self,
+        game_info_service: GameInfoServiceInterface,
+        catalog_cache: CatalogCache,
+    ):
+        self.game_info_service = game_info_service
+        self.catalog_cache = catalog_cache
+
+    def create_game_info(self, game_info_dto: CreateGameInfoDTO) -> GameInfoDTOResponse:
+        result = self.game_info_service.create_game_info(game_info_dto)
+        self.catalog_cache.bump_version()
+        return result
+
+    def bulk_create_game_info(self, games: list[CreateGameInfoDTO]) -> int:
+        # bulk_create минає сигнал, що скидає кеш каталогу
+        result = self.game_info_service.bulk_create_game_info(games)
+        self.catalog_cache.bump_version()
+        return result
+
+    def export_game_info(self) -> Iterator[dict]:
+        return self.game_info_service.export_game_info()
+
+    def get_game_info_by_uuid(self, game_info_uuid: UUID) -> GameInfoDTOResponse:
+        return self.game_info_service.get_game_info_by_uuid(game_info_uuid)
+
+    async def aget_game_info_by_uuid(self, game_info_uuid: UUID) -> GameInfoDTOResponse:
+        return await self.game_info_service.aget_game_info_by_uuid(game_info_uuid)
+
+    def update_game_info_by_uuid(
+        self, game_info_to_update: UpdateGameInfoDTORequest
+    ) -> GameInfoDTOResponse:
+        result = self.game_info_service.update_game_info_by_uuid(game_info_to_update)
+        self.catalog_cache.bump_version()
+        return result
+
+    def delete_game_info_by_uuid(self, game_info_uuid: UUID) -> dict:
+        result = self.game_info_service.delete_game_info_by_uuid(game_info_uuid)
+        self.catalog_cache.bump_version()
         return result
+
+    def get_all_game_info(self) -> list[GameInfoDTOResponse]:
+        return [
+            GameInfoDTOResponse.model_construct(**game_info)
+            for game_info in self.get_all_game_info_page(CatalogPageRequestDTO()).items
+        ]
+
+    def get_all_game_info_page(
+        self, page_request: CatalogPageRequestDTO
+    ) -> CatalogPageDTO:
+        page = self.catalog_cache.get_or_set(
+            "all",
+            lambda: self.game_info_service.get_all_game_info_page(
+                page_request
+            ).model_dump(),
+            **page_request.model_dump(),
+        )
+        return CatalogPageDTO.model_construct(**page)
+
+    async def aget_all_game_info_page(
+        self, page_request: CatalogPageRequestDTO
+    ) -> CatalogPageDTO:
+        # кеш синхронний, промах іде в синхронний сервіс у тому ж потоці
+        return await db_sync_to_async(self.get_all_game_info_page)(page_request)
+
+    def catalog_filter_sort(
+        self, game_info_filter_sort_dto: FilterSortGameInfoDTORequest
+    ) -> list[GameInfoDTOResponse]:
+        return [
+            GameInfoDTOResponse.model_construct(**game_info)
+            for game_info in self.catalog_filter_sort_page(
+                game_info_filter_sort_dto, CatalogPageRequestDTO()
+            ).items
+        ]
+
+    def catalog_filter_sort_page(
+        self,
+        game_info_filter_sort_dto: FilterSortGameInfoDTORequest,
+        page_request: CatalogPageRequestDTO,
+    ) -> CatalogPageDTO:
+        page = self.catalog_cache.get_or_set(
+            "filter_sort",
+            lambda: self.game_info_service.catalog_filter_sort_page(
+                game_info_filter_sort_dto, page_request
+            ).model_dump(),
+            **game_info_filter_sort_dto.model_dump(),
+            **page_request.model_dump(),
+        )
+        return CatalogPageDTO.model_construct(**page)
+
+    def set_like_game_info_by_uuid(
+        self, game_info_uuid: UUID, player_uuid: UUID
+    ) -> GameInfoDTOResponse:
+        result = self.game_info_service.set_like_game_info_by_uuid(
+            game_info_uuid, player_uuid
+        )
+        self.catalog_cache.bump_version()
+        return result
+
+    def unset_like_game_info_by_uuid(
+        self, game_info_uuid: UUID, player_uuid: UUID
+    ) -> GameInfoDTOResponse:
+        result = self.game_info_service.unset_like_game_info_by_uuid(
+            game_info_uuid, player_uuid
+        )
+        self.catalog_cache.bump_version()
+        return result
+
+    def get_statistics_on_the_site(self) -> StatisticsOnTheSiteDTOResponse:
+        return self.game_info_service.get_statistics_on_the_site()
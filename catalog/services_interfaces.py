@@ -1,7 +1,10 @@
 from abc import ABCMeta, abstractmethod
+from typing import Iterator
 from uuid import UUID
 
 from catalog.dto import (
+    CatalogPageDTO,
+    CatalogPageRequestDTO,
     CreateGameInfoDTO,
     FilterSortGameInfoDTORequest,
     GameInfoDTOResponse,
@@ -15,10 +18,22 @@ class GameInfoServiceInterface(metaclass=ABCMeta):
     def create_game_info(self, game_info_dto: CreateGameInfoDTO) -> GameInfoDTOResponse:
         pass
 
+    @abstractmethod
+    def bulk_create_game_info(self, games: list[CreateGameInfoDTO]) -> int:
+        pass
+
+    @abstractmethod
+    def export_game_info(self) -> Iterator[dict]:
+        pass
+
     @abstractmethod
     def get_game_info_by_uuid(self, game_info_uuid: UUID) -> GameInfoDTOResponse:
         pass
 
+    @abstractmethod
+    async def aget_game_info_by_uuid(self, game_info_uuid: UUID) -> GameInfoDTOResponse:
+        pass
+
     @abstractmethod
     def update_game_info_by_uuid(
         self, game_info_to_update: UpdateGameInfoDTORequest
@@ -33,12 +48,32 @@ class GameInfoServiceInterface(metaclass=ABCMeta):
     def get_all_game_info(self) -> list[GameInfoDTOResponse]:
         pass
 
+    @abstractmethod
+    def get_all_game_info_page(
+        self, page_request: CatalogPageRequestDTO
+    ) -> CatalogPageDTO:
+        pass
+
+    @abstractmethod
+    async def aget_all_game_info_page(
+        self, page_request: CatalogPageRequestDTO
+    ) -> CatalogPageDTO:
+        pass
+
     @abstractmethod
     def catalog_filter_sort(
         self, game_info_filter_sort_dto: FilterSortGameInfoDTORequest
     ) -> list[GameInfoDTOResponse]:
         pass
 
+    @abstractmethod
+    def catalog_filter_sort_page(
+        self,
+        game_info_filter_sort_dto: FilterSortGameInfoDTORequest,
+        page_request: CatalogPageRequestDTO,
+    ) -> CatalogPageDTO:
+        pass
+
     @abstractmethod
     def set_like_game_info_by_uuid(
         self, uuid: UUID, player_uuid: UUID
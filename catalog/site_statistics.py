@@ -0,0 +1,61 @@
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+STATISTICS_PK = 1
+FIELDS = ("number_of_games", "played", "number_of_teams")
+
+
+class SiteStatisticsCounters:
+    """Site totals kept in the single SiteStatistics row.
+
+    GameInfo signals and GameSessionRepository move the counters with
+    `F() + delta` in the transaction that changed a game or closed a session, so
+    reading the totals is a primary-key lookup. A missing row is rebuilt from the
+    tables on first use; sessions changed past the repository (admin, bulk
+    scripts) are picked up by the rebuild_site_statistics command.
+    """
+
+    @staticmethod
+    def _model():
+        from catalog.models import SiteStatistics
+
+        return SiteStatistics
+
+    def get(self) -> dict[str, int]:
+        row = self._model().objects.filter(pk=STATISTICS_PK).values(*FIELDS).first()
+        return row if row is not None else self.rebuild()
+
+    def add(self, **deltas: int) -> None:
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        updated = (
+            self._model()
+            .objects.filter(pk=STATISTICS_PK)
+            .update(**{field: F(field) + delta for field, delta in deltas.items()})
+        )
+        if not updated:
+            # рядка ще немає: перерахунок уже врахує зміну з поточної транзакції
+            self.rebuild()
+
+    def rebuild(self) -> dict[str, int]:
+        """Recounts the totals from the games and sessions tables"""
+        from catalog.models import GameInfo
+        from game_session.models import GameSession
+
+        with transaction.atomic():
+            totals = GameSession.objects.aggregate(
+                number_of_teams=Coalesce(Sum("final_teams"), 0),
+                played=Count("pk", filter=Q(is_active=False)),
+            )
+            totals["number_of_games"] = GameInfo.objects.count()
+            self._model().objects.update_or_create(pk=STATISTICS_PK, defaults=totals)
+        return totals
+
+
+site_statistics = SiteStatisticsCounters()
+
+
+def session_contribution(is_active: bool, final_teams: int | None) -> dict[str, int]:
+    return {"played": 0 if is_active else 1, "number_of_teams": final_teams or 0}
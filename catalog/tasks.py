@@ -0,0 +1,18 @@
+from celery import shared_task
+
+from catalog.cache import CatalogCache
+from catalog.repositories import like_counter
+
+
+@shared_task
+def flush_like_buffer() -> int:
+    """Writes buffered likes to the DB"""
+    return like_counter.flush()
+
+
+@shared_task
+def reconcile_like_counters() -> int:
+    fixed = like_counter.reconcile()
+    if fixed:
+        CatalogCache().bump_version()
+    return fixed
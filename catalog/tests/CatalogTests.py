@@ -1,18 +1,54 @@
+import json
 import os
-
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
+from uuid import uuid4
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import caches
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.db import connection
+from django.http.cookie import SimpleCookie
+from django.test import AsyncRequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.test import APITestCase, APITransactionTestCase
+from rest_framework_simplejwt.tokens import RefreshToken
 
+from additional_service.dto_mapper import compile_mapper
+from additional_service.file_gc import collect_garbage
+from additional_service.images import variant_urls
+from additional_service.models import StoredFile
 from additional_service.upload_delete_file import AdditionalService
-from catalog.dto import CreateGameInfoDTO
-from catalog.models import GameInfo
-from catalog.repositories import GameInfoRepository
+from api.v1.views.async_reads import all_game_info, game_info
+from catalog.cache import CatalogCache
+from catalog.dto import CreateGameInfoDTO, GameInfoDTOResponse
+from catalog.models import GameInfo, Like, SiteStatistics
+from catalog.repositories import GameInfoRepository, like_counter
+from catalog.site_statistics import site_statistics
+from catalog.services import CachedGameInfoService, GameInfoService
+from catalog.tasks import flush_like_buffer
+from core.containers import ServiceContainer
+from gallery.models import GalleryItem
+from game_session.identificators import identificator_allocator
 from game_session.models import GameSession
 from game_session.repositories import GameSessionRepository
 from players.models import Player
 from players.repositories import PlayerRepository
 
+# файловий кеш спільний для процесів, як Redis у робочому оточенні
+SHARED_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(tempfile.gettempdir(), "catalog-tests-cache"),
+    }
+}
+
 
 class CatalogTests(APITestCase):
     def setUp(self):
@@ -90,6 +126,7 @@ class CatalogTests(APITestCase):
         self.game_session_repository = GameSessionRepository()
 
         self.game_session = GameSession.objects.create(
+            identificator=identificator_allocator.allocate()[0],
             creator=Player(player_uuid=self.players[0]),
             final_teams=3,
             team_min=2,
@@ -97,6 +134,8 @@ class CatalogTests(APITestCase):
             team_players_min=4,
             team_players_max=6,
         )
+        # сесія створена через ORM повз репозиторій, що веде статистику
+        site_statistics.rebuild()
 
     # Positive test case for APICreateGameInfoView post method
     def test_create_game_info_success(self):
@@ -122,6 +161,7 @@ class CatalogTests(APITestCase):
         self.assertEqual(game["members"], 10)
         # Видаляємо фото, щоб не засмічувати пам'ять
         AdditionalService.delete_file_from_s3(self, photo_url=game["photo"])
+        collect_garbage()
 
     # Negative test case for APICreateGameInfoView post method
     def test_create_game_info_failure_invalid_data(self):
@@ -138,6 +178,67 @@ class CatalogTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(response.data["status"], "failed")
 
+    @override_settings(IMAGE_VARIANTS_EXECUTOR="inline")
+    def test_create_game_info_builds_photo_variants(self):
+        buffer = BytesIO()
+        Image.new("RGB", (2000, 1000), (200, 50, 50)).save(buffer, "JPEG")
+        data = {
+            "name_ua": "Variants UA",
+            "name_en": "Variants EN",
+            "photo_jpeg": SimpleUploadedFile(
+                "large_photo.jpg", buffer.getvalue(), content_type="image/jpeg"
+            ),
+            "description_ua": "Variants Description UA",
+            "description_en": "Variants Description EN",
+            "is_team": False,
+            "members": 10,
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/v1/game_info/", data=data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        game = response.data["data"]
+        # варіанти будуються після відповіді
+        self.assertEqual(game["photo_variants"], {})
+
+        response = self.client.get(f"/api/v1/game_info/{game['uuid']}/")
+        variants = response.data["data"]["photo_variants"]
+        self.assertEqual(set(variants), {"thumbnail", "card", "full"})
+        expected = {"thumbnail": (320, 160), "card": (640, 320), "full": (1280, 640)}
+        for variant, size in expected.items():
+            self.assertEqual(set(variants[variant]), {"webp", "jpeg"})
+            with Image.open(f".{variants[variant]['webp']}") as image:
+                self.assertEqual((image.format, image.size), ("WEBP", size))
+            with Image.open(f".{variants[variant]['jpeg']}") as image:
+                self.assertEqual((image.format, image.size), ("JPEG", size))
+
+        AdditionalService.delete_file_from_s3(self, photo_url=game["photo"])
+        collect_garbage()
+        for url in [game["photo"], *variant_urls(game["photo"])]:
+            self.assertFalse(os.path.exists(f".{url}"))
+
+    def test_create_game_info_failure_rolls_back_photo_reference(self):
+        buffer = BytesIO()
+        Image.new("RGB", (20, 10), (50, 200, 50)).save(buffer, "JPEG")
+        data = {
+            "name_ua": "Rollback UA",
+            "name_en": "Rollback EN",
+            "photo_jpeg": SimpleUploadedFile(
+                "rollback_photo.jpg", buffer.getvalue(), content_type="image/jpeg"
+            ),
+            "description_ua": "Rollback Description UA",
+            "description_en": "Rollback Description EN",
+            "is_team": False,
+            "members": 10,
+        }
+        stored_files = StoredFile.objects.count()
+        with mock.patch.object(
+            GameInfoRepository, "create_game_info", side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                self.client.post("/api/v1/game_info/", data=data)
+        self.assertEqual(StoredFile.objects.count(), stored_files)
+        self.assertFalse(GameInfo.objects.filter(name_en="Rollback EN").exists())
+
     # Positive test case for ApiGameInfoView get method
     def test_get_game_info_success(self):
         uuid = self.game_info_uuid
@@ -189,6 +290,7 @@ class CatalogTests(APITestCase):
         self.assertEqual(game["members"], 20)
         # Видаляємо фото, щоб не засмічувати пам'ять
         AdditionalService.delete_file_from_s3(self, photo_url=game["photo"])
+        collect_garbage()
 
     # Negative test case for ApiGameInfoView put method
     def test_update_game_info_failure_not_found(self):
@@ -213,6 +315,25 @@ class CatalogTests(APITestCase):
         assert response.data["status"] == "success"
         assert response.data["message"] == "Successful delete game_info."
 
+    @override_settings(FILE_GC_EXECUTOR="inline")
+    def test_delete_game_info_removes_gallery_photos(self):
+        photo_url = AdditionalService().upload_file_to_s3(
+            group_name="gallery", object_name="Team", bytesio_file=self.photo_jpeg
+        )
+        GalleryItem.objects.create(
+            game_id=self.game_info_uuid,
+            topic="Topic",
+            text="Text",
+            photo=photo_url,
+            team_name="Team",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f"/api/v1/game_info/{self.game_info_uuid}/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            # відповідь не чекає на видалення файлів
+            self.assertTrue(os.path.isfile(f".{photo_url}"))
+        self.assertFalse(os.path.exists(f".{photo_url}"))
+
     # Negative test case for ApiGameInfoView delete method
     def test_delete_game_info_failure_not_found(self):
         uuid = "invalid-uuid"
@@ -265,8 +386,9 @@ class CatalogTests(APITestCase):
         self.assertEqual(statistic["number_of_games"], 4)
 
     def test_get_statistics_on_the_site_no_sessions(self):
-        # Видалення всіх ігрових сесій
+        # Видалення всіх ігрових сесій, як з адмінки: статистику перераховує команда
         GameSession.objects.all().delete()
+        call_command("rebuild_site_statistics", stdout=StringIO())
 
         response = self.client.get("/api/v1/game_info/statistic/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -288,6 +410,41 @@ class CatalogTests(APITestCase):
         self.assertEqual(response.data["data"]["number_of_games"], 0)
         self.assertEqual(response.data["data"]["number_of_teams"], 3)
 
+    def test_get_statistics_on_the_site_is_one_lookup(self):
+        self.client.get("/api/v1/game_info/statistic/")
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/v1/game_info/statistic/")
+        self.assertEqual(response.data["data"]["number_of_games"], 4)
+
+    def test_statistics_follow_finished_sessions(self):
+        self.game_session.lobby.add(*self.players)
+        self.game_session.team_min = 1
+        self.game_session.team_players_min = 1
+        self.game_session.save()
+        self.game_session_repository.get_all_players_in_session_by_uuid(
+            creator_uuid=self.players[0],
+            session_identificator=self.game_session.identificator,
+        )
+        statistic = self.client.get("/api/v1/game_info/statistic/").data["data"]
+        self.assertEqual(statistic["played"], 1)
+        self.assertEqual(statistic["number_of_teams"], 2)
+
+        # перевикористаний код сесії не зменшує статистику
+        GameSession.objects.filter(pk=self.game_session.pk).delete()
+        statistic = self.client.get("/api/v1/game_info/statistic/").data["data"]
+        self.assertEqual(statistic["played"], 1)
+        self.assertEqual(statistic["number_of_teams"], 2)
+
+    def test_rebuild_site_statistics(self):
+        SiteStatistics.objects.update(number_of_games=100, played=7)
+        out = StringIO()
+        call_command("rebuild_site_statistics", stdout=out)
+        self.assertIn("number_of_games=4", out.getvalue())
+        statistic = self.client.get("/api/v1/game_info/statistic/").data["data"]
+        self.assertEqual(statistic["number_of_games"], 4)
+        self.assertEqual(statistic["played"], 0)
+        self.assertEqual(statistic["number_of_teams"], 3)
+
     def test_create_category_wrong_empty(self):
         create_data = {}
         response = self.client.post("/api/v1/game_info/", data=create_data)
@@ -425,3 +582,375 @@ class CatalogTests(APITestCase):
         self.assertEqual(response.data["data"][1]["name_ua"], "Game3 Name UA")
         self.assertEqual(response.data["data"][2]["name_ua"], "Game1 Name UA")
         self.assertEqual(response.data["data"][3]["name_ua"], "Game2 Name UA")
+
+    def test_catalog_cache_needs_shared_backend(self):
+        # LocMem - окремий кеш у кожному воркері, версію каталогу вони не поділять
+        self.assertIsInstance(ServiceContainer.game_info_service(), GameInfoService)
+        with override_settings(CACHES=SHARED_CACHES):
+            self.assertIsInstance(
+                ServiceContainer.game_info_service(), CachedGameInfoService
+            )
+
+    @override_settings(CACHES=SHARED_CACHES)
+    def test_get_all_game_info_served_from_cache(self):
+        caches["default"].clear()
+        self.client.get("/api/v1/game_info/all/")
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/v1/game_info/all/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["data"]), 4)
+
+    @override_settings(CACHES=SHARED_CACHES)
+    def test_get_all_game_info_cache_invalidated_by_like(self):
+        caches["default"].clear()
+        self.client.get("/api/v1/game_info/all/")
+        self.client.cookies = SimpleCookie({"PLAYER_UUID": str(self.players[0])})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(f"/api/v1/game_info/{self.game2_uuid}/like/")
+
+        response = self.client.get("/api/v1/game_info/all/")
+        game = response.data["data"][0]
+        self.assertEqual(game["uuid"], self.game2_uuid)
+        self.assertEqual(game["like__number"], 1)
+
+    def test_catalog_cache_version_moves_after_commit(self):
+        catalog_cache = CatalogCache()
+        version = catalog_cache.get_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            GameInfo.objects.filter(uuid=self.game2_uuid).update(members=3)
+            catalog_cache.bump_version()
+            # до коміту читач ще не повинен перейти на нову версію
+            self.assertEqual(catalog_cache.get_version(), version)
+        for callback in callbacks:
+            callback()
+        self.assertGreater(catalog_cache.get_version(), version)
+
+    def test_dto_mapper_reads_nested_fields(self):
+        mapper = compile_mapper(GameInfoDTOResponse)
+        self.assertIs(mapper, compile_mapper(GameInfoDTOResponse))
+
+        game_info = GameInfo.objects.get(uuid=self.game2_uuid)
+        self.assertEqual(
+            mapper.map(game_info).like__number,
+            Like.objects.get(gameinfo=self.game2_uuid).number,
+        )
+
+    def _assert_catalog_endpoints_num_queries(self, num):
+        with self.assertNumQueries(num):
+            self.client.get("/api/v1/game_info/all/")
+        with self.assertNumQueries(num):
+            self.client.post(
+                "/api/v1/game_info/all/", data={"group_or_individual": "group"}
+            )
+        with self.assertNumQueries(num):
+            self.client.get(f"/api/v1/game_info/{self.game_info_uuid}/")
+
+    def test_catalog_endpoints_num_queries_independent_of_catalog_size(self):
+        self._assert_catalog_endpoints_num_queries(1)
+
+        repository = GameInfoRepository()
+        for number in range(10):
+            game_info = repository.create_game_info(
+                CreateGameInfoDTO(
+                    name_ua=f"Extra Name UA {number}",
+                    name_en=f"Extra Name EN {number}",
+                    photo="test.jpg",
+                    description_ua="Extra Description UA",
+                    description_en="Extra Description EN",
+                    is_team=True,
+                    members=number + 2,
+                )
+            )
+            repository.set_like_game_info_by_uuid(game_info.uuid, self.players[0])
+
+        self._assert_catalog_endpoints_num_queries(1)
+
+    def test_like_is_idempotent_per_player(self):
+        repository = GameInfoRepository()
+        for _ in range(2):
+            game_info = repository.set_like_game_info_by_uuid(
+                self.game1_uuid, self.players[0]
+            )
+            self.assertEqual(game_info.like__number, 1)
+        game_info = repository.set_like_game_info_by_uuid(
+            self.game1_uuid, self.players[1]
+        )
+        self.assertEqual(game_info.like__number, 2)
+
+        for _ in range(2):
+            game_info = repository.unset_like_game_info_by_uuid(
+                self.game1_uuid, self.players[0]
+            )
+            self.assertEqual(game_info.like__number, 1)
+        self.assertEqual(Like.objects.get(gameinfo=self.game1_uuid).number, 1)
+
+    def test_reconcile_like_counters_repairs_drift(self):
+        repository = GameInfoRepository()
+        repository.set_like_game_info_by_uuid(self.game1_uuid, self.players[0])
+        Like.objects.filter(gameinfo=self.game1_uuid).update(number=7)
+        Like.objects.filter(gameinfo=self.game2_uuid).update(number=3)
+
+        out = StringIO()
+        call_command("reconcile_like_counters", stdout=out)
+
+        self.assertIn("2", out.getvalue())
+        self.assertEqual(Like.objects.get(gameinfo=self.game1_uuid).number, 1)
+        self.assertEqual(Like.objects.get(gameinfo=self.game2_uuid).number, 0)
+
+    @override_settings(
+        VOTE_WRITE_BEHIND=True, VOTE_BUFFER_BACKEND="local", VOTE_FLUSH_INTERVAL=3600
+    )
+    def test_write_behind_likes_merged_until_flush(self):
+        self.addCleanup(like_counter.buffer.clear)
+        for player_uuid in self.players:
+            self.client.cookies = SimpleCookie({"PLAYER_UUID": str(player_uuid)})
+            response = self.client.get(f"/api/v1/game_info/{self.game2_uuid}/like/")
+        self.assertEqual(response.data["data"]["like__number"], 2)
+        response = self.client.get(f"/api/v1/game_info/{self.game2_uuid}/like/")
+        self.assertEqual(response.data["data"]["like__number"], 2)
+        response = self.client.get(f"/api/v1/game_info/{self.game2_uuid}/unlike/")
+        self.assertEqual(response.data["data"]["like__number"], 1)
+
+        like = Like.objects.get(gameinfo=self.game2_uuid)
+        self.assertEqual(like.number, 0)
+        self.assertEqual(like.list_vote_user_id.count(), 0)
+        response = self.client.get("/api/v1/game_info/all/")
+        game = response.data["data"][0]
+        self.assertEqual(game["uuid"], self.game2_uuid)
+        self.assertEqual(game["like__number"], 1)
+        response = self.client.get(f"/api/v1/game_info/{self.game2_uuid}/")
+        self.assertEqual(response.data["data"]["like__number"], 1)
+
+        with mock.patch.object(
+            like_counter, "_apply", side_effect=RuntimeError("database is down")
+        ):
+            with self.assertRaises(RuntimeError):
+                flush_like_buffer()
+        # невдале скидання лишає голоси в буфері
+        response = self.client.get(f"/api/v1/game_info/{self.game2_uuid}/")
+        self.assertEqual(response.data["data"]["like__number"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(flush_like_buffer(), 1)
+        like.refresh_from_db()
+        self.assertEqual(like.number, 1)
+        self.assertEqual(list(like.list_vote_user_id.all()), [Player(self.players[0])])
+        self.assertEqual(like_counter.pending_deltas(), {})
+        response = self.client.get(f"/api/v1/game_info/{self.game2_uuid}/")
+        self.assertEqual(response.data["data"]["like__number"], 1)
+
+    def test_get_all_game_info_paginated_with_projection(self):
+        url = "/api/v1/game_info/all/?page_size=3&fields=uuid,name_ua,like__number"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 4)
+        self.assertEqual(len(response.data["data"]), 3)
+        self.assertEqual(
+            set(response.data["data"][0]), {"uuid", "name_ua", "like__number"}
+        )
+        names = [game["name_ua"] for game in response.data["data"]]
+
+        response = self.client.get(url + f"&cursor={response.data['next_cursor']}")
+        names += [game["name_ua"] for game in response.data["data"]]
+        self.assertIsNone(response.data["next_cursor"])
+        self.assertEqual(
+            names, ["Test Name UA", "Game1 Name UA", "Game2 Name UA", "Game3 Name UA"]
+        )
+
+        response = self.client.get("/api/v1/game_info/all/?page=2&page_size=3")
+        self.assertEqual(len(response.data["data"]), 1)
+        self.assertEqual(response.data["data"][0]["name_ua"], "Game3 Name UA")
+
+        response = self.client.get("/api/v1/game_info/all/?page=3&page_size=3")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data["detail"], "Invalid page.")
+
+    def test_catalog_filter_sort_paginated_with_projection(self):
+        response = self.client.post(
+            "/api/v1/game_info/all/?page_size=2&fields=name_ua,members",
+            data={"sort_selection": "member"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["data"],
+            [
+                {"name_ua": "Test Name UA", "members": 10},
+                {"name_ua": "Game3 Name UA", "members": 5},
+            ],
+        )
+        response = self.client.post(
+            "/api/v1/game_info/all/?page_size=2&fields=name_ua,members"
+            f"&cursor={response.data['next_cursor']}",
+            data={"sort_selection": "member"},
+        )
+        self.assertEqual(
+            [game["name_ua"] for game in response.data["data"]],
+            ["Game1 Name UA", "Game2 Name UA"],
+        )
+
+    def test_catalog_list_rejects_unknown_fields_and_cursor(self):
+        response = self.client.get("/api/v1/game_info/all/?fields=name_ua,secret")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("secret", response.data["message"])
+
+        # base64 від [1, 2], [[1], [2]] і [null, "x"]
+        for cursor in ("broken", "WzEsMl0", "W1sxXSwgWzJdXQ", "W251bGwsICJ4Il0"):
+            response = self.client.get(f"/api/v1/game_info/all/?cursor={cursor}")
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(response.data["detail"], "Invalid cursor")
+
+    # --------------------------------------BULK IMPORT/EXPORT--------------------------
+
+    @staticmethod
+    def _bulk_games(count: int, prefix: str = "Bulk") -> list[dict]:
+        return [
+            {
+                "name_ua": f"{prefix} UA {number}",
+                "name_en": f"{prefix} EN {number}",
+                "photo": "test.jpg",
+                "description_ua": "Опис",
+                "description_en": "Description",
+                "members": number,
+            }
+            for number in range(count)
+        ]
+
+    def test_bulk_create_game_info_queries_do_not_grow(self):
+        repository = GameInfoRepository()
+        query_counts = []
+        for count, prefix in ((2, "Small"), (40, "Large")):
+            games = [
+                CreateGameInfoDTO(**game) for game in self._bulk_games(count, prefix)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(repository.bulk_create_game_info(games), count)
+            query_counts.append(len(queries))
+        self.assertEqual(query_counts[0], query_counts[1])
+        self.assertEqual(
+            Like.objects.filter(gameinfo__name_en__startswith="Large").count(), 40
+        )
+        self.assertEqual(
+            SiteStatistics.objects.get().number_of_games, GameInfo.objects.count()
+        )
+
+    def test_bulk_import_endpoint_is_all_or_nothing(self):
+        url = "/api/v1/game_info/bulk/"
+        body = "\n".join(json.dumps(game) for game in self._bulk_games(3))
+        response = self.client.post(url, body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.force_authenticate(
+            User.objects.create_user("staff", password="staff", is_staff=True)
+        )
+        games_before = GameInfo.objects.count()
+        taken = self._bulk_games(1)[0] | {"name_en": "Test Name EN"}
+        for bad_body, message in (
+            (body + "\n" + json.dumps(taken), "same name"),
+            (body + '\n{"name_ua": "Half"}', "Line 4: name_en"),
+            (body + "\nnot json", "Line 4"),
+        ):
+            response = self.client.post(
+                url, bad_body, content_type="application/x-ndjson"
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(message, response.data["message"])
+            self.assertEqual(GameInfo.objects.count(), games_before)
+
+        response = self.client.post(url, body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["data"], {"created": 3})
+        response = self.client.get("/api/v1/game_info/all/")
+        self.assertEqual(len(response.data["data"]), games_before + 3)
+
+    def test_db_pool_stats_are_staff_only(self):
+        url = "/api/v1/db_pool_stats/"
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.force_authenticate(
+            User.objects.create_user("staff", password="staff", is_staff=True)
+        )
+        with mock.patch(
+            "api.v1.views.db_pool.pool_metrics",
+            return_value={"default": {"checkouts": 1, "timeouts": 0}},
+        ):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["default"]["checkouts"], 1)
+
+    def test_export_streams_what_import_catalog_reads(self):
+        self.client.force_authenticate(
+            User.objects.create_user("staff", password="staff", is_staff=True)
+        )
+        response = self.client.get("/api/v1/game_info/bulk/")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        exported = b"".join(response.streaming_content)
+        rows = [json.loads(line) for line in exported.splitlines()]
+        self.assertEqual(len(rows), GameInfo.objects.count())
+
+        output = StringIO()
+        call_command("export_catalog", stdout=output)
+        self.assertEqual(output.getvalue().encode(), exported)
+
+        GameInfo.objects.all().delete()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "game_info.ndjson")
+        with open(path, "wb") as file:
+            file.write(exported)
+        call_command("import_catalog", path, stdout=StringIO())
+        self.assertEqual(
+            set(GameInfo.objects.values_list("name_en", flat=True)),
+            {row["name_en"] for row in rows},
+        )
+
+
+class CatalogAsyncReadsTests(APITransactionTestCase):
+    # async-представлення читають БД з пулу потоків, тож дані мають бути закомічені
+    setUp = CatalogTests.setUp
+
+    def test_export_is_complete_under_the_asgi_handler(self):
+        staff = User.objects.create_user("staff", password="staff", is_staff=True)
+        token = RefreshToken.for_user(staff).access_token
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/v1/game_info/bulk/",
+            "query_string": b"",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+        }
+        async_to_sync(ASGIHandler())(scope, receive, send)
+
+        self.assertEqual(messages[0]["status"], 200)
+        body = b"".join(message.get("body", b"") for message in messages[1:])
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(rows), GameInfo.objects.count())
+
+    def test_async_reads_match_sync_views(self):
+        request_factory = AsyncRequestFactory()
+        for query in ("", "?page_size=2&fields=uuid", "?page=9", "?fields=secret"):
+            path = "/api/v1/game_info/all/" + query
+            response = self.client.get(path)
+            async_response = async_to_sync(all_game_info)(request_factory.get(path))
+            self.assertEqual(async_response.status_code, response.status_code)
+            self.assertEqual(
+                json.loads(async_response.content), json.loads(response.content)
+            )
+
+        for uuid in (self.game_info_uuid, uuid4()):
+            path = f"/api/v1/game_info/{uuid}/"
+            response = self.client.get(path)
+            async_response = async_to_sync(game_info)(
+                request_factory.get(path), uuid=uuid
+            )
+            self.assertEqual(async_response.status_code, response.status_code)
+            self.assertEqual(
+                json.loads(async_response.content), json.loads(response.content)
+            )
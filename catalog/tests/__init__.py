@@ -1,3 +1,4 @@
-from .CatalogTests import CatalogTests
+from .CatalogTests import CatalogAsyncReadsTests, CatalogTests
 
 CatalogTests()
+CatalogAsyncReadsTests()
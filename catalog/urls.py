@@ -1,7 +1,9 @@
 from django.urls import path
 
+from api.v1.views.async_reads import all_game_info, game_info, read_view
 from api.v1.views.catalog import (
     APIAllGameInfoView,
+    APIGameInfoBulkView,
     APICreateGameInfoView,
     APIGameInfoLikeView,
     APIGameInfoUnlikeView,
@@ -13,8 +15,13 @@ app_name = "catalog"
 
 urlpatterns = [
     path("statistic/", APIStatisticInfoView.as_view(), name="catalog_statistic"),
-    path("all/", APIAllGameInfoView.as_view(), name="catalog_all_game_info"),
-    path("<uuid:uuid>/", ApiGameInfoView.as_view(), name="game_info"),
+    path("bulk/", APIGameInfoBulkView.as_view(), name="game_info_bulk"),
+    path(
+        "all/",
+        read_view(APIAllGameInfoView, all_game_info),
+        name="catalog_all_game_info",
+    ),
+    path("<uuid:uuid>/", read_view(ApiGameInfoView, game_info), name="game_info"),
     path("<uuid:uuid>/like/", APIGameInfoLikeView.as_view(), name="game_info_like"),
     path(
         "<uuid:uuid>/unlike/", APIGameInfoUnlikeView.as_view(), name="game_info_unlike"
@@ -13,4 +13,10 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# імпорт після get_asgi_application: модулю потрібні налаштовані застосунки
+from api.v1.views.lobby_events import LobbyEventsRouter  # noqa: E402
+
+# SSE/WebSocket-підписки на лобі, решта запитів іде в Django
+application = LobbyEventsRouter(django_application)
@@ -1,15 +1,18 @@
 from dependency_injector import containers, providers
+from django.conf import settings
 
 from additional_service.upload_delete_file import AdditionalService
 from catalog.interactors import GameInfoInteractor
 from catalog.repositories import GameInfoRepository
-from catalog.services import GameInfoService
+from catalog.cache import CatalogCache, catalog_cache_enabled
+from catalog.services import CachedGameInfoService, GameInfoService
 from developers.interactors import DeveloperInteractor
 from developers.repositories import DeveloperRepository
 from developers.services import DeveloperService
 from gallery.interactors import GalleryInteractor
 from gallery.repositories import GalleryRepository
 from gallery.services import GalleryService
+from game_session.events import LobbyEventPublisher
 from game_session.interactors import GameSessionInteractor
 from game_session.repositories import GameSessionRepository
 from game_session.services import GameSessionService
@@ -37,16 +40,27 @@ class ServiceContainer(containers.DeclarativeContainer):
     developer_service = providers.Factory(
         DeveloperService, repository=RepositoryContainer.developer_repository
     )
-    game_info_service = providers.Factory(
+    uncached_game_info_service = providers.Factory(
         GameInfoService,
         game_info_repository=RepositoryContainer.game_info_repository,
-        game_session_repository=RepositoryContainer.game_session_repository,
+    )
+    # з LocMem кожен воркер мав би свою версію каталогу й віддавав би застарілі списки
+    game_info_service = providers.Selector(
+        providers.Callable(lambda: "cached" if catalog_cache_enabled() else "uncached"),
+        cached=providers.Factory(
+            CachedGameInfoService,
+            game_info_service=uncached_game_info_service,
+            catalog_cache=providers.Factory(CatalogCache),
+        ),
+        uncached=uncached_game_info_service,
     )
     gallery_service = providers.Factory(
         GalleryService, repository=RepositoryContainer.gallery_repository
     )
     game_session_service = providers.Factory(
-        GameSessionService, repository=RepositoryContainer.game_session_repository
+        GameSessionService,
+        repository=RepositoryContainer.game_session_repository,
+        events=providers.Factory(LobbyEventPublisher),
     )
 
 
@@ -74,3 +88,49 @@ class ProjectContainer(containers.DeclarativeContainer):
             GameSessionInteractor, service=ServiceContainer.game_session_service
         )
     )
+
+
+CONTAINERS = (
+    AdditionalServiceContainer,
+    RepositoryContainer,
+    ServiceContainer,
+    ProjectContainer,
+)
+
+_singletons: dict[providers.Factory, providers.ThreadSafeSingleton] = {}
+
+
+def use_singletons() -> None:
+    """Serves every container provider as one thread-safe instance per process
+
+    Interactors, services and repositories keep no per-request state, so the
+    graph is built once instead of on every `ProjectContainer.<x>_interactor()`.
+    Tests can still `override` a provider on top.
+    """
+    for container in CONTAINERS:
+        for provider in container.providers.values():
+            if isinstance(provider, providers.Factory) and provider not in _singletons:
+                # залежності - ті самі провайдери контейнерів, тож і вони спільні
+                singleton = providers.ThreadSafeSingleton(
+                    provider.provides, *provider.args, **provider.kwargs
+                )
+                provider.override(singleton)
+                _singletons[provider] = singleton
+
+
+def use_factories() -> None:
+    """Back to a fresh object graph per call, drops every override"""
+    for provider in _singletons:
+        provider.reset_override()
+    _singletons.clear()
+
+
+def reset_singletons() -> None:
+    """Next call builds the objects again, e.g. after override_settings"""
+    for singleton in _singletons.values():
+        singleton.reset()
+
+
+# "factory" - новий граф об'єктів на кожен виклик, "singleton" - один на процес
+if settings.CONTAINER_PROVIDERS == "singleton":
+    use_singletons()
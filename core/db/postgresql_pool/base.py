@@ -0,0 +1,40 @@
+from django.db.backends.postgresql import base
+
+from core.db.postgresql_pool.pool import get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend that borrows connections from a per-worker pool
+
+    Without POOL_SIZE in the DB settings it behaves like the stock backend.
+    """
+
+    @property
+    def pool_size(self) -> int:
+        return self.settings_dict.get("POOL_SIZE") or 0
+
+    @property
+    def pool(self):
+        return get_pool(
+            self.alias,
+            size=self.pool_size,
+            timeout=self.settings_dict.get("POOL_TIMEOUT", 30),
+            health_checks=self.settings_dict["CONN_HEALTH_CHECKS"],
+        )
+
+    def get_new_connection(self, conn_params):
+        if not self.pool_size:
+            return super().get_new_connection(conn_params)
+        connection = self.pool.getconn(
+            connect=lambda: super(DatabaseWrapper, self).get_new_connection(conn_params)
+        )
+        self.isolation_level = self.settings_dict["OPTIONS"].get(
+            "isolation_level", connection.isolation_level
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None or not self.pool_size:
+            return super()._close()
+        with self.wrap_database_errors:
+            self.pool.putconn(self.connection)
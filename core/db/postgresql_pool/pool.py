@@ -0,0 +1,164 @@
+import os
+import threading
+import time
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class PoolMetrics:
+    """Counters of one pool, read them with `pool_metrics()`"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.discarded = 0
+        self.timeouts = 0
+        self.in_use = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_checkout(self, waited: float, connected: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.connects += connected
+            self.in_use += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def record_checkin(self, discarded: bool) -> None:
+        with self._lock:
+            self.in_use -= 1
+            self.discarded += discarded
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "discarded": self.discarded,
+                "timeouts": self.timeouts,
+                "in_use": self.in_use,
+                "wait_seconds": round(self.wait_seconds, 6),
+                "avg_wait_seconds": round(self.wait_seconds / (self.checkouts or 1), 6),
+                "max_wait_seconds": round(self.max_wait_seconds, 6),
+            }
+
+
+class ConnectionPool:
+    """Fixed-size pool of psycopg2 connections, waits for a free one up to `timeout`"""
+
+    def __init__(self, size: int, timeout: float, health_checks: bool):
+        self.size = size
+        self.timeout = timeout
+        self.health_checks = health_checks
+        # LIFO: останнє повернуте з'єднання найімовірніше ще живе
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self.metrics = PoolMetrics()
+
+    def getconn(self, connect):
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            self.metrics.record_timeout()
+            raise PoolTimeout(f"No free DB connection in {self.timeout}s")
+        waited = time.monotonic() - started
+        try:
+            connection = self._take_idle()
+            connected = connection is None
+            if connected:
+                connection = connect()
+        except BaseException:
+            self._slots.release()
+            raise
+        self.metrics.record_checkout(waited, connected)
+        return connection
+
+    def putconn(self, connection, discard: bool = False) -> None:
+        try:
+            discard = discard or not self._reset(connection)
+            if discard:
+                self._close_quietly(connection)
+            else:
+                with self._lock:
+                    self._idle.append(connection)
+        finally:
+            self._slots.release()
+            self.metrics.record_checkin(discard)
+
+    def closeall(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._close_quietly(connection)
+
+    def _take_idle(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                connection = self._idle.pop()
+            if self._is_usable(connection):
+                return connection
+            self._close_quietly(connection)
+
+    def _is_usable(self, connection) -> bool:
+        if connection.closed:
+            return False
+        if not self.health_checks:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def _reset(connection) -> bool:
+        """Rolls back whatever the borrower left open, False if it's broken"""
+        if connection.closed:
+            return False
+        try:
+            connection.rollback()
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def _close_quietly(connection) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias: str, size: int, timeout: float, health_checks: bool):
+    """One pool per DB alias and per process, gunicorn workers don't share it"""
+    key = (alias, os.getpid())
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(size, timeout, health_checks)
+    return pool
+
+
+def pool_metrics() -> dict[str, dict]:
+    """Counters of this process's pools by DB alias, also on /api/v1/db_pool_stats/"""
+    pid = os.getpid()
+    with _pools_lock:
+        pools = {
+            alias: pool for (alias, pool_pid), pool in _pools.items() if pool_pid == pid
+        }
+    return {alias: pool.metrics.snapshot() for alias, pool in pools.items()}
@@ -0,0 +1,40 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def db_executor() -> ThreadPoolExecutor:
+    """ASYNC_DB_THREADS threads of this process for the DB work of async views"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ASYNC_DB_THREADS, thread_name_prefix="async-db"
+            )
+        return _executor
+
+
+def db_sync_to_async(func):
+    """sync_to_async that does not queue behind the worker's one sync thread
+
+    Django's own async ORM calls (afirst, acount, async for) still share that
+    thread and its connection; these run concurrently, each thread with its own
+    connection, which is closed or returned to the pool after the call.
+    """
+
+    @wraps(func)
+    def call(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            # request_finished закриває з'єднання лише в потоці запиту
+            close_old_connections()
+
+    return sync_to_async(call, thread_sensitive=False, executor=db_executor())
@@ -14,6 +14,7 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -94,6 +95,7 @@ INSTALLED_APPS = [
     "catalog.apps.CatalogConfig",
     "gallery.apps.GalleryConfig",
     "game_session.apps.GameSessionConfig",
+    "additional_service.apps.AdditionalServiceConfig",
     "api.v1.apps.ApiConfig",
 ]
 
@@ -131,18 +133,54 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "core.wsgi.application"
+ASGI_APPLICATION = "core.asgi.application"
+
+# True - читання каталогу, галереї, гравця та лобі обслуговують async-представлення,
+# gunicorn запускає core.asgi з uvicorn-воркерами (див. gunicorn.py)
+ASYNC_READ_VIEWS = os.getenv("ASYNC_READ_VIEWS", "False") == "True"
+# Потоки кожного воркера для синхронної роботи async-представлень з БД (POST/PUT
+# через sync-представлення, сторінка каталогу, буфер голосів): кожен має своє
+# з'єднання. Async ORM Django (afirst, acount) і далі йде одним потоком воркера
+ASYNC_DB_THREADS = int(os.getenv("ASYNC_DB_THREADS", 8))
 
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# DB_POOL_SIZE > 0 - пул з'єднань у кожному gunicorn-воркері (розмір = потоки воркера,
+# з ASYNC_READ_VIEWS - ASYNC_DB_THREADS + 1 за потік async ORM),
+# інакше з'єднання живе між запитами DB_CONN_MAX_AGE секунд
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 0))
+# потоки sync-воркера (gunicorn.py); менший пул змушує їх чекати на з'єднання
+GUNICORN_THREADS = int(os.getenv("GUNICORN_THREADS", 1))
+if ASYNC_READ_VIEWS and 0 < DB_POOL_SIZE <= ASYNC_DB_THREADS:
+    raise ImproperlyConfigured(
+        "DB_POOL_SIZE must be at least ASYNC_DB_THREADS + 1 with ASYNC_READ_VIEWS"
+    )
+if not ASYNC_READ_VIEWS and 0 < DB_POOL_SIZE < GUNICORN_THREADS:
+    raise ImproperlyConfigured("DB_POOL_SIZE must be at least GUNICORN_THREADS")
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": (
+            "core.db.postgresql_pool"
+            if DB_POOL_SIZE
+            else "django.db.backends.postgresql"
+        ),
         "NAME": os.getenv("POSTGRES_DB", "postgres"),
         "USER": os.getenv("POSTGRES_USER", "postgres"),
         "PASSWORD": os.getenv("POSTGRES_PASSWORD", "postgres_pass"),
         "HOST": os.getenv("POSTGRES_HOST", "postgres_service"),
+        # з пулом з'єднання повертається в пул наприкінці кожного запиту;
+        # під ASGI кожен запит має свій потік, тож постійні з'єднання не живуть
+        "CONN_MAX_AGE": (
+            0
+            if DB_POOL_SIZE or ASYNC_READ_VIEWS
+            else int(os.getenv("DB_CONN_MAX_AGE", 60))
+        ),
+        "CONN_HEALTH_CHECKS": os.getenv("DB_CONN_HEALTH_CHECKS", "True") == "True",
+        "POOL_SIZE": DB_POOL_SIZE,
+        "POOL_TIMEOUT": float(os.getenv("DB_POOL_TIMEOUT", 30)),
     }
 }
 
@@ -281,8 +319,166 @@ REDIS_HOST = os.getenv("REDIS_HOST", "redis_container_service")
 REDIS_PORT = os.getenv("REDIS_PORT", 6379)
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", "")
 
+REDIS_LOCATION = os.getenv("REDIS_LOCATION", "")
+
+if REDIS_LOCATION:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_LOCATION,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Провайдери core.containers: "factory" - інтерактор, сервіси й репозиторії
+# створюються на кожен запит, "singleton" - один потокобезпечний екземпляр на процес
+CONTAINER_PROVIDERS = os.getenv("CONTAINER_PROVIDERS", "factory")
+
+# Кеш серіалізованих списків каталогу, скидається версією каталогу; вмикається лише
+# зі спільним для воркерів бекендом (Redis), на LocMem каталог читається з БД
+CATALOG_CACHE_ALIAS = os.getenv("CATALOG_CACHE_ALIAS", "default")
+CATALOG_CACHE_TIMEOUT = int(os.getenv("CATALOG_CACHE_TIMEOUT", 60 * 60))
+
+# Масовий імпорт ігор і розробників: рядків на один bulk_create; експорт читає
+# таблицю пачками того ж розміру
+BULK_IMPORT_BATCH_SIZE = int(os.getenv("BULK_IMPORT_BATCH_SIZE", 500))
+
+# initial_data_loading качає маніфести й фото паралельно, повторює невдалі запити
+# і тримає копії в INITIAL_DATA_CACHE_DIR, щоб наступний запуск не качав незмінене
+INITIAL_DATA_WORKERS = int(os.getenv("INITIAL_DATA_WORKERS", 8))
+INITIAL_DATA_RETRIES = int(os.getenv("INITIAL_DATA_RETRIES", 3))
+INITIAL_DATA_CACHE_DIR = os.getenv("INITIAL_DATA_CACHE_DIR", "./.initial_data_cache")
+
+# Лайки/голоси спершу потрапляють у буфер, Celery beat скидає їх у БД пачками
+VOTE_WRITE_BEHIND = os.getenv("VOTE_WRITE_BEHIND", "False") == "True"
+VOTE_BUFFER_BACKEND = os.getenv("VOTE_BUFFER_BACKEND", "local")
+VOTE_BUFFER_REDIS_URL = (
+    os.getenv("VOTE_BUFFER_REDIS_URL")
+    or f"redis://:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}/1"
+)
+VOTE_FLUSH_INTERVAL = float(os.getenv("VOTE_FLUSH_INTERVAL", 1))
+
+# Сховище зображень: "local" - ./cloud_img, який роздає nginx (лише один web-вузол),
+# "s3" - бакет S3/MinIO, клієнти можуть завантажувати в нього напряму
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+STORAGE_S3_BUCKET = os.getenv("STORAGE_S3_BUCKET", "")
+STORAGE_S3_ENDPOINT_URL = os.getenv("STORAGE_S3_ENDPOINT_URL", "")
+STORAGE_S3_REGION = os.getenv("STORAGE_S3_REGION", "")
+STORAGE_S3_ACCESS_KEY = os.getenv("STORAGE_S3_ACCESS_KEY", "")
+STORAGE_S3_SECRET_KEY = os.getenv("STORAGE_S3_SECRET_KEY", "")
+# звідки браузер читає файли (бакет або CDN перед ним)
+STORAGE_S3_PUBLIC_URL = os.getenv(
+    "STORAGE_S3_PUBLIC_URL", f"{STORAGE_S3_ENDPOINT_URL}/{STORAGE_S3_BUCKET}"
+)
+STORAGE_S3_MAX_POOL_CONNECTIONS = int(os.getenv("STORAGE_S3_MAX_POOL_CONNECTIONS", 10))
+STORAGE_S3_MULTIPART_THRESHOLD = int(
+    os.getenv("STORAGE_S3_MULTIPART_THRESHOLD", 8 * 1024 * 1024)
+)
+STORAGE_S3_MULTIPART_CHUNKSIZE = int(
+    os.getenv("STORAGE_S3_MULTIPART_CHUNKSIZE", 8 * 1024 * 1024)
+)
+STORAGE_S3_PRESIGN_EXPIRES = int(os.getenv("STORAGE_S3_PRESIGN_EXPIRES", 15 * 60))
+
+# Завантаження пишуться на диск частинами цього розміру разом із підрахунком SHA-256
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 64 * 1024))
+# Межа для файлів, завантажених напряму в бакет: attach перевіряє її через HEAD
+UPLOAD_MAX_SIZE = int(os.getenv("UPLOAD_MAX_SIZE", 10 * 1024 * 1024))
+
+# Видалені фото прибирає збирач сміття після коміту, пачками по FILE_GC_BATCH_SIZE:
+# "thread" - фоновий потік воркера, "celery" - задача Celery, "inline" - одразу
+FILE_GC_EXECUTOR = os.getenv("FILE_GC_EXECUTOR", "thread")
+FILE_GC_BATCH_SIZE = int(os.getenv("FILE_GC_BATCH_SIZE", 500))
+# Файли без жодного рядка-власника, старші за цей час (с), прибирає sweep_orphan_files
+ORPHAN_SWEEP_GRACE = int(os.getenv("ORPHAN_SWEEP_GRACE", 24 * 60 * 60))
+
+# Зменшені WebP/JPEG-варіанти завантажених фото будуються поза запитом:
+# "thread" - пул потоків воркера, "celery" - задача Celery, "inline" - одразу після коміту
+IMAGE_VARIANTS = os.getenv("IMAGE_VARIANTS", "True") == "True"
+IMAGE_VARIANTS_EXECUTOR = os.getenv("IMAGE_VARIANTS_EXECUTOR", "thread")
+IMAGE_VARIANTS_WORKERS = int(os.getenv("IMAGE_VARIANTS_WORKERS", 2))
+
+# Гравці без жодної дії (перейменування, лайк, голос, лобі), старші за стільки днів,
+# видаляються purge_unused_players; нові відвідувачі рядків не створюють взагалі
+PLAYER_PURGE_AFTER_DAYS = int(os.getenv("PLAYER_PURGE_AFTER_DAYS", 30))
+
+# Гравці за uuid кешуються у двох рівнях: LRU процесу на PLAYER_CACHE_SIZE записів,
+# що живуть PLAYER_CACHE_TTL (с), і спільний кеш PLAYER_CACHE_ALIAS на PLAYER_CACHE_TIMEOUT (с);
+# на LocMem спільного рівня немає, лишається тільки LRU
+PLAYER_CACHE_ALIAS = os.getenv("PLAYER_CACHE_ALIAS", "default")
+PLAYER_CACHE_SIZE = int(os.getenv("PLAYER_CACHE_SIZE", 1000))
+PLAYER_CACHE_TTL = float(os.getenv("PLAYER_CACHE_TTL", 5))
+PLAYER_CACHE_TIMEOUT = int(os.getenv("PLAYER_CACHE_TIMEOUT", 5 * 60))
+
+# Скільки кодів сесій процес резервує одним запитом до послідовності в БД
+IDENTIFICATOR_BLOCK_SIZE = int(os.getenv("IDENTIFICATOR_BLOCK_SIZE", 100))
+
+# Перемішувати гравців перед розподілом на команди (зерно - код сесії, тож розподіл
+# відтворюваний)
+TEAMS_SHUFFLE = os.getenv("TEAMS_SHUFFLE", "False") == "True"
+
+# Склад лобі активних сесій живе в сховищі (атомарний join з перевіркою місткості),
+# у таблицю lobby він записується пачкою, коли сесія закривається.
+# "local" - лише для одного процесу, кільком воркерам потрібен "redis"
+LOBBY_STATE_IN_MEMORY = os.getenv("LOBBY_STATE_IN_MEMORY", "False") == "True"
+LOBBY_STATE_BACKEND = os.getenv("LOBBY_STATE_BACKEND", "local")
+LOBBY_STATE_REDIS_URL = (
+    os.getenv("LOBBY_STATE_REDIS_URL")
+    or f"redis://:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}/3"
+)
+LOBBY_STATE_TTL = int(os.getenv("LOBBY_STATE_TTL", 24 * 60 * 60))
+LOBBY_STATE_PERSIST_BATCH_SIZE = int(os.getenv("LOBBY_STATE_PERSIST_BATCH_SIZE", 500))
+
+# Події лобі (приєднання, вихід, склад команд) для SSE/WebSocket-підписників;
+# "redis" розсилає їх між воркерами через pub/sub, "local" - лише в межах процесу.
+# Підписки обслуговує лише core.asgi (ASYNC_READ_VIEWS=True); кілька воркерів
+# gunicorn з "local" gunicorn.py не запустить
+LOBBY_EVENTS_BACKEND = os.getenv("LOBBY_EVENTS_BACKEND", "local")
+LOBBY_EVENTS_REDIS_URL = (
+    os.getenv("LOBBY_EVENTS_REDIS_URL")
+    or f"redis://:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}/2"
+)
+LOBBY_EVENTS_QUEUE_SIZE = int(os.getenv("LOBBY_EVENTS_QUEUE_SIZE", 100))
+# інтервал коментаря-пінгу, щоб проксі не закривав тихе з'єднання
+LOBBY_EVENTS_KEEPALIVE = float(os.getenv("LOBBY_EVENTS_KEEPALIVE", 15))
+
 CELERY_BROKER_URL = f"redis://:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}/0"
 CELERY_RESULT_BACKEND = f"redis://:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}"
+CELERY_BEAT_SCHEDULE = {
+    "flush-like-buffer": {
+        "task": "catalog.tasks.flush_like_buffer",
+        "schedule": VOTE_FLUSH_INTERVAL,
+    },
+    "flush-vote-buffer": {
+        "task": "gallery.tasks.flush_vote_buffer",
+        "schedule": VOTE_FLUSH_INTERVAL,
+    },
+    "reconcile-like-counters": {
+        "task": "catalog.tasks.reconcile_like_counters",
+        "schedule": 60 * 60,
+    },
+    "reconcile-vote-counters": {
+        "task": "gallery.tasks.reconcile_vote_counters",
+        "schedule": 60 * 60,
+    },
+    # черга могла залишитися після перезапуску воркера з потоком збирача
+    "collect-file-garbage": {
+        "task": "additional_service.tasks.collect_file_garbage",
+        "schedule": 10 * 60,
+    },
+    "sweep-orphan-files": {
+        "task": "additional_service.tasks.sweep_orphan_files",
+        "schedule": 24 * 60 * 60,
+    },
+    "purge-unused-players": {
+        "task": "players.tasks.purge_unused_players",
+        "schedule": 24 * 60 * 60,
+    },
+}
 
 DEFAULT_CHARSET = "utf-8"
 #
@@ -9,6 +9,7 @@ class CreateDeveloperDTO(BaseModel):
     name_en: str
     role_ua: str
     photo: Optional[str] = None
+    photo_variants: dict[str, dict[str, str]] = {}
     is_active: bool = False
 
 
@@ -22,4 +23,5 @@ class UpdateDeveloperDTO(DeveloperDTO):
     name_en: Optional[str] = None
     role_ua: Optional[str] = None
     photo: Optional[str] = None
+    photo_variants: Optional[dict[str, dict[str, str]]] = None
     is_active: Optional[bool] = None
@@ -4,3 +4,8 @@ from django.core.exceptions import ValidationError
 class DeveloperDoesNotExist(ValidationError):
     def __init__(self):
         super().__init__("Developer doesn't exist")
+
+
+class DeveloperAlreadyExists(ValidationError):
+    def __init__(self):
+        super().__init__("A developer with the same name already exists")
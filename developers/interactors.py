@@ -1,6 +1,9 @@
-from typing import List
+from typing import Iterator, List
 from uuid import UUID
 
+from django.conf import settings
+from django.db import transaction
+
 from additional_service.services_interfaces import AdditionalServiceInterface
 from developers.dto import CreateDeveloperDTO, DeveloperDTO, UpdateDeveloperDTO
 from developers.services_interfaces import DeveloperServiceInterface
@@ -21,14 +24,52 @@ class DeveloperInteractor:
         self, developer_dto: CreateDeveloperDTO, bytesio_file
     ) -> DeveloperDTO:
         """Create new developer"""
-        if bytesio_file:
-            image_path = self.additional_service.upload_file_to_s3(
-                group_name="developers",
-                object_name=developer_dto.name_en,
-                bytesio_file=bytesio_file,
+        with transaction.atomic():
+            if bytesio_file:
+                image_path = self.additional_service.upload_file_to_s3(
+                    group_name="developers",
+                    object_name=developer_dto.name_en,
+                    bytesio_file=bytesio_file,
+                )
+                developer_dto.photo = image_path
+            elif developer_dto.photo:
+                # файл клієнт уже завантажив у сховище напряму
+                developer_dto.photo = self.additional_service.attach_uploaded_file(
+                    photo_url=developer_dto.photo
+                )
+            developer = self.developer_service.create_developer(developer_dto)
+        if developer.photo:
+            self.additional_service.process_image(photo_url=developer.photo)
+        return developer
+
+    def bulk_create_developers(
+        self, developers: list[CreateDeveloperDTO], attach_photos: bool = True
+    ) -> int:
+        """Imports the developers batch by batch in one transaction, all or nothing"""
+        batch_size = settings.BULK_IMPORT_BATCH_SIZE
+        with transaction.atomic():
+            if attach_photos:
+                for developer in developers:
+                    if developer.photo:
+                        developer.photo = self.additional_service.attach_uploaded_file(
+                            # адмін переносить і старі записи з посиланнями поза сховищем
+                            photo_url=developer.photo,
+                            allow_external=True,
+                        )
+            created = sum(
+                self.developer_service.bulk_create_developers(
+                    developers[start : start + batch_size]
+                )
+                for start in range(0, len(developers), batch_size)
             )
-            developer_dto.photo = image_path
-        return self.developer_service.create_developer(developer_dto)
+        for photo in {
+            developer.photo for developer in developers if not developer.photo_variants
+        }:
+            self.additional_service.process_image(photo_url=photo)
+        return created
+
+    def export_developers(self) -> Iterator[dict]:
+        return self.developer_service.export_developers()
 
     def get_developer_by_uuid(self, developer_uuid: UUID) -> DeveloperDTO:
         return self.developer_service.get_developer_by_uuid(developer_uuid)
@@ -36,15 +77,39 @@ class DeveloperInteractor:
     def update_developer_by_uuid(
         self, developer_to_update: UpdateDeveloperDTO, bytesio_file
     ) -> DeveloperDTO:
-        if bytesio_file:
-            image_path = self.additional_service.upload_file_to_s3(
-                group_name="developers",
-                object_name=developer_to_update.name_en
-                or developer_to_update.developer_uuid.__str__(),
-                bytesio_file=bytesio_file,
+        old_photo = None
+        if bytesio_file or developer_to_update.photo:
+            old_photo = self.get_developer_by_uuid(
+                developer_uuid=developer_to_update.developer_uuid
+            ).photo
+        photo_replaced = bool(bytesio_file) or developer_to_update.photo not in (
+            None,
+            old_photo,
+        )
+        with transaction.atomic():
+            if bytesio_file:
+                image_path = self.additional_service.upload_file_to_s3(
+                    group_name="developers",
+                    object_name=developer_to_update.name_en
+                    or developer_to_update.developer_uuid.__str__(),
+                    bytesio_file=bytesio_file,
+                )
+                developer_to_update.photo = image_path
+            elif photo_replaced:
+                developer_to_update.photo = (
+                    self.additional_service.attach_uploaded_file(
+                        photo_url=developer_to_update.photo
+                    )
+                )
+            developer = self.developer_service.update_developer_by_uuid(
+                developer_to_update
             )
-            developer_to_update.photo = image_path
-        return self.developer_service.update_developer_by_uuid(developer_to_update)
+            if photo_replaced and old_photo:
+                # старе фото більше не потрібне цьому запису
+                self.additional_service.delete_file_from_s3(photo_url=old_photo)
+        if photo_replaced:
+            self.additional_service.process_image(photo_url=developer.photo)
+        return developer
 
     def delete_developer_by_uuid(self, developer_uuid: UUID) -> None:
         photo_url = self.get_developer_by_uuid(developer_uuid=developer_uuid).photo
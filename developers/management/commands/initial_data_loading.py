@@ -1,13 +1,14 @@
 import os
 import shutil
-from io import BytesIO
-import requests
-import json
-from django.core.management.base import BaseCommand
-from django.test import RequestFactory
-
-from api.v1.views.catalog import APICreateGameInfoView
-from api.v1.views.developers import APICreateAllDevelopersView
+from django.conf import settings
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from additional_service.asset_fetcher import AssetFetcher, AssetFetchError
+from catalog.dto import CreateGameInfoDTO
+from core.containers import AdditionalServiceContainer, ProjectContainer
+from developers.dto import CreateDeveloperDTO
 from developers.models import Developer
 from catalog.models import GameInfo
 
@@ -38,25 +39,23 @@ class Command(BaseCommand):
         def delete_all_images_for_gallery():
             delete_all_in_directory("../cloud_img/gallery")
 
-        def get_json_from_url(url):
-            try:
-                response = requests.get(url)
-                response.raise_for_status()
-                return response.json()
-            except requests.exceptions.RequestException as e:
-                raise Exception(f"Сталася помилка при завантаженні файлу: {e}")
-            except json.JSONDecodeError as e:
-                raise Exception(f"Сталася помилка при декодуванні JSON: {e}")
-
-        def get_photo_from_url(url):
-            try:
-                response = requests.get(url)
-                response.raise_for_status()
-                image_file = BytesIO(response.content)
-                image_file.name = url.split("/")[-1]
-                return {"photo_jpeg": (image_file.name, image_file, "image/jpeg")}
-            except requests.exceptions.RequestException as e:
-                raise Exception(f"Сталася помилка при завантаженні файлу photo: {e}")
+        def get_photo(url, group_name):
+            with open(photos[url], "rb") as photo_file:
+                return additional_service.upload_file_to_s3(
+                    group_name=group_name,
+                    object_name=url.split("/")[-1],
+                    bytesio_file=File(photo_file, name=url.split("/")[-1]),
+                )
+
+        def get_system_icon(url, name_en):
+            # незмінний ключ system/game_info/<name_en>/<файл>, повторне завантаження
+            # перезаписує значок на тому ж місці
+            file_name = url.split("/")[-1]
+            with open(photos[url], "rb") as photo_file:
+                return additional_service.upload_system_file(
+                    key=f"game_info/{name_en}/{file_name}",
+                    bytesio_file=File(photo_file, name=file_name),
+                )
 
         data_developers_json = os.getenv(
             "DATA_DEVELOPERS_JSON",
@@ -66,81 +65,95 @@ class Command(BaseCommand):
         url_initial_data = os.getenv("URL_INITIAL_DATA", "")
         system_icon_description = os.getenv("IGNORE_GAME_INFO", ".")
 
-        factory = RequestFactory()
+        additional_service = AdditionalServiceContainer.additional_service()
+        load_developers = not Developer.objects.exists()
+        load_catalog = not GameInfo.objects.exists()
 
-        if not Developer.objects.exists():
+        # маніфести, а потім усі фото качаються паралельно через одну сесію;
+        # незмінені файли з кешу минулого запуску сервер віддає як 304
+        fetcher = AssetFetcher(
+            cache_dir=settings.INITIAL_DATA_CACHE_DIR,
+            workers=settings.INITIAL_DATA_WORKERS,
+            retries=settings.INITIAL_DATA_RETRIES,
+        )
+        try:
+            manifests = fetcher.fetch_many(
+                [data_developers_json] * load_developers
+                + [data_catalog_json] * load_catalog
+            )
+            developers_data = (
+                fetcher.read_json(manifests[data_developers_json])
+                if load_developers
+                else []
+            )
+            data_catalog = (
+                fetcher.read_json(manifests[data_catalog_json]) if load_catalog else []
+            )
+            photos = fetcher.fetch_many(
+                [url_initial_data + item["photo"] for item in developers_data]
+                + [url_initial_data + item["photo"] for item in data_catalog]
+            )
+        except AssetFetchError as e:
+            raise CommandError(f"Сталася помилка при завантаженні файлу: {e}")
+        finally:
+            fetcher.close()
+
+        if load_developers:
             delete_all_images_for_developers()
-            developers_data = get_json_from_url(data_developers_json)
-
-            for developer in developers_data:
-                file = get_photo_from_url(url_initial_data + developer["photo"])
-
-                developer_data = {
-                    "name_ua": developer["name_ua"],
-                    "name_en": developer["name_en"],
-                    "role_ua": developer["role_ua"],
-                    "is_active": True,
-                }
-                developer_data.update(file)
-                # response = requests.post(api_url_developer, data=post_data, files=files)
-
-                request = factory.post(
-                    "/api/v1/developer/", data=developer_data, format="multipart"
-                )
-
-                # Виклик методу post безпосередньо
-                response = APICreateAllDevelopersView.as_view()(request)
 
-                if response.status_code == 201:
-                    print(f"Розробника {developer['name_en']} успішно створено.")
-                else:
-                    print(
-                        f"Не вдалося створити розробника {developer['name_en']}. Код статусу: {response.status_code}."
-                        f"Повідомлення про помилку: {response.status_text}"
+            # фото і рядки - одна транзакція: невдалий імпорт не лишає посилань
+            with transaction.atomic():
+                developers = [
+                    CreateDeveloperDTO(
+                        name_ua=developer["name_ua"],
+                        name_en=developer["name_en"],
+                        role_ua=developer["role_ua"],
+                        photo=get_photo(
+                            url_initial_data + developer["photo"], "developers"
+                        ),
+                        is_active=True,
+                    )
+                    for developer in developers_data
+                ]
+                # фото вже завантажені цією командою і мають своє посилання
+                created = (
+                    ProjectContainer.developer_interactor().bulk_create_developers(
+                        developers, attach_photos=False
                     )
-                    break
-            print("Всі розробники були оброблені.")
+                )
+            print(f"Всі розробники були оброблені, створено: {created}.")
 
-        if not GameInfo.objects.exists():
+        if load_catalog:
             delete_all_images_for_catalog()
             delete_all_images_for_gallery()
 
-            data_catalog = get_json_from_url(data_catalog_json)
-
-            for game_info in data_catalog:
-                game_info_data = {
-                    "name_ua": game_info["name_ua"],
-                    "name_en": game_info["name_en"],
-                    "description_ua": game_info["description_ua"],
-                    "description_en": game_info["description_en"],
-                    "members": game_info["members"],
-                    "is_team": game_info.get("team", False),
-                    "is_active": game_info.get("is_active", False),
-                }
-                files = get_photo_from_url(url_initial_data + game_info["photo"])
-                game_info_data.update(files)
-                request = factory.post(
-                    "/api/v1/game_info/", data=game_info_data, format="multipart"
-                )
-                # Виклик методу post безпосередньо
-                response = APICreateGameInfoView.as_view()(request)
-
-                # response = requests.post(api_url_game_info, data=post_data, files=files)
-
-                if response.status_code == 201:
-                    print(
-                        f"Інформація про гру {game_info['name_en']} успішно створена."
-                    )
+            with transaction.atomic():
+                games = []
+                for game_info in data_catalog:
+                    url = url_initial_data + game_info["photo"]
                     if game_info["description_ua"] == system_icon_description:
-                        res = GameInfo.objects.filter(
-                            description_ua=system_icon_description
-                        ).delete()
-                        print("Видаляємо екземпляр системного значка з БД. ", res)
-                        # Видаляємо інформацію з БД для файлів зображень системного значка
-                else:
-                    print(
-                        f"Не вдалося створити інформацію про гру {game_info['name_en']}. "
-                        f"Код статусу: {response.status_code}"
+                        # системному значку потрібне лише фото, без запису про гру
+                        icon_url = get_system_icon(url, game_info["name_en"])
+                        print(
+                            f"Завантажено системний значок {game_info['name_en']}: {icon_url}"
+                        )
+                        continue
+                    photo = get_photo(url, "game_info")
+                    games.append(
+                        CreateGameInfoDTO(
+                            name_ua=game_info["name_ua"],
+                            name_en=game_info["name_en"],
+                            description_ua=game_info["description_ua"],
+                            description_en=game_info["description_en"],
+                            members=game_info["members"],
+                            is_team=game_info.get("team", False),
+                            is_active=game_info.get("is_active", False),
+                            photo=photo,
+                        )
                     )
-
-            print("Всі екземпляри інформації про гру були оброблені.")
+                created = ProjectContainer.game_info_interactor().bulk_create_game_info(
+                    games, attach_photos=False
+                )
+            print(
+                f"Всі екземпляри інформації про гру були оброблені, створено: {created}."
+            )
@@ -11,4 +11,7 @@ class Developer(models.Model):
     name_en = models.CharField(max_length=50, verbose_name="Name")
     role_ua = models.CharField(max_length=50, verbose_name="Роль")
     photo = models.CharField(max_length=255, verbose_name="Фото")
+    photo_variants = models.JSONField(
+        default=dict, blank=True, verbose_name="Варіанти зображення"
+    )
     is_active = models.BooleanField("Активний учасник", default=False)
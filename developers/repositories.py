@@ -1,9 +1,11 @@
+from typing import Iterator
 from uuid import UUID
 
 from annoying.functions import get_object_or_None
+from django.conf import settings
 
 from developers.dto import DeveloperDTO, UpdateDeveloperDTO, CreateDeveloperDTO
-from developers.exceptions import DeveloperDoesNotExist
+from developers.exceptions import DeveloperAlreadyExists, DeveloperDoesNotExist
 from developers.models import Developer
 from developers.repository_interfaces import AbstractDeveloperRepositoryInterface
 
@@ -15,10 +17,37 @@ class DeveloperRepository(AbstractDeveloperRepositoryInterface):
             name_en=developer.name_en,
             role_ua=developer.role_ua,
             photo=developer.photo,
+            photo_variants=developer.photo_variants,
             is_active=developer.is_active,
         )
         return self._developer_to_dto(developer)
 
+    def bulk_create_developers(self, developers: list[CreateDeveloperDTO]) -> int:
+        """Checks the names of the whole batch, then one INSERT"""
+        names = {(developer.name_ua, developer.name_en) for developer in developers}
+        if len(names) < len(developers):
+            raise DeveloperAlreadyExists()
+        existing = Developer.objects.filter(
+            name_en__in={name_en for _, name_en in names}
+        ).values_list("name_ua", "name_en")
+        if names.intersection(existing):
+            raise DeveloperAlreadyExists()
+        Developer.objects.bulk_create(
+            [
+                # фото необов'язкове в DTO, але колонка NOT NULL
+                Developer(**{**developer.model_dump(), "photo": developer.photo or ""})
+                for developer in developers
+            ]
+        )
+        return len(developers)
+
+    def export_developers(self) -> Iterator[dict]:
+        return (
+            Developer.objects.order_by("name_en", "developer_uuid")
+            .values("developer_uuid", *CreateDeveloperDTO.model_fields)
+            .iterator(chunk_size=settings.BULK_IMPORT_BATCH_SIZE)
+        )
+
     def get_developer_by_uuid(self, developer_uuid: UUID) -> DeveloperDTO:
         developer = get_object_or_None(Developer, developer_uuid=developer_uuid)
         if not developer:
@@ -36,6 +65,9 @@ class DeveloperRepository(AbstractDeveloperRepositoryInterface):
         filtered_param_without_none = {
             k: v for k, v in developer_to_update.model_dump().items() if v is not None
         }
+        if "photo" in filtered_param_without_none:
+            # варіанти нового фото ще не побудовані
+            filtered_param_without_none["photo_variants"] = {}
         developer.update(**filtered_param_without_none)
         developer = developer.get()
         return self._developer_to_dto(developer)
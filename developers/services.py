@@ -1,3 +1,4 @@
+from typing import Iterator
 from uuid import UUID
 
 from developers.dto import DeveloperDTO, CreateDeveloperDTO, UpdateDeveloperDTO
@@ -12,6 +13,12 @@ class DeveloperService(DeveloperServiceInterface):
     def create_developer(self, developer_dto: CreateDeveloperDTO) -> DeveloperDTO:
         return self.repository.create_developer(developer_dto)
 
+    def bulk_create_developers(self, developers: list[CreateDeveloperDTO]) -> int:
+        return self.repository.bulk_create_developers(developers)
+
+    def export_developers(self) -> Iterator[dict]:
+        return self.repository.export_developers()
+
     def get_developer_by_uuid(self, developer_uuid: UUID) -> DeveloperDTO:
         return self.repository.get_developer_by_uuid(developer_uuid)
 
@@ -1,4 +1,5 @@
 from abc import abstractmethod, ABCMeta
+from typing import Iterator
 from uuid import UUID
 
 from developers.dto import DeveloperDTO, UpdateDeveloperDTO, CreateDeveloperDTO
@@ -9,6 +10,14 @@ class DeveloperServiceInterface(metaclass=ABCMeta):
     def create_developer(self, developer_dto: CreateDeveloperDTO) -> DeveloperDTO:
         pass
 
+    @abstractmethod
+    def bulk_create_developers(self, developers: list[CreateDeveloperDTO]) -> int:
+        pass
+
+    @abstractmethod
+    def export_developers(self) -> Iterator[dict]:
+        pass
+
     @abstractmethod
     def get_developer_by_uuid(self, developer_uuid: UUID) -> DeveloperDTO:
         pass
@@ -1,12 +1,16 @@
+import json
 import os
 from uuid import uuid4
 
+from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from additional_service.upload_delete_file import AdditionalService
 from developers.dto import CreateDeveloperDTO
+from developers.models import Developer
 from developers.repositories import DeveloperRepository
 
 
@@ -253,10 +257,30 @@ class DevelopersTests(APITestCase):
         self.assertEqual(user["is_active"], True)
         self.assertEqual(user["developer_uuid"], self.developer_uuid)
 
+    def _upload_photo(self) -> str:
+        return AdditionalService().upload_file_to_s3(
+            group_name="developers", object_name="Test", bytesio_file=self.photo_jpeg
+        )
+
+    def test_developer_update_wrong_external_photo(self):
+
+        update_data = {"photo": "https://example.com/photo.jpg"}
+        response = self.client.put(
+            self.url + str(self.developer_uuid), data=update_data
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        data = response.data
+        self.assertEqual(data["status"], "failed")
+        self.assertEqual(
+            Developer.objects.get(developer_uuid=self.developer_uuid).photo, "Фото"
+        )
+
     def test_developer_update_photo_success(self):
 
+        photo_url = self._upload_photo()
         update_data = {
-            "photo": "Фото 2",
+            "photo": photo_url,
         }
         response = self.client.put(
             self.url + str(self.developer_uuid), data=update_data
@@ -271,7 +295,7 @@ class DevelopersTests(APITestCase):
         self.assertEqual(user["name_ua"], "тест_1")
         self.assertEqual(user["name_en"], "test_1")
         self.assertEqual(user["role_ua"], "Користувач")
-        self.assertEqual(user["photo"], "Фото 2")
+        self.assertEqual(user["photo"], update_data["photo"])
         self.assertEqual(user["is_active"], True)
         self.assertEqual(user["developer_uuid"], self.developer_uuid)
 
@@ -303,7 +327,7 @@ class DevelopersTests(APITestCase):
             "name_ua": "Петро",
             "name_en": "Petro",
             "role_ua": "Власник",
-            "photo": "Фото 2",
+            "photo": self._upload_photo(),
             "is_active": False,
         }
         response = self.client.put(
@@ -319,7 +343,7 @@ class DevelopersTests(APITestCase):
         self.assertEqual(user["name_ua"], "Петро")
         self.assertEqual(user["name_en"], "Petro")
         self.assertEqual(user["role_ua"], "Власник")
-        self.assertEqual(user["photo"], "Фото 2")
+        self.assertEqual(user["photo"], update_data["photo"])
         self.assertEqual(user["is_active"], False)
         self.assertEqual(user["developer_uuid"], self.developer_uuid)
 
@@ -422,3 +446,39 @@ class DevelopersTests(APITestCase):
         self.assertEqual(user["is_active"], False)
         # Видаляємо фото, щоб не засмічувати пам'ять
         self.client.delete(self.url + str(user["developer_uuid"]))
+
+    # -------------------------------------BULK IMPORT/EXPORT---------------------------
+
+    def test_developer_bulk_import_and_export(self):
+        url = reverse("api:developers:developers_bulk")
+        self.client.force_authenticate(
+            User.objects.create_user("staff", password="staff", is_staff=True)
+        )
+        developers = [
+            {
+                "name_ua": f"тест_{number}",
+                "name_en": f"bulk_{number}",
+                "role_ua": "Роль",
+            }
+            for number in range(3)
+        ]
+        body = "\n".join(json.dumps(developer) for developer in developers)
+        response = self.client.post(url, body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["data"], {"created": 3})
+
+        # повторний імпорт тих самих імен нічого не додає
+        response = self.client.post(url, body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("same name", response.data["message"])
+        self.assertEqual(Developer.objects.count(), 4)
+
+        response = self.client.get(url)
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual(
+            [row["name_en"] for row in rows], ["bulk_0", "bulk_1", "bulk_2", "test_1"]
+        )
+        self.assertEqual(rows[0]["photo"], "")
@@ -1,9 +1,14 @@
 from django.urls import path
-from api.v1.views.developers import ApiDeveloperView, APICreateAllDevelopersView
+from api.v1.views.developers import (
+    APICreateAllDevelopersView,
+    APIDeveloperBulkView,
+    ApiDeveloperView,
+)
 
 app_name = "developer"
 
 urlpatterns = [
     path("", APICreateAllDevelopersView.as_view(), name="developers"),
+    path("bulk/", APIDeveloperBulkView.as_view(), name="developers_bulk"),
     path("<uuid:developer_uuid>", ApiDeveloperView.as_view(), name="developers"),
 ]
@@ -14,5 +14,6 @@ python manage.py migrate
 python manage.py test
 python manage.py createsuperuser --no-input
 
-gunicorn -c gunicorn.py core.wsgi:application
+# core.wsgi чи core.asgi обирає gunicorn.py за ASYNC_READ_VIEWS
+gunicorn -c gunicorn.py
 
@@ -15,4 +15,5 @@ python manage.py migrate
 python manage.py createsuperuser --no-input
 python manage.py initial_data_loading
 
-gunicorn -c gunicorn.py core.wsgi:application
+# core.wsgi чи core.asgi обирає gunicorn.py за ASYNC_READ_VIEWS
+gunicorn -c gunicorn.py
@@ -8,11 +8,18 @@ class GalleryDTO(BaseModel):
     topic: str
     text: str
     photo: str
+    photo_variants: dict[str, dict[str, str]] = {}
     team_name: str
     gallery_uuid: UUID
     likes: int
 
 
+class GalleryPageDTO(BaseModel):
+    items: list[GalleryDTO]
+    count: int
+    next_cursor: Optional[str] = None
+
+
 class CreateGalleryDTO(GalleryDTO):
     gallery_uuid: Optional[UUID] = None
     photo: Optional[str] = None
@@ -4,3 +4,13 @@ from django.core.exceptions import ValidationError
 class GalleryItemDoesNotExist(ValidationError):
     def __init__(self):
         super().__init__("GalleryItem doesn't exist")
+
+
+class InvalidGalleryPage(ValidationError):
+    def __init__(self):
+        super().__init__("Invalid page.")
+
+
+class InvalidGalleryCursor(ValidationError):
+    def __init__(self):
+        super().__init__("Invalid cursor")
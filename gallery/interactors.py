@@ -1,7 +1,9 @@
 from uuid import UUID
 
+from django.db import transaction
+
 from additional_service.services_interfaces import AdditionalServiceInterface
-from gallery.dto import CreateGalleryDTO, GalleryDTO
+from gallery.dto import CreateGalleryDTO, GalleryDTO, GalleryPageDTO
 from gallery.services_interfaces import AbstractGalleryServiceInterface
 
 
@@ -15,21 +17,54 @@ class GalleryInteractor:
         self.additional_service = additional_service
 
     def create_gallery(self, gallery_dto: CreateGalleryDTO, bytesio_file) -> GalleryDTO:
-        if bytesio_file:
-            image_path = self.additional_service.upload_file_to_s3(
-                group_name="gallery",
-                object_name=gallery_dto.team_name,
-                bytesio_file=bytesio_file,
-            )
-            gallery_dto.photo = image_path
-        return self.gallery_service.create_gallery(gallery=gallery_dto)
-
-    def get_gallery(self, game_uuid: UUID) -> list[GalleryDTO]:
-        return self.gallery_service.get_gallery(game_uuid=game_uuid)
+        with transaction.atomic():
+            if bytesio_file:
+                image_path = self.additional_service.upload_file_to_s3(
+                    group_name="gallery",
+                    object_name=gallery_dto.team_name,
+                    bytesio_file=bytesio_file,
+                )
+                gallery_dto.photo = image_path
+            elif gallery_dto.photo:
+                # файл клієнт уже завантажив у сховище напряму
+                gallery_dto.photo = self.additional_service.attach_uploaded_file(
+                    photo_url=gallery_dto.photo
+                )
+            gallery = self.gallery_service.create_gallery(gallery=gallery_dto)
+        if gallery.photo:
+            self.additional_service.process_image(photo_url=gallery.photo)
+        return gallery
+
+    def get_gallery(
+        self,
+        game_uuid: UUID,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: str | None = None,
+    ) -> GalleryPageDTO:
+        return self.gallery_service.get_gallery(
+            game_uuid=game_uuid, page=page, page_size=page_size, cursor=cursor
+        )
+
+    async def aget_gallery(
+        self,
+        game_uuid: UUID,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: str | None = None,
+    ) -> GalleryPageDTO:
+        return await self.gallery_service.aget_gallery(
+            game_uuid=game_uuid, page=page, page_size=page_size, cursor=cursor
+        )
 
     def get_gallery_by_uuid(self, gallery_uuid: UUID) -> GalleryDTO:
         return self.gallery_service.get_gallery_by_uuid(gallery_uuid=gallery_uuid)
 
+    async def aget_gallery_by_uuid(self, gallery_uuid: UUID) -> GalleryDTO:
+        return await self.gallery_service.aget_gallery_by_uuid(
+            gallery_uuid=gallery_uuid
+        )
+
     def set_like_gallery_item_by_uuid(
         self, gallery_uuid: UUID, player_uuid: UUID
     ) -> GalleryDTO:
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from gallery.repositories import vote_counter
+
+
+class Command(BaseCommand):
+    help = "Recount Vote.number from the voters table and repair drifted counters"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        fixed = vote_counter.reconcile(batch_size=options["batch_size"])
+        self.stdout.write(f"Виправлено лічильників голосів: {fixed}")
@@ -1,8 +1,6 @@
 from uuid import uuid4
 
 from django.db import models
-from django.db.models.signals import m2m_changed
-from django.dispatch import receiver
 
 from catalog.models import GameInfo
 from players.models import Player
@@ -15,6 +13,9 @@ class GalleryItem(models.Model):
     text = models.TextField(default=None, verbose_name="Опис")
     topic = models.CharField(max_length=255, verbose_name="Тема гри")
     photo = models.CharField(max_length=255, verbose_name="Зображення")
+    photo_variants = models.JSONField(
+        default=dict, blank=True, verbose_name="Варіанти зображення"
+    )
     game = models.ForeignKey(GameInfo, on_delete=models.CASCADE, related_name="gallery")
     team_name = models.CharField(max_length=255, verbose_name="Назва команди")
 
@@ -33,11 +34,6 @@ class Vote(models.Model):
     def __str__(self):
         return f"id: {self.uuid} likes: {self.number}"
 
-    def update_number(self):
-        self.number = self.list_like_user_uuid.count()
-        self.save()
-
-
-@receiver(m2m_changed, sender=Vote.list_like_user_uuid.through)
-def update_like_number(sender, instance, **kwargs):
-    instance.update_number()
+    class Meta:
+        # keyset-пагінація галереї по (number, uuid)
+        indexes = [models.Index(fields=["number", "galleryitem"])]
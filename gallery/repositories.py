@@ -4,14 +4,32 @@ from annoying.functions import get_object_or_None
 from django.core.exceptions import ValidationError
 from django.db.utils import IntegrityError
 
+from additional_service.counters import AtomicVoteCounter
+from additional_service.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_q,
+    keyset_values,
+)
 from catalog.exceptions import GameInfoDoesNotExist
 from catalog.models import GameInfo
-from gallery.dto import CreateGalleryDTO, GalleryDTO
-from gallery.exceptions import GalleryItemDoesNotExist
+from core.db.threads import db_sync_to_async
+from gallery.dto import CreateGalleryDTO, GalleryDTO, GalleryPageDTO
+from gallery.exceptions import (
+    GalleryItemDoesNotExist,
+    InvalidGalleryCursor,
+    InvalidGalleryPage,
+)
 from gallery.models import GalleryItem, Vote
 from gallery.repository_interfaces import AbstractGalleryRepositoryInterface
 from players.exceptions import PlayerDoesNotExist, WrongUUID
 
+vote_counter = AtomicVoteCounter(
+    Vote, "list_like_user_uuid", buffer_name="gallery.vote"
+)
+# uuid робить порядок однозначним і для OFFSET, і для keyset-курсора
+GALLERY_ORDERING = ("-vote__number", "-uuid")
+
 
 class GalleryRepository(AbstractGalleryRepositoryInterface):
     def create_gallery(self, gallery: CreateGalleryDTO) -> GalleryDTO:
@@ -28,29 +46,73 @@ class GalleryRepository(AbstractGalleryRepositoryInterface):
             raise GameInfoDoesNotExist()
         return self._gallery_to_dto(gallery=gallery_object)
 
-    def get_gallery(self, game_uuid: UUID) -> list[GalleryDTO]:
-        game = get_object_or_None(GameInfo, uuid=game_uuid)
-        if not game:
+    def get_gallery(
+        self,
+        game_uuid: UUID,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: str | None = None,
+    ) -> GalleryPageDTO:
+        gallery = GalleryItem.objects.filter(game_id=game_uuid)
+        count = gallery.count()
+        if not count and not GameInfo.objects.filter(uuid=game_uuid).exists():
             raise GameInfoDoesNotExist()
-        return [
-            self._gallery_to_dto(gallery=item)
-            for item in game.gallery.all().order_by("-vote__number")
-        ]
+        items = self._gallery_page_query(gallery, count, page, page_size, cursor)
+        return self._gallery_page(
+            list(items), count, page_size, vote_counter.pending_deltas()
+        )
+
+    async def aget_gallery(
+        self,
+        game_uuid: UUID,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: str | None = None,
+    ) -> GalleryPageDTO:
+        gallery = GalleryItem.objects.filter(game_id=game_uuid)
+        count = await gallery.acount()
+        if not count and not await GameInfo.objects.filter(uuid=game_uuid).aexists():
+            raise GameInfoDoesNotExist()
+        items = self._gallery_page_query(gallery, count, page, page_size, cursor)
+        items = [item async for item in items]
+        # буфер голосів синхронний (Redis або пам'ять процесу)
+        pending = await db_sync_to_async(vote_counter.pending_deltas)()
+        return self._gallery_page(items, count, page_size, pending)
 
     def get_gallery_by_uuid(self, gallery_uuid: UUID) -> GalleryDTO:
-        gallery = get_object_or_None(GalleryItem, uuid=gallery_uuid)
+        gallery = get_object_or_None(
+            GalleryItem.objects.select_related("vote"), uuid=gallery_uuid
+        )
         if not gallery:
             raise GalleryItemDoesNotExist()
+        gallery.vote.number += vote_counter.pending_delta(gallery.vote.pk)
+        return self._gallery_to_dto(gallery=gallery)
+
+    async def aget_gallery_by_uuid(self, gallery_uuid: UUID) -> GalleryDTO:
+        gallery = (
+            await GalleryItem.objects.select_related("vote")
+            .filter(uuid=gallery_uuid)
+            .afirst()
+        )
+        if not gallery:
+            raise GalleryItemDoesNotExist()
+        gallery.vote.number += await db_sync_to_async(vote_counter.pending_delta)(
+            gallery.vote.pk
+        )
         return self._gallery_to_dto(gallery=gallery)
 
     def set_like_gallery_item_by_uuid(
         self, gallery_uuid: UUID, player_uuid: UUID
     ) -> GalleryDTO:
-        gallery_item = get_object_or_None(GalleryItem, uuid=gallery_uuid)
+        gallery_item = get_object_or_None(
+            GalleryItem.objects.select_related("vote"), uuid=gallery_uuid
+        )
         if not gallery_item:
             raise GalleryItemDoesNotExist
         try:
-            gallery_item.vote.list_like_user_uuid.add(player_uuid)
+            gallery_item.vote.number = vote_counter.add_vote(
+                gallery_item.vote.pk, player_uuid, gallery_item.vote.number
+            )
         except ValidationError:
             raise WrongUUID(value=player_uuid)
         except IntegrityError:
@@ -60,21 +122,67 @@ class GalleryRepository(AbstractGalleryRepositoryInterface):
     def unset_like_gallery_item_by_uuid(
         self, gallery_uuid: UUID, player_uuid: UUID
     ) -> GalleryDTO:
-        gallery_item = get_object_or_None(GalleryItem, uuid=gallery_uuid)
+        gallery_item = get_object_or_None(
+            GalleryItem.objects.select_related("vote"), uuid=gallery_uuid
+        )
         if not gallery_item:
             raise GalleryItemDoesNotExist
         try:
-            gallery_item.vote.list_like_user_uuid.remove(player_uuid)
+            gallery_item.vote.number = vote_counter.remove_vote(
+                gallery_item.vote.pk, player_uuid, gallery_item.vote.number
+            )
         except ValidationError:
             raise WrongUUID(value=player_uuid)
         return self._gallery_to_dto(gallery=gallery_item)
 
-    def _gallery_to_dto(self, gallery: GalleryItem) -> GalleryDTO:
+    @staticmethod
+    def _gallery_page_query(
+        gallery, count: int, page: int, page_size: int, cursor: str | None
+    ):
+        items = gallery.select_related("vote").order_by(*GALLERY_ORDERING)
+        if cursor:
+            try:
+                number, uuid = decode_cursor(cursor, size=len(GALLERY_ORDERING))
+                if not isinstance(number, int) or not isinstance(uuid, str):
+                    raise ValueError("Invalid cursor")
+                items = items.filter(keyset_q(GALLERY_ORDERING, (number, UUID(uuid))))
+            except (ValueError, TypeError):
+                raise InvalidGalleryCursor()
+        else:
+            offset = (page - 1) * page_size
+            if page < 1 or (page > 1 and offset >= count):
+                raise InvalidGalleryPage()
+            items = items[offset:]
+        # зайвий рядок показує, чи є наступна сторінка
+        return items[: page_size + 1]
+
+    def _gallery_page(
+        self, items: list, count: int, page_size: int, pending: dict[str, int]
+    ) -> GalleryPageDTO:
+        next_cursor = None
+        if len(items) > page_size:
+            items = items[:page_size]
+            next_cursor = encode_cursor(keyset_values(items[-1], GALLERY_ORDERING))
+        return GalleryPageDTO(
+            items=[
+                self._gallery_to_dto(gallery=item, pending=pending) for item in items
+            ],
+            count=count,
+            next_cursor=next_cursor,
+        )
+
+    def _gallery_to_dto(
+        self, gallery: GalleryItem, pending: dict[str, int] | None = None
+    ) -> GalleryDTO:
+        likes = gallery.vote.number
+        if pending:
+            likes += pending.get(str(gallery.vote.pk), 0)
         return GalleryDTO(
             topic=gallery.topic,
             text=gallery.text,
             photo=gallery.photo,
+            photo_variants=gallery.photo_variants,
             team_name=gallery.team_name,
             gallery_uuid=gallery.uuid,
-            likes=gallery.vote.number,
+            likes=likes,
         )
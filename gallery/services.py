@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from gallery.dto import CreateGalleryDTO, GalleryDTO
+from gallery.dto import CreateGalleryDTO, GalleryDTO, GalleryPageDTO
 from gallery.repository_interfaces import AbstractGalleryRepositoryInterface
 from gallery.services_interfaces import AbstractGalleryServiceInterface
 
@@ -12,12 +12,34 @@ class GalleryService(AbstractGalleryServiceInterface):
     def create_gallery(self, gallery: CreateGalleryDTO) -> GalleryDTO:
         return self.repository.create_gallery(gallery=gallery)
 
-    def get_gallery(self, game_uuid: UUID) -> list[GalleryDTO]:
-        return self.repository.get_gallery(game_uuid=game_uuid)
+    def get_gallery(
+        self,
+        game_uuid: UUID,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: str | None = None,
+    ) -> GalleryPageDTO:
+        return self.repository.get_gallery(
+            game_uuid=game_uuid, page=page, page_size=page_size, cursor=cursor
+        )
+
+    async def aget_gallery(
+        self,
+        game_uuid: UUID,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: str | None = None,
+    ) -> GalleryPageDTO:
+        return await self.repository.aget_gallery(
+            game_uuid=game_uuid, page=page, page_size=page_size, cursor=cursor
+        )
 
     def get_gallery_by_uuid(self, gallery_uuid: UUID) -> GalleryDTO:
         return self.repository.get_gallery_by_uuid(gallery_uuid=gallery_uuid)
 
+    async def aget_gallery_by_uuid(self, gallery_uuid: UUID) -> GalleryDTO:
+        return await self.repository.aget_gallery_by_uuid(gallery_uuid=gallery_uuid)
+
     def set_like_gallery_item_by_uuid(
         self, gallery_uuid: UUID, player_uuid: UUID
     ) -> GalleryDTO:
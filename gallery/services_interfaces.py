@@ -1,7 +1,7 @@
 from abc import ABCMeta, abstractmethod
 from uuid import UUID
 
-from gallery.dto import CreateGalleryDTO, GalleryDTO
+from gallery.dto import CreateGalleryDTO, GalleryDTO, GalleryPageDTO
 
 
 class AbstractGalleryServiceInterface(metaclass=ABCMeta):
@@ -10,13 +10,33 @@ class AbstractGalleryServiceInterface(metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def get_gallery(self, game_uuid: UUID) -> list[GalleryDTO]:
+    def get_gallery(
+        self,
+        game_uuid: UUID,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: str | None = None,
+    ) -> GalleryPageDTO:
+        pass
+
+    @abstractmethod
+    async def aget_gallery(
+        self,
+        game_uuid: UUID,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: str | None = None,
+    ) -> GalleryPageDTO:
         pass
 
     @abstractmethod
     def get_gallery_by_uuid(self, gallery_uuid: UUID) -> GalleryDTO:
         pass
 
+    @abstractmethod
+    async def aget_gallery_by_uuid(self, gallery_uuid: UUID) -> GalleryDTO:
+        pass
+
     @abstractmethod
     def set_like_gallery_item_by_uuid(
         self, gallery_uuid: UUID, player_uuid: UUID
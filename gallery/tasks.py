@@ -0,0 +1,14 @@
+from celery import shared_task
+
+from gallery.repositories import vote_counter
+
+
+@shared_task
+def flush_vote_buffer() -> int:
+    """Writes buffered gallery votes to the DB"""
+    return vote_counter.flush()
+
+
+@shared_task
+def reconcile_vote_counters() -> int:
+    return vote_counter.reconcile()
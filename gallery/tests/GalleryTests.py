@@ -1,16 +1,26 @@
+import json
 import os
+from io import StringIO
 from uuid import uuid4
 
+from asgiref.sync import async_to_sync
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.http.cookie import SimpleCookie
+from django.test import AsyncRequestFactory, override_settings
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from additional_service.file_gc import collect_garbage
 from additional_service.upload_delete_file import AdditionalService
+from api.v1.views.async_reads import gallery, gallery_item
 from catalog.dto import CreateGameInfoDTO
 from catalog.repositories import GameInfoRepository
 from gallery.dto import CreateGalleryDTO
-from gallery.repositories import GalleryRepository
+from gallery.models import Vote
+from gallery.repositories import GalleryRepository, vote_counter
+from gallery.tasks import flush_vote_buffer
+from players.models import Player
 from players.repositories import PlayerRepository
 
 
@@ -86,6 +96,85 @@ class GalleryTests(APITestCase):
         data = response.data
         self.assertEqual(data["detail"], "Invalid page.")
 
+    def test_gallery_list_paginated_in_db(self):
+        repository = GalleryRepository()
+        for number in range(25):
+            repository.create_gallery(
+                CreateGalleryDTO(
+                    topic=f"Тема {number}",
+                    text="Text",
+                    photo="Фото",
+                    team_name=f"Команда {number}",
+                    game=self.game_uuid,
+                )
+            )
+
+        with self.assertNumQueries(2):
+            gallery_page = repository.get_gallery(
+                game_uuid=self.game_uuid, page=3, page_size=10
+            )
+        self.assertEqual(gallery_page.count, 27)
+        self.assertEqual(len(gallery_page.items), 7)
+
+        response = self.client.get(
+            self.url + str(self.game_uuid) + "?page=1&page_size=5"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 27)
+        self.assertEqual(len(response.data["data"]), 5)
+        self.assertEqual(response.data["data"][0]["gallery_uuid"], self.gallery2_uuid)
+
+        response = self.client.get(self.url + str(self.game_uuid) + "?page=abc")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data["detail"], "Invalid page.")
+
+    def test_gallery_list_keyset_cursor(self):
+        repository = GalleryRepository()
+        for number in range(23):
+            repository.create_gallery(
+                CreateGalleryDTO(
+                    topic=f"Тема {number}",
+                    text="Text",
+                    photo="Фото",
+                    team_name=f"Команда {number}",
+                    game=self.game_uuid,
+                )
+            )
+
+        seen, cursor = [], None
+        while True:
+            with self.assertNumQueries(2):
+                gallery_page = repository.get_gallery(
+                    game_uuid=self.game_uuid, page_size=10, cursor=cursor
+                )
+            seen += [item.gallery_uuid for item in gallery_page.items]
+            cursor = gallery_page.next_cursor
+            if cursor is None:
+                break
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+        self.assertEqual(seen[0], self.gallery2_uuid)
+
+        response = self.client.get(self.url + str(self.game_uuid) + "?page_size=20")
+        cursor = response.data["next_cursor"]
+        response = self.client.get(
+            self.url + str(self.game_uuid) + f"?page_size=20&cursor={cursor}"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["data"]), 5)
+        self.assertIsNone(response.data["next_cursor"])
+
+        # [1, 2] і [[1], [2]]: правильний base64 і JSON, але не ті типи значень
+        for cursor in ("WzEsMl0", "W1sxXSwgWzJdXQ"):
+            response = self.client.get(
+                self.url + str(self.game_uuid) + f"?cursor={cursor}"
+            )
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(response.data["detail"], "Invalid cursor")
+        response = self.client.get(self.url + str(self.game_uuid) + "?cursor=broken")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data["detail"], "Invalid cursor")
+
     def test_gallery_list_wrong_not_found(self):
         while True:
             random_uuid = uuid4()
@@ -240,6 +329,7 @@ class GalleryTests(APITestCase):
         self.assertEqual(item["likes"], 0)
         # Видаляємо фото, щоб не засмічувати пам'ять
         AdditionalService.delete_file_from_s3(self, photo_url=item["photo"])
+        collect_garbage()
 
     # -------------------------------------LIKE GALLERY---------------------------------
 
@@ -324,3 +414,114 @@ class GalleryTests(APITestCase):
         self.assertEqual(gallery["team_name"], "Команда 2")
         self.assertEqual(gallery["gallery_uuid"], self.gallery2_uuid)
         self.assertEqual(gallery["likes"], 0)
+
+    def test_gallery_like_is_idempotent_per_player(self):
+        repository = GalleryRepository()
+        for _ in range(2):
+            gallery = repository.set_like_gallery_item_by_uuid(
+                gallery_uuid=self.gallery2_uuid, player_uuid=self.player1_uuid
+            )
+            self.assertEqual(gallery.likes, 1)
+
+        with self.assertNumQueries(5):
+            # select_related + insert-or-ignore + UPDATE ... RETURNING + savepoint pair
+            gallery = repository.set_like_gallery_item_by_uuid(
+                gallery_uuid=self.gallery2_uuid, player_uuid=self.player2_uuid
+            )
+        self.assertEqual(gallery.likes, 2)
+
+        for _ in range(2):
+            gallery = repository.unset_like_gallery_item_by_uuid(
+                gallery_uuid=self.gallery2_uuid, player_uuid=self.player1_uuid
+            )
+            self.assertEqual(gallery.likes, 1)
+        self.assertEqual(Vote.objects.get(galleryitem=self.gallery2_uuid).number, 1)
+
+    def test_reconcile_vote_counters_repairs_drift(self):
+        Vote.objects.filter(galleryitem=self.gallery1_uuid).update(number=4)
+        Vote.objects.filter(galleryitem=self.gallery2_uuid).update(number=9)
+
+        out = StringIO()
+        call_command("reconcile_vote_counters", stdout=out)
+
+        self.assertIn("2", out.getvalue())
+        self.assertEqual(Vote.objects.get(galleryitem=self.gallery1_uuid).number, 0)
+        self.assertEqual(Vote.objects.get(galleryitem=self.gallery2_uuid).number, 1)
+
+    def test_gallery_unlike_of_drifted_zero_counter_reads_it_back(self):
+        Vote.objects.filter(galleryitem=self.gallery2_uuid).update(number=0)
+        gallery = GalleryRepository().unset_like_gallery_item_by_uuid(
+            gallery_uuid=self.gallery2_uuid, player_uuid=self.player1_uuid
+        )
+        self.assertEqual(gallery.likes, 0)
+        self.assertEqual(Vote.objects.get(galleryitem=self.gallery2_uuid).number, 0)
+
+    def test_vote_relation_edits_recount_the_counter(self):
+        vote = Vote.objects.get(galleryitem=self.gallery1_uuid)
+        vote.list_like_user_uuid.add(self.player1_uuid, self.player2_uuid)
+        vote.refresh_from_db()
+        self.assertEqual(vote.number, 2)
+
+        vote.list_like_user_uuid.remove(self.player2_uuid)
+        vote.refresh_from_db()
+        self.assertEqual(vote.number, 1)
+
+        # з боку гравця: clear знімає його голоси з усіх карток
+        Player.objects.get(pk=self.player1_uuid).vote_set.clear()
+        for gallery_uuid in (self.gallery1_uuid, self.gallery2_uuid):
+            self.assertEqual(Vote.objects.get(galleryitem=gallery_uuid).number, 0)
+
+    @override_settings(
+        VOTE_WRITE_BEHIND=True, VOTE_BUFFER_BACKEND="local", VOTE_FLUSH_INTERVAL=3600
+    )
+    def test_gallery_write_behind_votes_merged_until_flush(self):
+        self.addCleanup(vote_counter.buffer.clear)
+        repository = GalleryRepository()
+        gallery = repository.set_like_gallery_item_by_uuid(
+            gallery_uuid=self.gallery2_uuid, player_uuid=self.player2_uuid
+        )
+        self.assertEqual(gallery.likes, 2)
+        gallery = repository.set_like_gallery_item_by_uuid(
+            gallery_uuid=self.gallery2_uuid, player_uuid=self.player1_uuid
+        )
+        self.assertEqual(gallery.likes, 2)
+        gallery = repository.unset_like_gallery_item_by_uuid(
+            gallery_uuid=self.gallery2_uuid, player_uuid=self.player1_uuid
+        )
+        self.assertEqual(gallery.likes, 1)
+        self.assertEqual(repository.get_gallery_by_uuid(self.gallery2_uuid).likes, 1)
+        self.assertEqual(Vote.objects.get(galleryitem=self.gallery2_uuid).number, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(flush_vote_buffer(), 2)
+        vote = Vote.objects.get(galleryitem=self.gallery2_uuid)
+        self.assertEqual(vote.number, 1)
+        self.assertEqual(
+            list(vote.list_like_user_uuid.values_list("pk", flat=True)),
+            [self.player2_uuid],
+        )
+        self.assertEqual(repository.get_gallery_by_uuid(self.gallery2_uuid).likes, 1)
+
+    def test_gallery_async_reads_match_sync_views(self):
+        request_factory = AsyncRequestFactory()
+        for query in ("", "?page_size=1", "?page=abc", "?page=5", "?cursor=broken"):
+            path = self.url + str(self.game_uuid) + query
+            response = self.client.get(path)
+            async_response = async_to_sync(gallery)(
+                request_factory.get(path), game_uuid=self.game_uuid
+            )
+            self.assertEqual(async_response.status_code, response.status_code)
+            self.assertEqual(
+                json.loads(async_response.content), json.loads(response.content)
+            )
+
+        for gallery_uuid in (self.gallery1_uuid, uuid4()):
+            path = self.url + f"item/{gallery_uuid}"
+            response = self.client.get(path)
+            async_response = async_to_sync(gallery_item)(
+                request_factory.get(path), gallery_uuid=gallery_uuid
+            )
+            self.assertEqual(async_response.status_code, response.status_code)
+            self.assertEqual(
+                json.loads(async_response.content), json.loads(response.content)
+            )
@@ -1,5 +1,6 @@
 from django.urls import path
 
+from api.v1.views.async_reads import gallery, gallery_item, read_view
 from api.v1.views.gallery import (
     ApiGetCreateGalleryView,
     ApiLikeGalleryView,
@@ -10,9 +11,15 @@ from api.v1.views.gallery import (
 app_name = "gallery"
 
 urlpatterns = [
-    path("<uuid:game_uuid>", ApiGetCreateGalleryView.as_view(), name="galleries"),
     path(
-        "item/<uuid:gallery_uuid>", ApiRetrieveGalleryView.as_view(), name="galleries"
+        "<uuid:game_uuid>",
+        read_view(ApiGetCreateGalleryView, gallery),
+        name="galleries",
+    ),
+    path(
+        "item/<uuid:gallery_uuid>",
+        read_view(ApiRetrieveGalleryView, gallery_item),
+        name="galleries",
     ),
     path("<uuid:gallery_uuid>/like", ApiLikeGalleryView.as_view(), name="galleries"),
     path(
@@ -16,9 +16,3 @@ class GameSessionDTO(BaseModel):
 class CreateGameSessionDTO(GameSessionDTO):
     creator_uuid: UUID
     session_identificator: Optional[str] = ""
-
-
-class StatisticsSessionDTOResponse(BaseModel):
-    played: int
-    number_of_teams: int
-    number_of_games: int | None = None
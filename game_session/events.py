@@ -0,0 +1,194 @@
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+LOBBY_CHANNEL_PREFIX = "lobby:"
+
+# пауза перед повторним підключенням fan-out до Redis, подвоюється до максимуму
+RECONNECT_DELAY_MIN = 0.5
+RECONNECT_DELAY_MAX = 30
+
+PLAYER_JOINED = "join"
+PLAYER_LEFT = "leave"
+TEAMS_FORMED = "teams"
+
+
+class LobbyBroker:
+    """In-process fan-out of lobby events to the subscribers of one session
+
+    Subscribers are asyncio queues of the ASGI event loop, publishers are request
+    threads, so events are handed over with `call_soon_threadsafe`.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, identificator: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._subscribers.setdefault(identificator, {})[queue] = loop
+        return queue
+
+    def unsubscribe(self, identificator: str, queue: asyncio.Queue) -> None:
+        with self._lock:
+            queues = self._subscribers.get(identificator, {})
+            queues.pop(queue, None)
+            if not queues:
+                self._subscribers.pop(identificator, None)
+
+    def subscribers(self, identificator: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(identificator, {}))
+
+    def publish(self, identificator: str, event: dict) -> int:
+        """Number of local subscribers the event was handed to"""
+        with self._lock:
+            queues = list(self._subscribers.get(identificator, {}).items())
+        for queue, loop in queues:
+            try:
+                loop.call_soon_threadsafe(self._put, queue, event)
+            except RuntimeError:
+                # цикл подій уже закрито, підписник зникне з unsubscribe
+                continue
+        return len(queues)
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, event: dict) -> None:
+        if queue.full():
+            # повільний клієнт втрачає найстаріші події, а не блокує інших
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+
+class RedisLobbyFanout:
+    """Redis pub/sub between workers, each worker relays into its local broker"""
+
+    def __init__(self, url: str, broker: LobbyBroker):
+        import redis
+
+        self.url = url
+        self.broker = broker
+        self.client = redis.Redis.from_url(url)
+        self._listeners = {}
+        self._lock = threading.Lock()
+
+    def publish(self, identificator: str, event: dict) -> int:
+        return self.client.publish(
+            f"{LOBBY_CHANNEL_PREFIX}{identificator}", json.dumps(event)
+        )
+
+    def ensure_listening(self) -> None:
+        """Starts one relay task per event loop, called by subscribers"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            task = self._listeners.get(loop)
+            if task is None or task.done():
+                self._listeners[loop] = loop.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        """Relays until cancelled, reconnecting with a backoff after Redis errors"""
+        delay = RECONNECT_DELAY_MIN
+        while True:
+            try:
+                async for event in self._relay():
+                    # підписка є - наступний обрив знову починаємо з короткої паузи
+                    delay = RECONNECT_DELAY_MIN
+                    if event is not None:
+                        self.broker.publish(*event)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning(
+                    "Lobby fan-out lost Redis, reconnecting in %ss",
+                    delay,
+                    exc_info=True,
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_DELAY_MAX)
+
+    async def _relay(self):
+        """None once subscribed, then (identificator, event) pairs of one connection"""
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        try:
+            await pubsub.psubscribe(f"{LOBBY_CHANNEL_PREFIX}*")
+            yield None
+            async for message in pubsub.listen():
+                if message["type"] != "pmessage":
+                    continue
+                channel = message["channel"].decode()
+                try:
+                    event = json.loads(message["data"])
+                except ValueError:
+                    logger.warning("Broken lobby event in %s", channel)
+                    continue
+                yield channel[len(LOBBY_CHANNEL_PREFIX) :], event
+        finally:
+            await pubsub.close()
+            await client.close()
+
+
+class LobbyEventPublisher:
+    """Publishes lobby events once the transaction that caused them commits"""
+
+    def publish(self, identificator: str, event_type: str, **data) -> None:
+        event = {"event": event_type, **data}
+        transaction.on_commit(lambda: dispatch_lobby_event(identificator, event))
+
+    def player_joined(self, identificator: str, player: dict[str, str]) -> None:
+        self.publish(identificator, PLAYER_JOINED, player=player)
+
+    def player_left(self, identificator: str, player_uuid) -> None:
+        self.publish(identificator, PLAYER_LEFT, player_uuid=str(player_uuid))
+
+    def teams_formed(self, identificator: str, teams: list) -> None:
+        self.publish(identificator, TEAMS_FORMED, teams=teams)
+
+
+_broker = None
+_fanout = None
+_lock = threading.Lock()
+
+
+def get_lobby_broker() -> LobbyBroker:
+    global _broker
+    with _lock:
+        if _broker is None:
+            _broker = LobbyBroker(queue_size=settings.LOBBY_EVENTS_QUEUE_SIZE)
+    return _broker
+
+
+def get_lobby_fanout() -> RedisLobbyFanout | None:
+    """Redis fan-out for LOBBY_EVENTS_BACKEND="redis", one per process"""
+    global _fanout
+    if settings.LOBBY_EVENTS_BACKEND != "redis":
+        return None
+    broker = get_lobby_broker()
+    with _lock:
+        if _fanout is None:
+            _fanout = RedisLobbyFanout(settings.LOBBY_EVENTS_REDIS_URL, broker)
+    return _fanout
+
+
+def dispatch_lobby_event(identificator: str, event: dict) -> None:
+    fanout = get_lobby_fanout()
+    try:
+        if fanout is not None:
+            # локальні підписники отримають подію через власний relay
+            fanout.publish(identificator, event)
+        else:
+            get_lobby_broker().publish(identificator, event)
+    except Exception:
+        # подія лобі не повинна ламати запит, що вже закомічений
+        logger.exception("Lobby event for %s was not published", identificator)
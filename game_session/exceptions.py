@@ -14,3 +14,8 @@ class GameSessionFull(ValidationError):
 class GameSessionNotEnough(ValidationError):
     def __init__(self):
         super().__init__("GameSession not enough players")
+
+
+class GameSessionTeamsImpossible(ValidationError):
+    def __init__(self):
+        super().__init__("GameSession players can't be split into teams")
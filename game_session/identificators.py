@@ -0,0 +1,112 @@
+import string
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+
+ALPHABET = string.digits + string.ascii_uppercase
+LENGTH = 6
+SPACE = len(ALPHABET) ** LENGTH
+# Множник взаємно простий з 36^6 (не ділиться на 2 і 3), тож n -> (a*n + b) mod 36^6
+# - біекція: різні номери завжди дають різні коди, а сусідні коди не йдуть підряд
+MULTIPLIER = 1345325471
+OFFSET = 604661760
+SEQUENCE_NAME = "game_session_identificator_seq"
+
+
+def encode_identificator(number: int) -> str:
+    """Code of the `number`-th session, unique within one pass over 36^6"""
+    value = (MULTIPLIER * (number % SPACE) + OFFSET) % SPACE
+    code = []
+    for _ in range(LENGTH):
+        value, digit = divmod(value, len(ALPHABET))
+        code.append(ALPHABET[digit])
+    return "".join(reversed(code))
+
+
+class IdentificatorAllocator:
+    """Hands out session codes from blocks of a DB sequence
+
+    One DB round-trip per IDENTIFICATOR_BLOCK_SIZE codes, the rest is kept in
+    process memory. On PostgreSQL the block is IDENTIFICATOR_BLOCK_SIZE `nextval`
+    calls of a sequence that moves by one, which are not rolled back with the
+    caller's transaction: a number is never handed out twice, whatever block size
+    each process runs with.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._numbers = deque()
+        self._sequence_ready = False
+
+    def allocate(self) -> tuple[str, bool]:
+        """Code and whether it was already used on a previous pass over 36^6"""
+        with self._lock:
+            if not self._numbers:
+                self._numbers.extend(self._reserve(settings.IDENTIFICATOR_BLOCK_SIZE))
+            number = self._numbers.popleft()
+        return encode_identificator(number), number >= SPACE
+
+    def reset(self) -> None:
+        """Drops the reserved block, the rest of it is never used"""
+        with self._lock:
+            self._numbers.clear()
+
+    def _reserve(self, block_size: int) -> list[int] | range:
+        if connection.vendor == "postgresql":
+            return self._reserve_from_sequence(block_size)
+        return self._reserve_from_table(block_size)
+
+    def _reserve_from_sequence(self, block_size: int) -> list[int]:
+        if not self._sequence_ready:
+            self._prepare_sequence()
+            self._sequence_ready = True
+        with connection.cursor() as cursor:
+            # номери блоку можуть перемежовуватися з чужими, але не повторюються
+            cursor.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                [SEQUENCE_NAME, block_size],
+            )
+            return [number for number, in cursor.fetchall()]
+
+    @staticmethod
+    def _prepare_sequence() -> None:
+        quoted_name = connection.ops.quote_name(SEQUENCE_NAME)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE SEQUENCE IF NOT EXISTS {quoted_name} MINVALUE 0 START 0"
+            )
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(hashtext(%s))", [SEQUENCE_NAME]
+            )
+            cursor.execute(
+                "SELECT increment_by, last_value FROM pg_sequences "
+                "WHERE schemaname = current_schema() AND sequencename = %s",
+                [SEQUENCE_NAME],
+            )
+            increment, last_value = cursor.fetchone()
+            if increment == 1:
+                return
+            # давніше послідовність видавала початки блоків по `increment` номерів:
+            # далі - по одному, починаючи після останнього виданого блоку
+            cursor.execute(f"ALTER SEQUENCE {quoted_name} INCREMENT BY 1")
+            if last_value is not None:
+                cursor.execute(
+                    "SELECT setval(%s, %s)", [SEQUENCE_NAME, last_value + increment - 1]
+                )
+
+    @staticmethod
+    def _reserve_from_table(block_size: int) -> range:
+        # без послідовностей (sqlite у розробці й тестах) лічильник - рядок таблиці
+        from game_session.models import IdentificatorSequence
+
+        sequences = IdentificatorSequence.objects.select_for_update()
+        with transaction.atomic():
+            sequence, _ = sequences.get_or_create(name=SEQUENCE_NAME)
+            sequences.filter(pk=sequence.pk).update(value=F("value") + block_size)
+        return range(sequence.value, sequence.value + block_size)
+
+
+identificator_allocator = IdentificatorAllocator()
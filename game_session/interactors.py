@@ -13,14 +13,29 @@ class GameSessionInteractor:
 
     def add_player_in_game_session_by_uuid(
         self, session_identificator: str, player_uuid: UUID
-    ) -> True:
+    ) -> dict[str, str]:
         return self.service.add_player_in_game_session_by_uuid(
             session_identificator=session_identificator, player_uuid=player_uuid
         )
 
+    def remove_player_from_game_session_by_uuid(
+        self, session_identificator: str, player_uuid: UUID
+    ) -> bool:
+        return self.service.remove_player_from_game_session_by_uuid(
+            session_identificator=session_identificator, player_uuid=player_uuid
+        )
+
     def get_all_players_in_session_by_uuid(
         self, creator_uuid: UUID, session_identificator: str
     ) -> GameSessionDTO:
         return self.service.get_all_players_in_session_by_uuid(
             creator_uuid=creator_uuid, session_identificator=session_identificator
         )
+
+    def get_lobby(self, session_identificator: str) -> GameSessionDTO:
+        return self.service.get_lobby(session_identificator=session_identificator)
+
+    async def aget_lobby(self, session_identificator: str) -> GameSessionDTO:
+        return await self.service.aget_lobby(
+            session_identificator=session_identificator
+        )
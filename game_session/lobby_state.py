@@ -0,0 +1,223 @@
+import threading
+
+from django.conf import settings
+
+# Результати join/leave
+NOT_SEEDED = -1
+CLOSED = -2
+FULL = 0
+ALREADY_IN = 1
+JOINED = 2
+LEFT = 3
+NOT_IN = 4
+
+# Скрипти виконуються атомарно в Redis: перевірка місткості і запис гравця
+JOIN_SCRIPT = """
+local active = redis.call('HGET', KEYS[1], 'active')
+if not active then
+    return -1
+end
+if active == '0' then
+    return -2
+end
+if redis.call('HEXISTS', KEYS[2], ARGV[1]) == 1 then
+    return 1
+end
+if redis.call('HLEN', KEYS[2]) >= tonumber(redis.call('HGET', KEYS[1], 'capacity')) then
+    return 0
+end
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return 2
+"""
+
+LEAVE_SCRIPT = """
+local active = redis.call('HGET', KEYS[1], 'active')
+if not active then
+    return -1
+end
+if active == '0' then
+    return -2
+end
+if redis.call('HDEL', KEYS[2], ARGV[1]) == 1 then
+    return 3
+end
+return 4
+"""
+
+SEED_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('DEL', KEYS[2])
+redis.call('HSET', KEYS[1], 'capacity', ARGV[1], 'active', '1')
+for i = 3, #ARGV, 2 do
+    redis.call('HSET', KEYS[2], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return 1
+"""
+
+# close: нові join/leave отримують CLOSED, склад лобі повертається одним викликом
+CLOSE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+redis.call('HSET', KEYS[1], 'active', ARGV[1])
+return redis.call('HGETALL', KEYS[2])
+"""
+
+MEMBERS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+return redis.call('HGETALL', KEYS[2])
+"""
+
+
+class LocalLobbyStore:
+    """In-process stand-in for the Redis store (tests, runserver, one worker)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+    def seed(self, identificator: str, capacity: int, players: dict[str, str]) -> bool:
+        with self._lock:
+            if identificator in self._sessions:
+                return False
+            self._sessions[identificator] = {
+                "capacity": capacity,
+                "active": True,
+                "players": dict(players),
+            }
+        return True
+
+    def join(self, identificator: str, player_uuid: str, username: str) -> int:
+        with self._lock:
+            session = self._sessions.get(identificator)
+            if session is None:
+                return NOT_SEEDED
+            if not session["active"]:
+                return CLOSED
+            if player_uuid in session["players"]:
+                return ALREADY_IN
+            if len(session["players"]) >= session["capacity"]:
+                return FULL
+            session["players"][player_uuid] = username
+        return JOINED
+
+    def leave(self, identificator: str, player_uuid: str) -> int:
+        with self._lock:
+            session = self._sessions.get(identificator)
+            if session is None:
+                return NOT_SEEDED
+            if not session["active"]:
+                return CLOSED
+            if session["players"].pop(player_uuid, None) is None:
+                return NOT_IN
+        return LEFT
+
+    def members(self, identificator: str) -> dict[str, str] | None:
+        with self._lock:
+            session = self._sessions.get(identificator)
+            return None if session is None else dict(session["players"])
+
+    def close(self, identificator: str) -> dict[str, str] | None:
+        return self._set_active(identificator, False)
+
+    def reopen(self, identificator: str) -> None:
+        self._set_active(identificator, True)
+
+    def discard(self, identificator: str) -> None:
+        with self._lock:
+            self._sessions.pop(identificator, None)
+
+    def _set_active(self, identificator: str, active: bool) -> dict[str, str] | None:
+        with self._lock:
+            session = self._sessions.get(identificator)
+            if session is None:
+                return None
+            session["active"] = active
+            return dict(session["players"])
+
+
+class RedisLobbyStore:
+    """Membership of active sessions shared by all web processes"""
+
+    def __init__(self, url: str, ttl: int):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self._join = self.client.register_script(JOIN_SCRIPT)
+        self._leave = self.client.register_script(LEAVE_SCRIPT)
+        self._seed = self.client.register_script(SEED_SCRIPT)
+        self._close = self.client.register_script(CLOSE_SCRIPT)
+        self._members = self.client.register_script(MEMBERS_SCRIPT)
+
+    def seed(self, identificator: str, capacity: int, players: dict[str, str]) -> bool:
+        args = [capacity, self.ttl]
+        for player_uuid, username in players.items():
+            args += [player_uuid, username]
+        return bool(self._seed(keys=self._keys(identificator), args=args))
+
+    def join(self, identificator: str, player_uuid: str, username: str) -> int:
+        return int(
+            self._join(
+                keys=self._keys(identificator),
+                args=[player_uuid, username, self.ttl],
+            )
+        )
+
+    def leave(self, identificator: str, player_uuid: str) -> int:
+        return int(self._leave(keys=self._keys(identificator), args=[player_uuid]))
+
+    def members(self, identificator: str) -> dict[str, str] | None:
+        return self._to_players(self._members(keys=self._keys(identificator)))
+
+    def close(self, identificator: str) -> dict[str, str] | None:
+        return self._to_players(self._close(keys=self._keys(identificator), args=["0"]))
+
+    def reopen(self, identificator: str) -> None:
+        self._close(keys=self._keys(identificator), args=["1"])
+
+    def discard(self, identificator: str) -> None:
+        self.client.delete(*self._keys(identificator))
+
+    @staticmethod
+    def _keys(identificator: str) -> list[str]:
+        return [f"lobby:{identificator}:meta", f"lobby:{identificator}:players"]
+
+    @staticmethod
+    def _to_players(raw) -> dict[str, str] | None:
+        if raw is None:
+            return None
+        return {
+            player_uuid.decode(): username.decode()
+            for player_uuid, username in zip(raw[::2], raw[1::2])
+        }
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_lobby_store():
+    """Store for LOBBY_STATE_BACKEND, None when LOBBY_STATE_IN_MEMORY is off"""
+    if not settings.LOBBY_STATE_IN_MEMORY:
+        return None
+    backend = settings.LOBBY_STATE_BACKEND
+    with _stores_lock:
+        store = _stores.get(backend)
+        if store is None:
+            if backend == "redis":
+                store = RedisLobbyStore(
+                    settings.LOBBY_STATE_REDIS_URL, settings.LOBBY_STATE_TTL
+                )
+            else:
+                store = LocalLobbyStore()
+            _stores[backend] = store
+    return store
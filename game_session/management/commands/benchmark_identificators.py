@@ -0,0 +1,107 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from catalog.site_statistics import site_statistics
+from game_session.dto import CreateGameSessionDTO
+from game_session.identificators import SPACE, identificator_allocator
+from game_session.models import GameSession
+from game_session.repositories import GameSessionRepository
+from players.models import Player
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures create_session latency while the game session table grows "
+        "towards --rows"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--step", type=int, default=100_000)
+        parser.add_argument("--creates", type=int, default=200)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--keep", action="store_true", help="keep the generated sessions"
+        )
+
+    def handle(self, *args, **options):
+        player = Player.objects.create(username="benchmark")
+        repository = GameSessionRepository()
+        game_session_dto = CreateGameSessionDTO(
+            creator_uuid=player.player_uuid,
+            team_min=1,
+            team_max=1,
+            team_players_min=1,
+            team_players_max=1,
+        )
+        try:
+            rows = GameSession.objects.count()
+            while True:
+                timings = self._measure(
+                    repository, game_session_dto, options["creates"]
+                )
+                rows += len(timings)
+                self.stdout.write(
+                    f"rows={rows:<10} "
+                    f"avg={statistics.mean(timings) * 1000:.3f}ms "
+                    f"p95={self._p95(timings) * 1000:.3f}ms "
+                    # ймовірність, що старий random.choice влучить у зайнятий код
+                    f"random_collision={rows / SPACE:.2e}"
+                )
+                if rows >= options["rows"]:
+                    break
+                rows += self._prefill(
+                    player,
+                    min(options["step"], options["rows"] - rows),
+                    options["batch_size"],
+                )
+        finally:
+            if options["keep"]:
+                # bulk_create минає лічильники статистики сайту
+                site_statistics.rebuild()
+            else:
+                self._cleanup(player)
+
+    @staticmethod
+    def _measure(repository, game_session_dto, creates: int) -> list[float]:
+        timings = []
+        for _ in range(creates):
+            started = time.perf_counter()
+            repository.create_session(game_session_dto)
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    @staticmethod
+    def _prefill(player: Player, amount: int, batch_size: int) -> int:
+        for start in range(0, amount, batch_size):
+            GameSession.objects.bulk_create(
+                [
+                    GameSession(
+                        identificator=identificator_allocator.allocate()[0],
+                        creator=player,
+                        is_active=False,
+                        team_min=1,
+                        team_max=1,
+                        team_players_min=1,
+                        team_players_max=1,
+                    )
+                    for _ in range(min(batch_size, amount - start))
+                ]
+            )
+        return amount
+
+    @staticmethod
+    def _cleanup(player: Player) -> None:
+        # мільйон рядків без вибірки кожного в пам'ять: сесії без лобі, сигналів немає
+        sessions = GameSession.objects.filter(creator=player)
+        GameSession.lobby.through.objects.filter(gamesession__in=sessions)._raw_delete(
+            GameSession.objects.db
+        )
+        sessions._raw_delete(sessions.db)
+        player.delete()
+
+    @staticmethod
+    def _p95(timings: list[float]) -> float:
+        return sorted(timings)[int(len(timings) * 0.95) - 1]
@@ -1,23 +1,15 @@
-import random
-import string
-
 from django.db import models
 
 from players.models import Player
 
 
-def identificator_generator() -> str:
-    characters = string.ascii_uppercase + string.digits
-    return "".join(random.choice(characters) for _ in range(6))
-
-
 class GameSession(models.Model):
     """Developers model ua and en language"""
 
+    # код видає GameSessionRepository.create_session з game_session.identificators
     identificator = models.CharField(
         max_length=6,
         primary_key=True,
-        default=identificator_generator,
         verbose_name="Ідентифікатор",
     )
     is_active = models.BooleanField(default=True)
@@ -37,3 +29,10 @@ class GameSession(models.Model):
         verbose_name="Максимальна кількість гравців у одній команді"
     )
     lobby = models.ManyToManyField(Player, verbose_name="Доєднані гравці", blank=True)
+
+
+class IdentificatorSequence(models.Model):
+    """Counter of allocated session codes for DBs without sequences"""
+
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0)
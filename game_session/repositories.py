@@ -1,106 +1,266 @@
 from uuid import UUID
 
 from annoying.functions import get_object_or_None
-from django.db.models import Count, Sum, Q
-from django.db.models.functions import Coalesce
-from django.db import models
+from django.conf import settings
+from django.db import IntegrityError, transaction
 
+from catalog.site_statistics import session_contribution, site_statistics
+from core.db.threads import db_sync_to_async
 from game_session.dto import (
     CreateGameSessionDTO,
     GameSessionDTO,
-    StatisticsSessionDTOResponse,
 )
 from game_session.exceptions import (
     GameSessionDoesNotExist,
     GameSessionFull,
     GameSessionNotEnough,
 )
+from game_session import lobby_state
+from game_session.identificators import identificator_allocator
+from game_session.lobby_state import get_lobby_store
 from game_session.models import GameSession
 from game_session.repository_interfaces import AbstractGameSessionRepositoryInterface
+from game_session.teams import partition_teams
 from players.models import Player
+from players.repositories import PlayerRepository
 
 
 class GameSessionRepository(AbstractGameSessionRepositoryInterface):
     def create_session(self, game_session_dto: CreateGameSessionDTO) -> GameSessionDTO:
-        game_session = GameSession.objects.create(
-            creator=Player(player_uuid=game_session_dto.creator_uuid),
-            team_min=game_session_dto.team_min,
-            team_max=game_session_dto.team_max,
-            team_players_min=game_session_dto.team_players_min,
-            team_players_max=game_session_dto.team_players_max,
-        )
+        while True:
+            identificator = None
+            try:
+                with transaction.atomic():
+                    identificator = self._free_identificator()
+                    game_session = GameSession.objects.create(
+                        identificator=identificator,
+                        creator=Player(player_uuid=game_session_dto.creator_uuid),
+                        team_min=game_session_dto.team_min,
+                        team_max=game_session_dto.team_max,
+                        team_players_min=game_session_dto.team_players_min,
+                        team_players_max=game_session_dto.team_players_max,
+                    )
+                break
+            except IntegrityError:
+                # код зайняла сесія зі старого випадкового генератора або інший
+                # процес з блоком, що перекрився з нашим: беремо наступний
+                if not GameSession.objects.filter(identificator=identificator).exists():
+                    raise
+        store = get_lobby_store()
+        if store is not None:
+            store.seed(
+                game_session.identificator,
+                game_session.team_max * game_session.team_players_max,
+                {},
+            )
         return self._game_session_to_dto(game_session=game_session)
 
+    @staticmethod
+    def _free_identificator() -> str:
+        identificator, recycled = identificator_allocator.allocate()
+        if recycled:
+            # після повного кола 36^6 код завершеної сесії звільняємо, активну оминає
+            # IntegrityError; зіграна гра лишається в статистиці сайту
+            GameSession.objects.filter(
+                identificator=identificator, is_active=False
+            ).delete()
+        return identificator
+
     def add_player_in_game_session_by_uuid(
         self, session_identificator: str, player_uuid: UUID
-    ) -> True:
-        game_session = get_object_or_None(
-            GameSession, identificator=session_identificator
-        )
-        if not game_session or not game_session.is_active:
+    ) -> dict[str, str]:
+        username = self._get_username(player_uuid)
+        store = get_lobby_store()
+        if store is None:
+            if not self._add_player_to_db_lobby(session_identificator, player_uuid):
+                return {}
+            return {str(player_uuid): username}
+        result = store.join(session_identificator, str(player_uuid), username)
+        if result == lobby_state.NOT_SEEDED:
+            self._seed_lobby_store(store, session_identificator)
+            result = store.join(session_identificator, str(player_uuid), username)
+        if result in (lobby_state.NOT_SEEDED, lobby_state.CLOSED):
             raise GameSessionDoesNotExist()
-        if (
-            game_session.lobby
-            and game_session.lobby.count() + 1
-            > game_session.team_max * game_session.team_players_max
-        ):
+        if result == lobby_state.FULL:
             raise GameSessionFull()
-        game_session.lobby.add(*[player_uuid])
-        return True
+        if result == lobby_state.ALREADY_IN:
+            return {}
+        return {str(player_uuid): username}
+
+    def remove_player_from_game_session_by_uuid(
+        self, session_identificator: str, player_uuid: UUID
+    ) -> bool:
+        store = get_lobby_store()
+        if store is None:
+            game_session = get_object_or_None(
+                GameSession, identificator=session_identificator
+            )
+            if not game_session or not game_session.is_active:
+                raise GameSessionDoesNotExist()
+            if not game_session.lobby.filter(pk=player_uuid).exists():
+                return False
+            game_session.lobby.remove(*[player_uuid])
+            return True
+        result = store.leave(session_identificator, str(player_uuid))
+        if result == lobby_state.NOT_SEEDED:
+            self._seed_lobby_store(store, session_identificator)
+            result = store.leave(session_identificator, str(player_uuid))
+        if result in (lobby_state.NOT_SEEDED, lobby_state.CLOSED):
+            raise GameSessionDoesNotExist()
+        return result == lobby_state.LEFT
 
     def get_all_players_in_session_by_uuid(
         self, creator_uuid: UUID, session_identificator: str
     ) -> GameSessionDTO:
-        game_session = (
-            GameSession.objects.filter(
-                identificator=session_identificator,  # creator=creator_uuid # TODO del
+        game_session = GameSession.objects.filter(
+            identificator=session_identificator,  # creator=creator_uuid # TODO del
+        ).first()
+        if not game_session or not game_session.is_active:
+            raise GameSessionDoesNotExist()
+        store = get_lobby_store()
+        if store is None:
+            players = dict(self._db_lobby(game_session))
+        else:
+            players = self._close_lobby_store(store, game_session)
+        try:
+            if len(players) < game_session.team_min * game_session.team_players_min:
+                raise GameSessionNotEnough()
+            lobby = partition_teams(
+                players=self._lobby_to_list(players.items()),
+                team_min=game_session.team_min,
+                team_max=game_session.team_max,
+                min_size=game_session.team_players_min,
+                max_size=game_session.team_players_max,
+                seed=game_session.identificator if settings.TEAMS_SHUFFLE else None,
             )
-            .prefetch_related("lobby")
-            .first()
+            result = self._game_session_to_dto(game_session=game_session, lobby=lobby)
+            with transaction.atomic():
+                if store is not None:
+                    self._persist_lobby(game_session, players)
+                old = session_contribution(
+                    game_session.is_active, game_session.final_teams
+                )
+                game_session.is_active = False
+                game_session.final_teams = len(lobby)
+                game_session.save()
+                new = session_contribution(False, len(lobby))
+                site_statistics.add(**{field: new[field] - old[field] for field in new})
+        except Exception:
+            if store is not None:
+                store.reopen(session_identificator)
+            raise
+        if store is not None:
+            store.discard(session_identificator)
+        return result
+
+    def get_lobby(self, session_identificator: str) -> GameSessionDTO:
+        game_session = GameSession.objects.filter(
+            identificator=session_identificator
+        ).first()
+        if not game_session or not game_session.is_active:
+            raise GameSessionDoesNotExist()
+        return self._game_session_to_dto(
+            game_session=game_session,
+            lobby=self._lobby_to_list(self._lobby_members(game_session)),
         )
+
+    async def aget_lobby(self, session_identificator: str) -> GameSessionDTO:
+        game_session = await GameSession.objects.filter(
+            identificator=session_identificator
+        ).afirst()
         if not game_session or not game_session.is_active:
             raise GameSessionDoesNotExist()
-        lobby = [
-            {str(player.player_uuid): player.username}
-            for player in game_session.lobby.all()
-        ]
-        if len(lobby) < game_session.team_min * game_session.team_players_min:
-            raise GameSessionNotEnough()
-        lobby, teams = self._sort_teams(
-            players=lobby,
-            min_size=game_session.team_players_min,
-            max_size=game_session.team_players_max,
-            teams_maximum=game_session.team_max,
+        if get_lobby_store() is None:
+            lobby = [row async for row in self._db_lobby(game_session)]
+        else:
+            # сховище синхронне (Redis або пам'ять процесу)
+            lobby = await db_sync_to_async(self._lobby_members)(game_session)
+        return self._game_session_to_dto(
+            game_session=game_session, lobby=self._lobby_to_list(lobby)
         )
-        result = self._game_session_to_dto(game_session=game_session, lobby=lobby)
-        game_session.is_active = False
-        game_session.final_teams = teams
-        game_session.save()
-        return result
 
-    def _sort_for_me(self, players: list, n: int) -> tuple[list, int]:
-        return ([players[x::n] for x in range(n)], n)
-
-    def _sort_teams(
-        self,
-        players: list,
-        min_size: int,
-        max_size: int,
-        teams_maximum: int,
-    ) -> tuple[list, int]:
-        players_amount = len(players)
-        for divider in (my_range := range(min_size, max_size + 1)):
-            if (
-                players_amount % divider == 0
-                and (n := players_amount // divider) < teams_maximum + 1
-            ):
-                return self._sort_for_me(players=players, n=n)
-        for divider in my_range:
+    @staticmethod
+    def _add_player_to_db_lobby(session_identificator: str, player_uuid: UUID) -> bool:
+        with transaction.atomic():
+            # блокування рядка сесії: два одночасні join не пройдуть перевірку разом
+            game_session = (
+                GameSession.objects.select_for_update()
+                .filter(identificator=session_identificator)
+                .first()
+            )
+            if not game_session or not game_session.is_active:
+                raise GameSessionDoesNotExist()
+            if game_session.lobby.filter(pk=player_uuid).exists():
+                return False
             if (
-                players_amount % divider != 0
-                and (n := players_amount // divider) < teams_maximum + 1
+                game_session.lobby.count() + 1
+                > game_session.team_max * game_session.team_players_max
             ):
-                return self._sort_for_me(players=players, n=n)
+                raise GameSessionFull()
+            game_session.lobby.add(*[player_uuid])
+        return True
+
+    @staticmethod
+    def _get_username(player_uuid: UUID) -> str:
+        # лобі читають ті самі імена знову і знову, тож через кеш гравців
+        return PlayerRepository().get_player_by_uuid(player_uuid).username
+
+    @staticmethod
+    def _db_lobby(game_session: GameSession):
+        return game_session.lobby.values_list("player_uuid", "username")
+
+    def _lobby_members(self, game_session: GameSession) -> list[tuple[str, str]]:
+        store = get_lobby_store()
+        if store is None:
+            return list(self._db_lobby(game_session))
+        players = store.members(game_session.identificator)
+        if players is None:
+            players = self._seed_lobby_store(store, game_session.identificator)
+        return list(players.items())
+
+    def _seed_lobby_store(self, store, session_identificator: str) -> dict[str, str]:
+        """Loads the lobby of an active session from the DB into the store"""
+        game_session = GameSession.objects.filter(
+            identificator=session_identificator
+        ).first()
+        if not game_session or not game_session.is_active:
+            raise GameSessionDoesNotExist()
+        players = {
+            str(player_uuid): username
+            for player_uuid, username in self._db_lobby(game_session)
+        }
+        capacity = game_session.team_max * game_session.team_players_max
+        if not store.seed(session_identificator, capacity, players):
+            # інший процес встиг першим, його стан і є актуальним
+            players = store.members(session_identificator) or {}
+        return players
+
+    def _close_lobby_store(self, store, game_session: GameSession) -> dict[str, str]:
+        players = store.close(game_session.identificator)
+        if players is None:
+            self._seed_lobby_store(store, game_session.identificator)
+            players = store.close(game_session.identificator) or {}
+        return players
+
+    @staticmethod
+    def _persist_lobby(game_session: GameSession, players: dict[str, str]) -> None:
+        """Writes the final lobby to the m2m table in batches"""
+        through = GameSession.lobby.through
+        through.objects.filter(gamesession=game_session).exclude(
+            player_id__in=players
+        ).delete()
+        through.objects.bulk_create(
+            [
+                through(gamesession=game_session, player_id=player_uuid)
+                for player_uuid in players
+            ],
+            batch_size=settings.LOBBY_STATE_PERSIST_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+    @staticmethod
+    def _lobby_to_list(lobby) -> list[dict[str, str]]:
+        return [{str(player_uuid): username} for player_uuid, username in lobby]
 
     def _game_session_to_dto(
         self, game_session: GameSession, lobby: list = [[]]
@@ -113,13 +273,3 @@ class GameSessionRepository(AbstractGameSessionRepositoryInterface):
             team_players_max=game_session.team_players_max,
             lobby=lobby,
         )
-
-    def get_statistics_session(self) -> StatisticsSessionDTOResponse:
-        try:
-            result = GameSession.objects.aggregate(
-                number_of_teams=Coalesce(Sum("final_teams"), 0),
-                played=Coalesce(Count("pk", filter=Q(is_active=False)), 0),
-            )
-        except models.ObjectDoesNotExist:
-            result = {"played": 0, "number_of_teams": 0}
-        return StatisticsSessionDTOResponse(**result)
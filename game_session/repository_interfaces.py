@@ -1,11 +1,7 @@
 from abc import ABCMeta, abstractmethod
 from uuid import UUID
 
-from game_session.dto import (
-    CreateGameSessionDTO,
-    GameSessionDTO,
-    StatisticsSessionDTOResponse,
-)
+from game_session.dto import CreateGameSessionDTO, GameSessionDTO
 
 
 class AbstractGameSessionRepositoryInterface(metaclass=ABCMeta):
@@ -16,7 +12,13 @@ class AbstractGameSessionRepositoryInterface(metaclass=ABCMeta):
     @abstractmethod
     def add_player_in_game_session_by_uuid(
         self, session_identificator: str, player_uuid: UUID
-    ) -> True:
+    ) -> dict[str, str]:
+        pass
+
+    @abstractmethod
+    def remove_player_from_game_session_by_uuid(
+        self, session_identificator: str, player_uuid: UUID
+    ) -> bool:
         pass
 
     @abstractmethod
@@ -26,5 +28,9 @@ class AbstractGameSessionRepositoryInterface(metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def get_statistics_session(self) -> StatisticsSessionDTOResponse:
+    def get_lobby(self, session_identificator: str) -> GameSessionDTO:
+        pass
+
+    @abstractmethod
+    async def aget_lobby(self, session_identificator: str) -> GameSessionDTO:
         pass
@@ -1,28 +1,58 @@
 from uuid import UUID
 
 from game_session.dto import CreateGameSessionDTO, GameSessionDTO
+from game_session.events import LobbyEventPublisher
 from game_session.repository_interfaces import AbstractGameSessionRepositoryInterface
 from game_session.services_interfaces import AbstractGameSessionServiceInterface
 
 
 class GameSessionService(AbstractGameSessionServiceInterface):
 
-    def __init__(self, repository: AbstractGameSessionRepositoryInterface):
+    def __init__(
+        self,
+        repository: AbstractGameSessionRepositoryInterface,
+        events: LobbyEventPublisher,
+    ):
         self.repository = repository
+        self.events = events
 
     def create_session(self, game_session_dto: CreateGameSessionDTO) -> GameSessionDTO:
         return self.repository.create_session(game_session_dto=game_session_dto)
 
     def add_player_in_game_session_by_uuid(
         self, session_identificator: str, player_uuid: UUID
-    ) -> True:
-        return self.repository.add_player_in_game_session_by_uuid(
+    ) -> dict[str, str]:
+        player = self.repository.add_player_in_game_session_by_uuid(
             session_identificator=session_identificator, player_uuid=player_uuid
         )
+        if player:
+            # повторний join не змінює лобі, підписникам нема про що знати
+            self.events.player_joined(session_identificator, player)
+        return player
+
+    def remove_player_from_game_session_by_uuid(
+        self, session_identificator: str, player_uuid: UUID
+    ) -> bool:
+        left = self.repository.remove_player_from_game_session_by_uuid(
+            session_identificator=session_identificator, player_uuid=player_uuid
+        )
+        if left:
+            self.events.player_left(session_identificator, player_uuid)
+        return left
 
     def get_all_players_in_session_by_uuid(
         self, creator_uuid: UUID, session_identificator: str
     ) -> GameSessionDTO:
-        return self.repository.get_all_players_in_session_by_uuid(
+        game_session = self.repository.get_all_players_in_session_by_uuid(
             creator_uuid=creator_uuid, session_identificator=session_identificator
         )
+        self.events.teams_formed(session_identificator, game_session.lobby)
+        return game_session
+
+    def get_lobby(self, session_identificator: str) -> GameSessionDTO:
+        return self.repository.get_lobby(session_identificator=session_identificator)
+
+    async def aget_lobby(self, session_identificator: str) -> GameSessionDTO:
+        return await self.repository.aget_lobby(
+            session_identificator=session_identificator
+        )
@@ -12,7 +12,13 @@ class AbstractGameSessionServiceInterface(metaclass=ABCMeta):
     @abstractmethod
     def add_player_in_game_session_by_uuid(
         self, session_identificator: str, player_uuid: UUID
-    ) -> True:
+    ) -> dict[str, str]:
+        pass
+
+    @abstractmethod
+    def remove_player_from_game_session_by_uuid(
+        self, session_identificator: str, player_uuid: UUID
+    ) -> bool:
         pass
 
     @abstractmethod
@@ -20,3 +26,11 @@ class AbstractGameSessionServiceInterface(metaclass=ABCMeta):
         self, creator_uuid: UUID, session_identificator: str
     ) -> GameSessionDTO:
         pass
+
+    @abstractmethod
+    def get_lobby(self, session_identificator: str) -> GameSessionDTO:
+        pass
+
+    @abstractmethod
+    async def aget_lobby(self, session_identificator: str) -> GameSessionDTO:
+        pass
@@ -0,0 +1,63 @@
+import random
+from functools import lru_cache
+
+from game_session.exceptions import GameSessionTeamsImpossible
+
+# Конфігурації з більшим діапазоном гравців рахуються без таблиці
+PLAN_TABLE_LIMIT = 1024
+
+
+def _team_count(
+    players: int, team_min: int, team_max: int, min_size: int, max_size: int
+) -> int | None:
+    # n команд підходить, коли ceil(players / n) <= max_size і players // n >= min_size
+    lowest = max(team_min, -(-players // max_size), 1)
+    highest = min(team_max, players // min_size)
+    if lowest > highest:
+        return None
+    # рівні команди важливіші, серед однакових за рівністю - більше команд
+    for count in range(highest, lowest - 1, -1):
+        if players % count == 0:
+            return count
+    return highest
+
+
+@lru_cache(maxsize=256)
+def plan_table(
+    team_min: int, team_max: int, min_size: int, max_size: int
+) -> dict[int, int | None]:
+    """Team count for every lobby size a session with these limits can have"""
+    return {
+        players: _team_count(players, team_min, team_max, min_size, max_size)
+        for players in range(team_min * min_size, team_max * max_size + 1)
+    }
+
+
+def plan_teams(
+    players: int, team_min: int, team_max: int, min_size: int, max_size: int
+) -> list[int]:
+    """Team sizes, largest first, that differ by at most one"""
+    if (team_max * max_size) - (team_min * min_size) < PLAN_TABLE_LIMIT:
+        count = plan_table(team_min, team_max, min_size, max_size).get(players)
+    else:
+        count = _team_count(players, team_min, team_max, min_size, max_size)
+    if count is None:
+        raise GameSessionTeamsImpossible()
+    size, rest = divmod(players, count)
+    return [size + 1] * rest + [size] * (count - rest)
+
+
+def partition_teams(
+    players: list,
+    team_min: int,
+    team_max: int,
+    min_size: int,
+    max_size: int,
+    seed: str | None = None,
+) -> list[list]:
+    """Deals players into teams round-robin, shuffled first when a seed is given"""
+    sizes = plan_teams(len(players), team_min, team_max, min_size, max_size)
+    if seed is not None:
+        players = list(players)
+        random.Random(seed).shuffle(players)
+    return [players[team :: len(sizes)] for team in range(len(sizes))]
@@ -1,9 +1,40 @@
+import asyncio
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.signals import request_finished
+from django.db import close_old_connections
 from django.http.cookie import SimpleCookie
+from django.test import AsyncRequestFactory, override_settings
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from game_session.models import GameSession, identificator_generator
+from api.v1.views.async_reads import game_session_lobby
+from api.v1.views.lobby_events import LobbyEventsRouter
+from game_session import lobby_state
+from game_session.dto import CreateGameSessionDTO
+from game_session import events
+from game_session.events import (
+    LobbyBroker,
+    LobbyEventPublisher,
+    RedisLobbyFanout,
+    get_lobby_broker,
+)
+from game_session.exceptions import GameSessionTeamsImpossible
+from game_session.identificators import (
+    ALPHABET,
+    MULTIPLIER,
+    SPACE,
+    encode_identificator,
+    identificator_allocator,
+)
+from game_session.lobby_state import LocalLobbyStore
+from game_session.models import GameSession
 from game_session.repositories import GameSessionRepository
+from game_session.teams import partition_teams, plan_teams
 from players.models import Player
 from players.repositories import PlayerRepository
 
@@ -21,6 +52,7 @@ class GameSessionTests(APITestCase):
         self.game_session_repository = GameSessionRepository()
 
         self.game_session = GameSession.objects.create(
+            identificator=identificator_allocator.allocate()[0],
             creator=Player(player_uuid=self.players[0]),
             team_min=2,
             team_max=4,
@@ -192,10 +224,8 @@ class GameSessionTests(APITestCase):
         self.assertEqual(data["message"], "['GameSession full of players']")
 
     def test_game_session_update_wrong_not_found(self):
-        while True:
-            random_identificator = identificator_generator()
-            if random_identificator != self.game_session.identificator:
-                break
+        # новий код алокатора не збігається з кодом жодної створеної сесії
+        random_identificator, _ = identificator_allocator.allocate()
 
         response = self.client.put(self.url + f"{random_identificator}")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -213,10 +243,8 @@ class GameSessionTests(APITestCase):
     # ---------------------------------GET SORTED TEAMS---------------------------------
     def test_game_session_teams_get_wrong_not_found(self):
         self.client.cookies = SimpleCookie({"PLAYER_UUID": str(self.players[0])})
-        while True:
-            random_identificator = identificator_generator()
-            if random_identificator != self.game_session.identificator:
-                break
+        # новий код алокатора не збігається з кодом жодної створеної сесії
+        random_identificator, _ = identificator_allocator.allocate()
 
         response = self.client.get(self.url + f"{random_identificator}")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -558,3 +586,435 @@ class GameSessionTests(APITestCase):
         self.assertEqual(len(teams[1]), 6)
         self.assertEqual(len(teams[2]), 6)
         self.assertEqual(len(teams[3]), 6)
+
+    def test_game_session_teams_get_wrong_impossible_split(self):
+        self.client.cookies = SimpleCookie({"PLAYER_UUID": str(self.players[0])})
+        game_session = GameSession.objects.create(
+            identificator=identificator_allocator.allocate()[0],
+            creator=Player(player_uuid=self.players[0]),
+            team_min=2,
+            team_max=3,
+            team_players_min=4,
+            team_players_max=4,
+        )
+        game_session.lobby.add(*self.players[0:9])
+        response = self.client.get(self.url + f"{game_session.identificator}")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        data = response.data
+        self.assertEqual(data["status"], "failed")
+        self.assertEqual(
+            data["message"], '["GameSession players can\'t be split into teams"]'
+        )
+        game_session.refresh_from_db()
+        self.assertTrue(game_session.is_active)
+
+    def test_team_plans_for_all_small_limits(self):
+        for team_min in range(1, 6):
+            for team_max in range(team_min, 6):
+                for min_size in range(1, 6):
+                    for max_size in range(min_size, 6):
+                        limits = (team_min, team_max, min_size, max_size)
+                        for players in range(team_max * max_size + 3):
+                            with self.subTest(players=players, limits=limits):
+                                self._assert_team_plan(players, *limits)
+
+    def _assert_team_plan(self, players, team_min, team_max, min_size, max_size):
+        possible = [
+            count
+            for count in range(team_min, team_max + 1)
+            if min_size * count <= players <= max_size * count
+        ]
+        if not possible:
+            with self.assertRaises(GameSessionTeamsImpossible):
+                plan_teams(players, team_min, team_max, min_size, max_size)
+            return
+        sizes = plan_teams(players, team_min, team_max, min_size, max_size)
+        self.assertEqual(sum(sizes), players)
+        self.assertIn(len(sizes), possible)
+        self.assertEqual(sizes, sorted(sizes, reverse=True))
+        self.assertLessEqual(sizes[0] - sizes[-1], 1)
+        self.assertGreaterEqual(sizes[-1], min_size)
+        self.assertLessEqual(sizes[0], max_size)
+        even = [count for count in possible if players % count == 0]
+        self.assertEqual(len(sizes), max(even or possible))
+
+    def test_team_partition_seeded_shuffle(self):
+        players = [{str(number): "Player"} for number in range(17)]
+        teams = partition_teams(players, 2, 4, 4, 6, seed="ABC123")
+        self.assertEqual(teams, partition_teams(players, 2, 4, 4, 6, seed="ABC123"))
+        self.assertNotEqual(teams, partition_teams(players, 2, 4, 4, 6))
+        self.assertEqual([len(team) for team in teams], [5, 4, 4, 4])
+        self.assertCountEqual(sum(teams, []), players)
+
+    # ------------------------------------GET LOBBY-------------------------------------
+    def test_game_session_lobby_get_keeps_session_active(self):
+        self.game_session.lobby.add(*self.players[0:3])
+        path = self.url + f"{self.game_session.identificator}/lobby"
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data
+        self.assertEqual(data["message"], "Successful get game session lobby")
+        self.assertEqual(
+            sorted(next(iter(player)) for player in data["data"]["lobby"]),
+            sorted(str(player_uuid) for player_uuid in self.players[0:3]),
+        )
+        self.game_session.refresh_from_db()
+        self.assertTrue(self.game_session.is_active)
+
+        async_response = async_to_sync(game_session_lobby)(
+            AsyncRequestFactory().get(path),
+            session_identificator=self.game_session.identificator,
+        )
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(async_response.content), json.loads(response.content)
+        )
+
+    def test_game_session_lobby_get_wrong_not_found(self):
+        self.game_session.is_active = False
+        self.game_session.save()
+        path = self.url + f"{self.game_session.identificator}/lobby"
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data["message"], "GameSession doesn't exist")
+
+        async_response = async_to_sync(game_session_lobby)(
+            AsyncRequestFactory().get(path),
+            session_identificator=self.game_session.identificator,
+        )
+        self.assertEqual(async_response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            json.loads(async_response.content), json.loads(response.content)
+        )
+
+    # ---------------------------------IDENTIFICATORS-----------------------------------
+    def test_identificator_encoding_is_a_bijection_of_the_sequence(self):
+        self.assertEqual(math.gcd(MULTIPLIER, SPACE), 1)
+        codes = {encode_identificator(number) for number in range(100_000)}
+        self.assertEqual(len(codes), 100_000)
+        for code in list(codes)[:100]:
+            self.assertEqual(len(code), 6)
+            self.assertTrue(set(code) <= set(ALPHABET))
+        self.assertEqual(encode_identificator(SPACE + 7), encode_identificator(7))
+
+    @override_settings(IDENTIFICATOR_BLOCK_SIZE=50)
+    def test_identificator_allocator_reserves_blocks(self):
+        identificator_allocator.reset()
+        self.addCleanup(identificator_allocator.reset)
+        first = identificator_allocator.allocate()
+        with self.assertNumQueries(0):
+            codes = [identificator_allocator.allocate() for _ in range(49)]
+        codes += [identificator_allocator.allocate() for _ in range(100)]
+        self.assertEqual(len({code for code, _ in [first] + codes}), 150)
+        self.assertFalse(any(recycled for _, recycled in codes))
+
+    def test_identificator_recycles_finished_sessions_after_wrap(self):
+        finished = GameSession.objects.create(
+            identificator=encode_identificator(SPACE - 3),
+            is_active=False,
+            team_min=1,
+            team_max=1,
+            team_players_min=1,
+            team_players_max=1,
+        )
+        active = GameSession.objects.create(
+            identificator=encode_identificator(SPACE - 2),
+            team_min=1,
+            team_max=1,
+            team_players_min=1,
+            team_players_max=1,
+        )
+        identificator_allocator.reset()
+        self.addCleanup(identificator_allocator.reset)
+        # блок із другого кола: коди збігаються з кінцем першого
+        identificator_allocator._numbers.extend(range(2 * SPACE - 3, 2 * SPACE))
+        game_session_dto = CreateGameSessionDTO(
+            creator_uuid=self.players[0],
+            team_min=1,
+            team_max=1,
+            team_players_min=1,
+            team_players_max=1,
+        )
+        created = self.game_session_repository.create_session(game_session_dto)
+        self.assertEqual(created.session_identificator, finished.identificator)
+        self.assertTrue(
+            GameSession.objects.get(identificator=finished.identificator).is_active
+        )
+        created = self.game_session_repository.create_session(game_session_dto)
+        self.assertNotEqual(created.session_identificator, active.identificator)
+        self.assertEqual(created.session_identificator, encode_identificator(SPACE - 1))
+
+    def test_create_session_skips_codes_of_legacy_sessions(self):
+        identificator_allocator.reset()
+        self.addCleanup(identificator_allocator.reset)
+        identificator_allocator._numbers.extend(range(10, 13))
+        # сесія старого випадкового генератора на коді з першого кола
+        GameSession.objects.create(
+            identificator=encode_identificator(10),
+            team_min=1,
+            team_max=1,
+            team_players_min=1,
+            team_players_max=1,
+        )
+        created = self.game_session_repository.create_session(
+            CreateGameSessionDTO(
+                creator_uuid=self.players[0],
+                team_min=1,
+                team_max=1,
+                team_players_min=1,
+                team_players_max=1,
+            )
+        )
+        self.assertEqual(created.session_identificator, encode_identificator(11))
+
+    @override_settings(IDENTIFICATOR_BLOCK_SIZE=100)
+    def test_identificator_blocks_do_not_overlap_when_block_size_shrinks(self):
+        identificator_allocator.reset()
+        self.addCleanup(identificator_allocator.reset)
+        codes = {identificator_allocator.allocate()[0]}
+        identificator_allocator.reset()
+        with override_settings(IDENTIFICATOR_BLOCK_SIZE=10):
+            codes |= {identificator_allocator.allocate()[0] for _ in range(20)}
+        self.assertEqual(len(codes), 21)
+
+    # -----------------------------------LOBBY STATE------------------------------------
+    @override_settings(LOBBY_STATE_IN_MEMORY=True)
+    def test_game_session_lobby_state_join_leave_and_close(self):
+        self.game_session.lobby.add(*self.players[1:4])
+        identificator = self.game_session.identificator
+        # перший join засіває сховище з таблиці lobby
+        self._request_as("put", self.players[0])
+        with self.assertNumQueries(1):
+            self.game_session_repository.add_player_in_game_session_by_uuid(
+                identificator, self.players[4]
+            )
+        for player_uuid in self.players[5:9]:
+            response = self._request_as("put", player_uuid)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self._request_as("delete", self.players[1])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.game_session.lobby.count(), 3)
+
+        lobby = self.client.get(self.url + f"{identificator}/lobby").data["data"]
+        self.assertEqual(len(lobby["lobby"]), 8)
+
+        response = self._request_as("get", self.players[0])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([len(team) for team in response.data["data"]["lobby"]], [4, 4])
+        self.assertEqual(
+            set(self.game_session.lobby.values_list("player_uuid", flat=True)),
+            set(self.players[0:1] + self.players[2:9]),
+        )
+        self.game_session.refresh_from_db()
+        self.assertFalse(self.game_session.is_active)
+        self.assertEqual(self._request_as("put", self.players[9]).status_code, 404)
+
+    @override_settings(LOBBY_STATE_IN_MEMORY=True)
+    def test_game_session_lobby_state_full_and_not_enough(self):
+        self.game_session.lobby.add(*self.players)
+        # повторний join гравця з повного лобі нічого не змінює
+        response = self._request_as("put", self.players[0])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(
+            self.url,
+            data={
+                "team_min": 2,
+                "team_max": 2,
+                "team_players_min": 2,
+                "team_players_max": 2,
+            },
+        )
+        identificator = response.data["data"]["session_identificator"]
+        self.client.cookies = SimpleCookie({"PLAYER_UUID": str(self.players[0])})
+        self.client.put(self.url + identificator)
+        response = self.client.get(self.url + identificator)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        for player_uuid in self.players[1:4]:
+            self.client.cookies = SimpleCookie({"PLAYER_UUID": str(player_uuid)})
+            self.client.put(self.url + identificator)
+        self.client.cookies = SimpleCookie({"PLAYER_UUID": str(self.players[4])})
+        response = self.client.put(self.url + identificator)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["message"], "['GameSession full of players']")
+
+    def test_lobby_store_join_is_atomic_on_capacity(self):
+        store = LocalLobbyStore()
+        store.seed("ROOM01", capacity=5, players={})
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(
+                    lambda number: store.join("ROOM01", str(number), "Player"),
+                    range(40),
+                )
+            )
+        self.assertEqual(results.count(lobby_state.JOINED), 5)
+        self.assertEqual(results.count(lobby_state.FULL), 35)
+        self.assertEqual(store.join("NOROOM", "1", "Player"), lobby_state.NOT_SEEDED)
+        self.assertEqual(len(store.close("ROOM01")), 5)
+        self.assertEqual(store.join("ROOM01", "41", "Player"), lobby_state.CLOSED)
+
+    # -----------------------------------LOBBY EVENTS-----------------------------------
+    def test_game_session_events_stream_over_sse(self):
+        identificator = self.game_session.identificator
+        self.game_session.lobby.add(*self.players[1:9])
+        messages = []
+
+        async def scenario():
+            disconnected = asyncio.Event()
+
+            async def receive():
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                messages.append(message)
+
+            scope = {
+                "type": "http",
+                "method": "GET",
+                "path": self.url + f"{identificator}/events",
+            }
+            stream = asyncio.ensure_future(
+                LobbyEventsRouter(None)(scope, receive, send)
+            )
+            await self._wait_for(lambda: len(messages) == 2)
+            await sync_to_async(self._request_as)("put", self.players[0])
+            await self._wait_for(lambda: len(messages) == 3)
+            await sync_to_async(self._request_as)("delete", self.players[0])
+            await self._wait_for(lambda: len(messages) == 4)
+            await sync_to_async(self._request_as)("get", self.players[1])
+            await asyncio.wait_for(stream, timeout=5)
+
+        self._without_closing_connections()
+        async_to_sync(scenario)()
+
+        self.assertEqual(messages[0]["status"], 200)
+        self.assertIn((b"content-type", b"text/event-stream"), messages[0]["headers"])
+        events = [
+            json.loads(message["body"].decode().split("data: ", 1)[1])
+            for message in messages[1:-1]
+        ]
+        self.assertEqual(
+            [event["event"] for event in events], ["lobby", "join", "leave", "teams"]
+        )
+        self.assertEqual(len(events[0]["lobby"]), 8)
+        self.assertEqual(list(events[1]["player"]), [str(self.players[0])])
+        self.assertEqual(events[2]["player_uuid"], str(self.players[0]))
+        self.assertEqual([len(team) for team in events[3]["teams"]], [4, 4])
+        self.assertFalse(messages[-1]["more_body"])
+        self.assertEqual(get_lobby_broker().subscribers(identificator), 0)
+
+    def test_game_session_events_over_websocket(self):
+        messages = []
+
+        async def scenario(identificator):
+            incoming = asyncio.Queue()
+            await incoming.put({"type": "websocket.connect"})
+
+            async def send(message):
+                messages.append(message)
+
+            scope = {
+                "type": "websocket",
+                "path": self.url + f"{identificator}/events",
+            }
+            stream = asyncio.ensure_future(
+                LobbyEventsRouter(None)(scope, incoming.get, send)
+            )
+            if identificator == self.game_session.identificator:
+                await self._wait_for(lambda: len(messages) == 2)
+                await sync_to_async(self._request_as)("put", self.players[0])
+                await self._wait_for(lambda: len(messages) == 3)
+                await incoming.put({"type": "websocket.disconnect"})
+            await asyncio.wait_for(stream, timeout=5)
+
+        self._without_closing_connections()
+        async_to_sync(scenario)("XXXXXX")
+        self.assertEqual(messages, [{"type": "websocket.close", "code": 4404}])
+
+        messages.clear()
+        async_to_sync(scenario)(self.game_session.identificator)
+        self.assertEqual(messages[0], {"type": "websocket.accept"})
+        self.assertEqual(json.loads(messages[1]["text"])["lobby"], [])
+        self.assertEqual(
+            json.loads(messages[2]["text"]),
+            {"event": "join", "player": {str(self.players[0]): "Player"}},
+        )
+        self.assertEqual(
+            get_lobby_broker().subscribers(self.game_session.identificator), 0
+        )
+
+    def test_game_session_events_only_on_lobby_change(self):
+        for in_memory in (False, True):
+            with override_settings(LOBBY_STATE_IN_MEMORY=in_memory), mock.patch.object(
+                LobbyEventPublisher, "publish"
+            ) as publish:
+                for method in ("put", "put", "delete", "delete"):
+                    response = self._request_as(method, self.players[0])
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                [call.args[1] for call in publish.call_args_list], ["join", "leave"]
+            )
+
+    def test_lobby_fanout_reconnects_after_redis_errors(self):
+        connections = []
+
+        class PubSub:
+            async def psubscribe(self, pattern):
+                connections.append(pattern)
+                if len(connections) < 3:
+                    raise ConnectionError("Redis is restarting")
+
+            async def listen(self):
+                yield {"type": "psubscribe"}
+                yield {
+                    "type": "pmessage",
+                    "channel": b"lobby:ROOM01",
+                    "data": json.dumps({"event": "join"}),
+                }
+                await asyncio.Event().wait()
+
+            async def close(self):
+                pass
+
+        class Client:
+            def pubsub(self):
+                return PubSub()
+
+            async def close(self):
+                pass
+
+        async def scenario():
+            broker = LobbyBroker()
+            fanout = RedisLobbyFanout("redis://localhost:1/2", broker)
+            queue = broker.subscribe("ROOM01")
+            fanout.ensure_listening()
+            try:
+                return await asyncio.wait_for(queue.get(), timeout=5)
+            finally:
+                for task in fanout._listeners.values():
+                    task.cancel()
+
+        with mock.patch(
+            "redis.asyncio.Redis.from_url", return_value=Client()
+        ), mock.patch.object(events, "RECONNECT_DELAY_MIN", 0):
+            self.assertEqual(async_to_sync(scenario)(), {"event": "join"})
+        self.assertEqual(len(connections), 3)
+
+    def _request_as(self, method: str, player_uuid):
+        self.client.cookies = SimpleCookie({"PLAYER_UUID": str(player_uuid)})
+        with self.captureOnCommitCallbacks(execute=True):
+            return getattr(self.client, method)(
+                self.url + self.game_session.identificator
+            )
+
+    def _without_closing_connections(self):
+        # як тестовий клієнт: з'єднання тримає транзакцію тесту
+        request_finished.disconnect(close_old_connections)
+        self.addCleanup(request_finished.connect, close_old_connections)
+
+    @staticmethod
+    async def _wait_for(condition, timeout: float = 5):
+        async with asyncio.timeout(timeout):
+            while not condition():
+                await asyncio.sleep(0.01)
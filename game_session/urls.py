@@ -1,8 +1,10 @@
 from django.urls import path
 
+from api.v1.views.async_reads import game_session_lobby, read_view
 from api.v1.views.game_session import (
     ApiCreateGameSessionView,
     ApiFillDeleteGameSessionView,
+    ApiGameSessionLobbyView,
 )
 
 app_name = "game_session"
@@ -14,4 +16,9 @@ urlpatterns = [
         ApiFillDeleteGameSessionView.as_view(),
         name="game_sessions",
     ),
+    path(
+        "<str:session_identificator>/lobby",
+        read_view(ApiGameSessionLobbyView, game_session_lobby),
+        name="game_session_lobby",
+    ),
 ]
@@ -1,6 +1,41 @@
+import os
+
 bind = "0.0.0.0:8000"
 workers = 3
+# з DB_POOL_SIZE пул кожного воркера не менший за цю кількість потоків (settings.py)
+threads = int(os.getenv("GUNICORN_THREADS", 1))
 errorlog = "-"
 accesslog = "-"
 loglevel = "info"
 timeout = 120
+
+# лобі в пам'яті процесу: кожен воркер мав би власний склад тих самих сесій
+if (
+    workers > 1
+    and os.getenv("LOBBY_STATE_IN_MEMORY", "False") == "True"
+    and os.getenv("LOBBY_STATE_BACKEND", "local") != "redis"
+):
+    raise RuntimeError(
+        "LOBBY_STATE_BACKEND must be redis with LOBBY_STATE_IN_MEMORY and more than one worker"
+    )
+
+# ASYNC_READ_VIEWS=True: uvicorn-воркери, повільний клієнт чи опитування лобі
+# чекає в event loop і не тримає один із трьох слотів; з БД воркер працює
+# ASYNC_DB_THREADS потоками плюс одним потоком async ORM
+if os.getenv("ASYNC_READ_VIEWS", "False") == "True":
+    worker_class = "uvicorn.workers.UvicornWorker"
+    wsgi_app = "core.asgi:application"
+    # підписник лобі чекає в одному воркері, а join може прийти в інший
+    if workers > 1 and os.getenv("LOBBY_EVENTS_BACKEND", "local") != "redis":
+        raise RuntimeError(
+            "LOBBY_EVENTS_BACKEND must be redis with more than one ASGI worker"
+        )
+else:
+    wsgi_app = "core.wsgi:application"
+
+
+def worker_exit(server, worker):
+    from core.db.postgresql_pool.pool import pool_metrics
+
+    for alias, metrics in pool_metrics().items():
+        server.log.info("DB pool %s of worker %s: %s", alias, worker.pid, metrics)
@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import caches
+
+from additional_service.shared_cache import is_shared_cache
+from players.dto import PlayerDTO
+
+COUNTERS = ("local_hits", "shared_hits", "misses")
+
+
+class PlayerCache:
+    """PlayerDTO lookups by uuid: a per-process LRU with TTL in front of a shared cache
+
+    The local tier answers the players a lobby or a vote screen reads over and
+    over without a round trip, the shared tier keeps the other workers off the
+    database. A rename reaches other workers' local tiers within
+    PLAYER_CACHE_TTL. The shared tier is skipped when PLAYER_CACHE_ALIAS is a
+    per-process backend (LocMem): an invalidation there would not reach the
+    other workers. Missing players are never cached: a deferred player can get
+    its row at any moment.
+    """
+
+    def __init__(
+        self,
+        alias: str | None = None,
+        size: int | None = None,
+        ttl: float | None = None,
+        timeout: int | None = None,
+    ):
+        self.alias = alias or settings.PLAYER_CACHE_ALIAS
+        self.size = size if size is not None else settings.PLAYER_CACHE_SIZE
+        self.ttl = ttl if ttl is not None else settings.PLAYER_CACHE_TTL
+        self.timeout = timeout if timeout is not None else settings.PLAYER_CACHE_TIMEOUT
+        self._entries: OrderedDict[str, tuple[float, PlayerDTO]] = OrderedDict()
+        self._lock = threading.Lock()
+        # зростає з кожним скиданням: читання, почате до нього, кеш не наповнює
+        self._generation = 0
+        self._counters = dict.fromkeys(COUNTERS, 0)
+
+    @property
+    def backend(self):
+        """The shared tier, None without a backend shared by the workers"""
+        return caches[self.alias] if is_shared_cache(self.alias) else None
+
+    def get(self, player_uuid: UUID, loader: Callable[[UUID], PlayerDTO]) -> PlayerDTO:
+        """Cached player, `loader` reads it from the database on a miss"""
+        key = self._key(player_uuid)
+        if key is None:
+            # хибний uuid - нехай loader підніме WrongUUID
+            return loader(player_uuid)
+        player = self._get_local(key)
+        if player is not None:
+            return player
+        generation = self._generation
+        backend = self.backend
+        data = backend.get(key) if backend is not None else None
+        if data is not None:
+            self._count("shared_hits")
+            player = PlayerDTO(**data)
+        else:
+            self._count("misses")
+            player = loader(player_uuid)
+            if backend is not None and generation == self._generation:
+                backend.set(key, player.model_dump(mode="json"), self.timeout)
+        self._set_local(key, player, generation)
+        return player
+
+    async def aget(
+        self, player_uuid: UUID, loader: Callable[[UUID], Awaitable[PlayerDTO]]
+    ) -> PlayerDTO:
+        key = self._key(player_uuid)
+        if key is None:
+            return await loader(player_uuid)
+        player = self._get_local(key)
+        if player is not None:
+            return player
+        generation = self._generation
+        backend = self.backend
+        data = await backend.aget(key) if backend is not None else None
+        if data is not None:
+            self._count("shared_hits")
+            player = PlayerDTO(**data)
+        else:
+            self._count("misses")
+            player = await loader(player_uuid)
+            if backend is not None and generation == self._generation:
+                await backend.aset(key, player.model_dump(mode="json"), self.timeout)
+        self._set_local(key, player, generation)
+        return player
+
+    def invalidate(self, player_uuids: list[UUID]) -> None:
+        keys = [key for key in map(self._key, player_uuids) if key is not None]
+        if not keys:
+            return
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+        backend = self.backend
+        if backend is not None:
+            backend.delete_many(keys)
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss counters of this process since start or the last `clear`"""
+        with self._lock:
+            return {**self._counters, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        """Empties the local tier and resets the counters, the shared tier stays"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._counters = dict.fromkeys(COUNTERS, 0)
+
+    @staticmethod
+    def _key(player_uuid) -> str | None:
+        try:
+            return f"player:{UUID(str(player_uuid))}"
+        except ValueError:
+            return None
+
+    def _get_local(self, key: str) -> PlayerDTO | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, player = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._counters["local_hits"] += 1
+                    return player
+                del self._entries[key]
+        return None
+
+    def _set_local(self, key: str, player: PlayerDTO, generation: int) -> None:
+        if self.size <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, player)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+
+player_cache = PlayerCache()
@@ -0,0 +1,39 @@
+from uuid import UUID
+
+from django.core import signing
+
+from players.dto import PlayerDTO
+
+# Cookie, в якій браузер тримає ідентичність гравця
+PLAYER_COOKIE = "PLAYER_UUID"
+
+_signer = signing.Signer(salt="players.identity")
+
+
+def issue_player_token(player_uuid) -> str:
+    """Signed cookie value, proves the uuid was issued here without a Player row"""
+    return _signer.sign(str(player_uuid))
+
+
+def read_player_cookie(value: str | None) -> tuple[str, bool] | None:
+    """(player uuid, signed) from the cookie, None when the browser has no identity
+
+    Old clients keep a bare PLAYER_UUID whose row already exists; such values
+    are returned as they are, unsigned.
+    """
+    if not value:
+        return None
+    try:
+        return str(UUID(_signer.unsign(value))), True
+    except (signing.BadSignature, ValueError):
+        return value, False
+
+
+def deferred_player(player_uuid) -> PlayerDTO:
+    """The player a signed token stands for until its row is inserted"""
+    from players.models import Player
+
+    return PlayerDTO(
+        player_uuid=player_uuid,
+        username=Player._meta.get_field("username").default,
+    )
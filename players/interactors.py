@@ -1,3 +1,4 @@
+from datetime import datetime
 from uuid import UUID
 
 from players.dto import PlayerDTO
@@ -11,8 +12,23 @@ class PlayerInteractor:
     def create_player(self) -> PlayerDTO:
         return self.player_service.create_player()
 
+    async def acreate_player(self) -> PlayerDTO:
+        return await self.player_service.acreate_player()
+
     def update_player(self, player: PlayerDTO) -> PlayerDTO:
         return self.player_service.update_player(player=player)
 
     def get_player_by_uuid(self, player_uuid: UUID) -> PlayerDTO:
         return self.player_service.get_player_by_uuid(player_uuid=player_uuid)
+
+    async def aget_player_by_uuid(self, player_uuid: UUID) -> PlayerDTO:
+        return await self.player_service.aget_player_by_uuid(player_uuid=player_uuid)
+
+    def materialize_players(self, player_uuids: list[UUID]) -> None:
+        """Inserts the rows of players known so far only by their signed token"""
+        self.player_service.materialize_players(player_uuids=player_uuids)
+
+    def purge_unused_players(self, created_before: datetime, batch_size: int) -> int:
+        return self.player_service.purge_unused_players(
+            created_before=created_before, batch_size=batch_size
+        )
@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.containers import ProjectContainer
+
+
+class Command(BaseCommand):
+    help = "Delete players that never renamed, liked, voted or joined a session"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days", type=int, default=settings.PLAYER_PURGE_AFTER_DAYS
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        purged = ProjectContainer.player_interactor().purge_unused_players(
+            created_before=timezone.now() - timedelta(days=options["older_than_days"]),
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(f"Видалено гравців: {purged}")
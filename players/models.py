@@ -10,3 +10,6 @@ class Player(models.Model):
     username = models.CharField(
         max_length=50, default="Player", verbose_name="Ім'я користувача"
     )
+    create_at = models.DateTimeField(
+        auto_now_add=True, db_index=True, verbose_name="created"
+    )
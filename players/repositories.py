@@ -1,8 +1,11 @@
+from datetime import datetime
 from uuid import UUID
 
 from annoying.functions import get_object_or_None
 from django.core.exceptions import ValidationError
+from django.db import transaction
 
+from players.cache import player_cache
 from players.dto import PlayerDTO
 from players.exceptions import PlayerDoesNotExist, WrongUUID
 from players.models import Player
@@ -15,6 +18,10 @@ class PlayerRepository(AbstractPlayerRepositoryInterface):
         player = Player.objects.create()
         return self._player_to_dto(player)
 
+    async def acreate_player(self) -> PlayerDTO:
+        player = await Player.objects.acreate()
+        return self._player_to_dto(player)
+
     def update_player(self, player: PlayerDTO) -> PlayerDTO:
         try:
             player_to_update = Player.objects.filter(player_uuid=player.player_uuid)
@@ -26,9 +33,18 @@ class PlayerRepository(AbstractPlayerRepositoryInterface):
             username=player.username,
         )
         player = player_to_update.get()
+        player_uuid = player.player_uuid
+        # після коміту, інакше паралельне читання знову закешує старе ім'я
+        transaction.on_commit(lambda: player_cache.invalidate([player_uuid]))
         return self._player_to_dto(player)
 
     def get_player_by_uuid(self, player_uuid: UUID) -> PlayerDTO:
+        return player_cache.get(player_uuid, self._load_player)
+
+    async def aget_player_by_uuid(self, player_uuid: UUID) -> PlayerDTO:
+        return await player_cache.aget(player_uuid, self._aload_player)
+
+    def _load_player(self, player_uuid: UUID) -> PlayerDTO:
         try:
             player = get_object_or_None(Player, player_uuid=player_uuid)
         except ValidationError:
@@ -37,6 +53,47 @@ class PlayerRepository(AbstractPlayerRepositoryInterface):
             raise PlayerDoesNotExist()
         return self._player_to_dto(player=player)
 
+    async def _aload_player(self, player_uuid: UUID) -> PlayerDTO:
+        try:
+            player = await Player.objects.filter(player_uuid=player_uuid).afirst()
+        except ValidationError:
+            raise WrongUUID(value=player_uuid)
+        if not player:
+            raise PlayerDoesNotExist()
+        return self._player_to_dto(player=player)
+
+    def materialize_players(self, player_uuids: list[UUID]) -> None:
+        # один INSERT ... ON CONFLICT DO NOTHING на пачку, наявні рядки не змінюються
+        Player.objects.bulk_create(
+            [Player(player_uuid=player_uuid) for player_uuid in player_uuids],
+            ignore_conflicts=True,
+            batch_size=1000,
+        )
+
+    def purge_unused_players(self, created_before: datetime, batch_size: int) -> int:
+        """Deletes players that never renamed, liked, voted or joined a session"""
+        unused = Player.objects.filter(
+            create_at__lt=created_before,
+            username=Player._meta.get_field("username").default,
+            # жодного лайка, голосу в галереї, лобі чи створеної сесії
+            like__isnull=True,
+            vote__isnull=True,
+            gamesession__isnull=True,
+            game__isnull=True,
+        ).values_list("pk", flat=True)
+        purged = 0
+        while True:
+            with transaction.atomic():
+                batch = list(unused[:batch_size])
+                if not batch:
+                    return purged
+                purged += (
+                    Player.objects.filter(pk__in=batch)
+                    .delete()[1]
+                    .get(Player._meta.label, 0)
+                )
+            player_cache.invalidate(batch)
+
     def _player_to_dto(self, player: Player) -> PlayerDTO:
         return PlayerDTO(
             player_uuid=player.player_uuid,
@@ -1,3 +1,4 @@
+from datetime import datetime
 from uuid import UUID
 
 from players.dto import PlayerDTO
@@ -12,8 +13,22 @@ class PlayerService(AbstractPlayerServiceInterface):
     def create_player(self) -> PlayerDTO:
         return self.repository.create_player()
 
+    async def acreate_player(self) -> PlayerDTO:
+        return await self.repository.acreate_player()
+
     def update_player(self, player: PlayerDTO) -> PlayerDTO:
         return self.repository.update_player(player=player)
 
     def get_player_by_uuid(self, player_uuid: UUID) -> PlayerDTO:
         return self.repository.get_player_by_uuid(player_uuid=player_uuid)
+
+    async def aget_player_by_uuid(self, player_uuid: UUID) -> PlayerDTO:
+        return await self.repository.aget_player_by_uuid(player_uuid=player_uuid)
+
+    def materialize_players(self, player_uuids: list[UUID]) -> None:
+        self.repository.materialize_players(player_uuids=player_uuids)
+
+    def purge_unused_players(self, created_before: datetime, batch_size: int) -> int:
+        return self.repository.purge_unused_players(
+            created_before=created_before, batch_size=batch_size
+        )
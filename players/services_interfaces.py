@@ -1,4 +1,5 @@
 from abc import ABCMeta, abstractmethod
+from datetime import datetime
 from uuid import UUID
 
 from players.dto import PlayerDTO
@@ -9,6 +10,10 @@ class AbstractPlayerServiceInterface(metaclass=ABCMeta):
     def create_player(self) -> PlayerDTO:
         pass
 
+    @abstractmethod
+    async def acreate_player(self) -> PlayerDTO:
+        pass
+
     @abstractmethod
     def update_player(self, player: PlayerDTO) -> PlayerDTO:
         pass
@@ -16,3 +21,15 @@ class AbstractPlayerServiceInterface(metaclass=ABCMeta):
     @abstractmethod
     def get_player_by_uuid(self, player_uuid: UUID) -> PlayerDTO:
         pass
+
+    @abstractmethod
+    async def aget_player_by_uuid(self, player_uuid: UUID) -> PlayerDTO:
+        pass
+
+    @abstractmethod
+    def materialize_players(self, player_uuids: list[UUID]) -> None:
+        pass
+
+    @abstractmethod
+    def purge_unused_players(self, created_before: datetime, batch_size: int) -> int:
+        pass
@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from core.containers import ProjectContainer
+
+
+@shared_task
+def purge_unused_players() -> int:
+    """Deletes players that were created and never used"""
+    return ProjectContainer.player_interactor().purge_unused_players(
+        created_before=timezone.now()
+        - timedelta(days=settings.PLAYER_PURGE_AFTER_DAYS),
+        batch_size=1000,
+    )
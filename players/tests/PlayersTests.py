@@ -1,12 +1,46 @@
+import asyncio
+import json
+import os
+import tempfile
+from datetime import timedelta
 from uuid import uuid4
 
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
 from django.http.cookie import SimpleCookie
+from django.test import AsyncRequestFactory, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APITestCase
-
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from api.v1.views.async_reads import player, read_view
+from api.v1.views.players import ApiPlayerView
+from catalog.dto import CreateGameInfoDTO
+from catalog.repositories import GameInfoRepository
+from core.containers import (
+    ProjectContainer,
+    reset_singletons,
+    use_factories,
+    use_singletons,
+)
+from players.cache import PlayerCache, player_cache
+from players.dto import PlayerDTO
+from players.exceptions import PlayerDoesNotExist
+from players.identity import issue_player_token, read_player_cookie
+from players.models import Player
 from players.repositories import PlayerRepository
 
+# файловий кеш спільний для процесів, як Redis у робочому оточенні
+SHARED_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(tempfile.gettempdir(), "players-tests-cache"),
+    }
+}
+
 
 class PlayerTests(APITestCase):
 
@@ -68,26 +102,21 @@ class PlayerTests(APITestCase):
         self.assertNotEqual(player["player_uuid"], self.player_uuid)
 
     # ---------------------------------------UPDATE PLAYER------------------------------
-    def test_player_update_wrong_player_dont_exist(self):
-
-        while True:
-            random_uuid = uuid4()
-            if random_uuid != self.player_uuid:
-                break
+    def test_player_update_legacy_cookie_without_row_is_materialized(self):
+        # стара непідписана cookie, рядок гравця міг прибрати purge_unused_players
+        Player.objects.filter(pk=self.player_uuid).delete()
 
         update_data = {
             "username": "Player 2",
         }
-        self.client.cookies = SimpleCookie({"PLAYER_UUID": str(random_uuid)})
+        self.client.cookies = SimpleCookie({"PLAYER_UUID": str(self.player_uuid)})
         response = self.client.put(
             self.url,
             data=update_data,
         )
-        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
-
-        data = response.data
-        self.assertEqual(data["status"], "failed")
-        self.assertEqual(data["message"], "Player doesn't exist")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Player.objects.get(pk=self.player_uuid).username, "Player 2")
+        self.assertEqual(response.cookies["PLAYER_UUID"].value, str(self.player_uuid))
 
     def test_player_update_wrong_username_required(self):
 
@@ -139,3 +168,236 @@ class PlayerTests(APITestCase):
         player = data["data"]
         self.assertEqual(player["username"], "Player 3")
         self.assertNotEqual(player["player_uuid"], self.player_uuid)
+
+    # ---------------------------------------ASYNC READS--------------------------------
+
+    def test_player_retrieve_async_matches_sync_view(self):
+        for cookie in (str(self.player_uuid), "111", str(uuid4())):
+            self.client.cookies = SimpleCookie({"PLAYER_UUID": cookie})
+            response = self.client.get(self.url)
+            request = AsyncRequestFactory().get(self.url)
+            request.COOKIES["PLAYER_UUID"] = cookie
+            async_response = async_to_sync(player)(request)
+            self.assertEqual(async_response.status_code, response.status_code)
+            self.assertEqual(
+                json.loads(async_response.content), json.loads(response.content)
+            )
+            self.assertEqual(async_response.cookies["PLAYER_UUID"].value, cookie)
+
+        async_response = async_to_sync(player)(AsyncRequestFactory().get(self.url))
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(
+            async_response.cookies["PLAYER_UUID"].value, self.player_uuid
+        )
+
+    # ---------------------------------------DEFERRED PLAYERS---------------------------
+
+    def test_new_visitor_gets_token_without_player_row(self):
+        players = Player.objects.count()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Player.objects.count(), players)
+
+        token = response.cookies["PLAYER_UUID"].value
+        player_uuid = str(response.data["data"]["player_uuid"])
+        self.assertEqual(read_player_cookie(token), (player_uuid, True))
+        # той самий токен - той самий гравець, і досі без рядка
+        self.client.cookies = SimpleCookie({"PLAYER_UUID": token})
+        response = self.client.get(self.url)
+        self.assertEqual(str(response.data["data"]["player_uuid"]), player_uuid)
+        self.assertEqual(Player.objects.count(), players)
+
+        response = self.client.put(self.url, data={"username": "Player 5"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Player.objects.get(pk=player_uuid).username, "Player 5")
+
+    def test_like_materializes_deferred_player(self):
+        game_info = GameInfoRepository().create_game_info(
+            CreateGameInfoDTO(
+                name_ua="Гра",
+                name_en="Game",
+                photo="test.jpg",
+                description_ua="Опис",
+                description_en="Description",
+                is_team=False,
+                members=10,
+            )
+        )
+        player_uuid = str(uuid4())
+        self.client.cookies = SimpleCookie(
+            {"PLAYER_UUID": issue_player_token(player_uuid)}
+        )
+        response = self.client.get(f"/api/v1/game_info/{game_info.uuid}/like/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["like__number"], 1)
+        self.assertTrue(Player.objects.filter(pk=player_uuid).exists())
+
+    def test_forged_token_is_not_an_identity(self):
+        token = issue_player_token(uuid4())
+        self.client.cookies = SimpleCookie({"PLAYER_UUID": token[:-1] + "x"})
+        response = self.client.put(self.url, data={"username": "Player 6"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_materialize_players_in_bulk(self):
+        player_uuids = [uuid4() for _ in range(3)]
+        repository = PlayerRepository()
+        with self.assertNumQueries(1):
+            repository.materialize_players([self.player_uuid, *player_uuids])
+        repository.materialize_players(player_uuids)
+        self.assertEqual(
+            Player.objects.filter(pk__in=[self.player_uuid, *player_uuids]).count(), 4
+        )
+
+    def test_purge_unused_players(self):
+        repository = PlayerRepository()
+        renamed = repository.create_player().player_uuid
+        repository.update_player(PlayerDTO(player_uuid=renamed, username="Named"))
+        game_info = GameInfoRepository().create_game_info(
+            CreateGameInfoDTO(
+                name_ua="Гра",
+                name_en="Game",
+                photo="test.jpg",
+                description_ua="Опис",
+                description_en="Description",
+                is_team=False,
+                members=10,
+            )
+        )
+        liked = repository.create_player().player_uuid
+        GameInfoRepository().set_like_game_info_by_uuid(game_info.uuid, liked)
+        Player.objects.update(create_at=timezone.now() - timedelta(days=60))
+        fresh = repository.create_player().player_uuid
+
+        purged = repository.purge_unused_players(
+            created_before=timezone.now() - timedelta(days=30), batch_size=1
+        )
+        self.assertEqual(purged, 1)
+        self.assertFalse(Player.objects.filter(pk=self.player_uuid).exists())
+        self.assertEqual(
+            set(Player.objects.values_list("pk", flat=True)), {renamed, liked, fresh}
+        )
+
+    # --------------------------------------PLAYER CACHE--------------------------------
+
+    def test_player_lookup_is_cached_until_rename(self):
+        repository = PlayerRepository()
+        player_cache.clear()
+        repository.get_player_by_uuid(self.player_uuid)
+        with self.assertNumQueries(0):
+            player = repository.get_player_by_uuid(str(self.player_uuid))
+        self.assertEqual(player.username, "Player")
+        self.assertEqual(player_cache.stats()["local_hits"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            repository.update_player(
+                PlayerDTO(player_uuid=self.player_uuid, username="Renamed")
+            )
+        self.assertEqual(
+            repository.get_player_by_uuid(self.player_uuid).username, "Renamed"
+        )
+        self.assertEqual(
+            async_to_sync(repository.aget_player_by_uuid)(self.player_uuid).username,
+            "Renamed",
+        )
+
+    @override_settings(CACHES=SHARED_CACHES)
+    def test_player_cache_tiers_expire_and_evict(self):
+        caches["default"].clear()
+        cache = PlayerCache(size=1, ttl=60)
+        other_uuid = PlayerRepository().create_player().player_uuid
+        loader = PlayerRepository()._load_player
+
+        cache.get(self.player_uuid, loader)
+        cache.get(other_uuid, loader)
+        # локальний рівень тримає один запис, витіснений гравець є у спільному
+        with self.assertNumQueries(0):
+            cache.get(self.player_uuid, loader)
+        self.assertEqual(
+            cache.stats(), {"local_hits": 0, "shared_hits": 1, "misses": 2, "size": 1}
+        )
+
+        cache.ttl = 0.01
+        cache.clear()
+        cache.get(self.player_uuid, loader)
+        asyncio.run(asyncio.sleep(0.02))
+        cache.get(self.player_uuid, loader)
+        self.assertEqual(cache.stats()["local_hits"], 0)
+        self.assertEqual(cache.stats()["shared_hits"], 2)
+
+    def test_player_cache_skips_per_process_shared_tier(self):
+        cache = PlayerCache(size=1, ttl=60)
+        self.assertIsNone(cache.backend)
+        other_uuid = PlayerRepository().create_player().player_uuid
+        loader = PlayerRepository()._load_player
+
+        cache.get(self.player_uuid, loader)
+        cache.get(other_uuid, loader)
+        with self.assertNumQueries(1):
+            cache.get(self.player_uuid, loader)
+        self.assertEqual(cache.stats()["shared_hits"], 0)
+
+    def test_missing_player_is_not_cached(self):
+        repository = PlayerRepository()
+        player_uuid = uuid4()
+        with self.assertRaises(PlayerDoesNotExist):
+            repository.get_player_by_uuid(player_uuid)
+        repository.materialize_players([player_uuid])
+        self.assertEqual(repository.get_player_by_uuid(player_uuid).username, "Player")
+
+    def test_player_cache_stats_are_staff_only(self):
+        url = reverse("api:players:cache-stats")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.force_authenticate(
+            User.objects.create_user("staff", password="staff", is_staff=True)
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(response.data["data"]), {"local_hits", "shared_hits", "misses", "size"}
+        )
+
+    # --------------------------------------CONTAINER-----------------------------------
+
+    def test_container_singletons_share_the_graph(self):
+        if settings.CONTAINER_PROVIDERS != "singleton":
+            use_singletons()
+            self.addCleanup(use_factories)
+        player_interactor = ProjectContainer.player_interactor()
+        self.assertIs(ProjectContainer.player_interactor(), player_interactor)
+        self.assertIs(
+            ProjectContainer.game_info_interactor().additional_service,
+            ProjectContainer.developer_interactor().additional_service,
+        )
+
+        replacement = object()
+        with ProjectContainer.player_interactor.override(replacement):
+            self.assertIs(ProjectContainer.player_interactor(), replacement)
+        self.assertIs(ProjectContainer.player_interactor(), player_interactor)
+
+        reset_singletons()
+        self.assertIsNot(ProjectContainer.player_interactor(), player_interactor)
+        self.client.cookies = SimpleCookie({"PLAYER_UUID": self.player_uuid})
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+
+class PlayerAsyncViewTests(APITransactionTestCase):
+    # sync-представлення за async-обгорткою працює в окремому потоці зі своїм з'єднанням
+    setUp = PlayerTests.setUp
+
+    def test_read_view_serves_get_async_and_delegates_writes(self):
+        self.assertFalse(asyncio.iscoroutinefunction(read_view(ApiPlayerView, player)))
+        with override_settings(ASYNC_READ_VIEWS=True):
+            view = read_view(ApiPlayerView, player)
+        self.assertTrue(asyncio.iscoroutinefunction(view))
+        self.assertIs(view.cls, ApiPlayerView)
+
+        request = AsyncRequestFactory().put(
+            self.url,
+            data="username=Player+4",
+            content_type="application/x-www-form-urlencoded",
+        )
+        request.COOKIES["PLAYER_UUID"] = str(self.player_uuid)
+        response = async_to_sync(view)(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["username"], "Player 4")
@@ -1,3 +1,4 @@
-from .PlayersTests import PlayerTests
+from .PlayersTests import PlayerAsyncViewTests, PlayerTests
 
 PlayerTests()
+PlayerAsyncViewTests()
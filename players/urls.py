@@ -1,9 +1,11 @@
 from django.urls import path
 
-from api.v1.views.players import ApiPlayerView
+from api.v1.views.async_reads import player, read_view
+from api.v1.views.players import ApiPlayerCacheStatsView, ApiPlayerView
 
 app_name = "player"
 
 urlpatterns = [
-    path("", ApiPlayerView.as_view(), name="players"),
+    path("", read_view(ApiPlayerView, player), name="players"),
+    path("cache_stats/", ApiPlayerCacheStatsView.as_view(), name="cache-stats"),
 ]